@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Vectorized decoding of recorded raw spacemouse reports with NumPy, for offline analysis of long captures.
+Decodes the same way as SpaceMouseProWireless._write_joystick and _write_button, all reports in one pass.
+"""
+import collections
+
+import numpy as np
+
+
+BatchDecode = collections.namedtuple('BatchDecode', ['joystick', 'joystick_index', 'buttons', 'button_index'])
+BatchDecode.__doc__ = """joystick: (Nj, 6) int16 axes in paramKeyList order, joystick_index: report index of each row.
+buttons: (Nb,) uint32 bit registers, button_index: report index of each entry."""
+
+# Joystick bytes carry x, y, z, pitch, roll, yaw. Reorder to paramKeyList (x, y, z, roll, pitch, yaw).
+_AXIS_ORDER = [0, 1, 2, 4, 3, 5]
+_AXIS_SIGN = np.array([1, -1, -1, -1, -1, -1], dtype=np.int32)
+
+
+def as_report_array(reports, report_length=0x20):
+    """reports: contiguous bytes-like object holding N reports of report_length bytes each, or a 2D uint8 array.
+       Returns a (N, report_length) uint8 array, without copying if possible.
+    """
+    if isinstance(reports, np.ndarray) and reports.ndim == 2:
+        if reports.dtype != np.uint8:
+            raise ValueError('Report array must be of dtype uint8')
+        return reports
+
+    flat = np.frombuffer(reports, dtype=np.uint8)
+    if flat.size % report_length:
+        raise ValueError('Buffer length is not a multiple of the report length ' + str(report_length))
+    return flat.reshape(-1, report_length)
+
+
+def decode_reports(reports, report_length=0x20):
+    """Decode all joystick (type 1) and button (type 3) reports. Other message types are skipped.
+       See as_report_array for the accepted inputs.
+    """
+    rows = as_report_array(reports, report_length)
+    if rows.shape[1] < 13:
+        raise ValueError('Reports must be at least 13 bytes long')
+
+    msgType = rows[:, 0]
+    joystickIndex = np.flatnonzero(msgType == 1)
+    buttonIndex = np.flatnonzero(msgType == 3)
+
+    # Joystick: six little endian int16 at bytes 1-12.
+    joystickBytes = rows[joystickIndex, 1:13].astype(np.uint16)
+    raw = (joystickBytes[:, 0::2] | (joystickBytes[:, 1::2] << 8)).view(np.int16)
+    axes = raw[:, _AXIS_ORDER].astype(np.int32) * _AXIS_SIGN
+    joystick = np.clip(axes, -32768, 32767).astype(np.int16)  # -(-32768) saturates to 32767
+
+    # Buttons: bit register with byte 1 as MSB, see _write_button.
+    buttonBytes = rows[buttonIndex, 1:5].astype(np.uint32)
+    buttons = (buttonBytes[:, 0] << 24) | (buttonBytes[:, 1] << 16) | (buttonBytes[:, 2] << 8) | buttonBytes[:, 3]
+
+    return BatchDecode(joystick, joystickIndex, buttons, buttonIndex)
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+"""
+Benchmark of the decode and dispatch hot paths of class spaceMouseProWireless.
+Runs against stub_usb (no hardware needed) with a realistic mixed stream of joystick, button and inactivity reports.
+
+Run from the repository root:
+    python benchmark/benchmark.py --output bench.json
+    python benchmark/benchmark.py --compare bench.json   # fails if a path got slower than the tolerance
+"""
+######################################################################################################
+# Imports
+######################################################################################################
+import argparse
+import array
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Same replacement as conftest.py: spaceMouseProWireless picks up the stub as usb package.
+sys.modules['usb.core'] = __import__('stub_usb.core').core  # __import__ returns the top package
+sys.modules['usb.util'] = __import__('stub_usb.util').util
+sys.modules['usb'] = __import__('stub_usb')
+
+import spaceMouseProWireless as sm
+from byteToIntConversion import to_int16, to_uint32
+
+
+######################################################################################################
+# Report stream
+######################################################################################################
+
+def int16_bytes(value):
+    value &= 0xFFFF
+    return [value & 0xFF, value >> 8]
+
+
+def mixed_stream(count=4096, seed=1):
+    """Joystick motion with occasional releases (~88 %), button presses/releases (~10 %), inactivity (~2 %)."""
+    rng = random.Random(seed)
+    axes = [0] * 6
+    buttons = list(sm.BUTTON_MASKS.values())
+    stream = []
+
+    for _ in range(count):
+        draw = rng.random()
+        if draw < 0.02:
+            msg = [23] + [0] * 12
+        elif draw < 0.07:
+            bitReg = rng.choice(buttons) | (rng.choice(buttons) if rng.random() < 0.2 else 0)
+            msg = [3, bitReg >> 24, (bitReg >> 16) & 0xFF, (bitReg >> 8) & 0xFF, bitReg & 0xFF] + [0] * 8
+        elif draw < 0.12:
+            msg = [3] + [0] * 12
+        elif draw < 0.14:
+            axes = [0] * 6
+            msg = [1] + [0] * 12
+        else:
+            axes = [max(-350, min(350, value + rng.randint(-15, 15))) for value in axes]
+            msg = [1] + [byte for value in axes for byte in int16_bytes(value)]
+        stream.append(array.array('B', msg))
+    return stream
+
+
+######################################################################################################
+# Benchmarks
+######################################################################################################
+
+def measure(statement, calls, repeat):
+    """Median time per call in ns over repeat runs of calls calls."""
+    runs = timeit.repeat(statement, number=calls, repeat=repeat)
+    return statistics.median(runs) / calls * 1e9
+
+
+def run_benchmarks(calls=20000, repeat=7):
+    ct = sm.SpaceMouseProWireless()
+    stream = mixed_stream()
+    joystick = [msg for msg in stream if msg[0] == 1 and any(msg[1:])]
+    button = [msg for msg in stream if msg[0] == 3 and any(msg[1:])]
+
+    reports = itertools.cycle(stream)
+
+    def read_into(address, buffer, timeout):
+        """Like pyusb given a buffer: fills it, returns the number of bytes read."""
+        msg = next(reports)
+        buffer[:len(msg)] = msg
+        return len(msg)
+
+    ct._dev.read = read_into
+    joystickCycle = itertools.cycle(joystick)
+    buttonCycle = itertools.cycle(button)
+    releasedCycle = itertools.cycle(stream)
+
+    benchmarks = {
+        'get_interrupt_msg': ct.get_interrupt_msg,
+        '_write_joystick': lambda: ct._handlers[1](next(joystickCycle)),
+        '_write_button': lambda: ct._handlers[3](next(buttonCycle)),
+        '_get_usb_msg_timeout_to_none': ct._get_usb_msg_timeout_to_none,
+        'to_int16': lambda: to_int16(0xA6, 0xFF),
+        'to_uint32': lambda: to_uint32(0x01, 0x40, 0x00, 0x30),
+        'iteration_overhead': lambda: next(releasedCycle),
+    }
+
+    results = {}
+    for name, statement in benchmarks.items():
+        nsPerCall = measure(statement, calls, repeat)
+        results[name] = dict(ns_per_call=round(nsPerCall, 1), calls_per_s=round(1e9 / nsPerCall))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Prints the ratio to the baseline, returns the names slower than 1 + tolerance."""
+    regressions = []
+    print('%-26s %12s %12s %8s' % ('benchmark', 'baseline ns', 'current ns', 'ratio'))
+    for name, result in results.items():
+        if name not in baseline:
+            print('%-26s %12s %12.1f' % (name, '-', result['ns_per_call']))
+            continue
+        ratio = result['ns_per_call'] / baseline[name]['ns_per_call']
+        flag = ''
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-26s %12.1f %12.1f %8.2f%s' % (name, baseline[name]['ns_per_call'], result['ns_per_call'], ratio, flag))
+    return regressions
+
+
+######################################################################################################
+# Main
+######################################################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='save results as json')
+    parser.add_argument('--compare', help='json results of a previous run')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown against --compare')
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.calls, args.repeat)
+    report = dict(python=platform.python_version(),
+                  machine=platform.machine(),
+                  date=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  results=results)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)['results']
+        sys.exit(1 if compare(results, baseline, args.tolerance) else 0)
+
+    for name, result in results.items():
+        print('%-26s %10.1f ns/call %12d calls/s' % (name, result['ns_per_call'], result['calls_per_s']))
@@ -75,16 +75,15 @@ class DebugSpaceMouseProWireless(SpaceMouseProWireless):
 
 
     def print_button_press(self):
-        """Not a very efficient method, but works for debugging"""
-        sleepPeriod = 0.1
-
+        """Prints the button edges of each button report."""
         while not self.paramDict['escape']:
-            super().get_interrupt_msg()
+            if super().get_interrupt_msg() != 0:
+                continue  # timeout: the edges are still those of the last report
 
-            for key in self.paramKeyList[6:]:
-                if self.paramDict[key]:
-                    print(key + ' is pressed.')
-            time.sleep(sleepPeriod)
+            for key in self.buttonsPressed:
+                print(key + ' is pressed.')
+            for key in self.buttonsReleased:
+                print(key + ' is released.')
 
 
     def print_joystick_active(self):
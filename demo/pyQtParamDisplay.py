@@ -9,16 +9,15 @@ a window.
 ######################################################################################################
 import spaceMouseProWireless as sm
 from PyQt5.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QWidget, QTableWidget, QTableWidgetItem
-from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
 import sys
 
 
 ######################################################################################################
-# Window and worker class - Qt
+# Window, widget and worker class - Qt
 ######################################################################################################
 class SpaceMouseLoop(QObject):
     finished = pyqtSignal()
-    progress = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -26,80 +25,104 @@ class SpaceMouseLoop(QObject):
 
     def run(self):
         while not self.ct.paramDict['escape']:
-            ret = self.ct.get_interrupt_msg()
-            if ret == 0:
-                self.progress.emit()
+            self.ct.get_interrupt_msg()
         self.finished.emit()
 
 
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
+class ParamDisplayWidget(QWidget):
+    """Displays the paramDict of a spacemouse in two tables.
+    Reports only mark the display dirty (via subscribe, from any thread). A timer running at the screen refresh
+    rate then updates the cells whose text changed, so the GUI thread does not follow the report rate.
+    """
+    def __init__(self, ct, refreshInterval=16, parent=None):
+        """ct: SpaceMouseProWireless, refreshInterval: in ms."""
+        super().__init__(parent)
 
         # MEMBER VARIABLES
+        self.ct = ct
         self.table1 = QTableWidget()
         self.table2 = QTableWidget()
 
-        self.thread = QThread()
-        self.worker = SpaceMouseLoop()
+        # PRIVATE VARIABLES
+        self._dirty = True
+        self._cells = []  # (key, value item, displayed text)
+        self._timer = QTimer(self)
 
         # SETUP
-        self.windowSetup()
-        self.runSpaceMouse()
+        self._tableSetup(self.table1, self.ct.paramKeyList[:10])
+        self._tableSetup(self.table2, self.ct.paramKeyList[10:])
 
+        columns = QHBoxLayout()
+        columns.addWidget(self.table1)
+        columns.addWidget(self.table2)
+        self.setLayout(columns)
 
-    def windowSetup(self):
-        self.setWindowTitle('Spacemouse Pro Wireless')
+        self._subscription = self.ct.subscribe(self._markDirty)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(refreshInterval)
 
-        self.table1.setRowCount(10)
-        self.table1.setColumnCount(2)
-        self.table1.horizontalHeader().hide()
-        self.table1.verticalHeader().hide()
 
-        self.table2.setRowCount(11)
-        self.table2.setColumnCount(2)
-        self.table2.horizontalHeader().hide()
-        self.table2.verticalHeader().hide()
+    def _tableSetup(self, table, keys):
+        table.setRowCount(len(keys))
+        table.setColumnCount(2)
+        table.horizontalHeader().hide()
+        table.verticalHeader().hide()
 
-        for row, entry in enumerate(self.worker.ct.paramKeyList[:10]):
-            newItem = QTableWidgetItem(entry)
-            self.table1.setItem(row, 0, newItem)
-            row += 1
+        for row, entry in enumerate(keys):
+            table.setItem(row, 0, QTableWidgetItem(entry))
+            valueItem = QTableWidgetItem('')
+            table.setItem(row, 1, valueItem)
+            self._cells.append([entry, valueItem, None])
 
-        for row, entry in enumerate(self.worker.ct.paramKeyList[10:]):
-            newItem = QTableWidgetItem(entry)
-            self.table2.setItem(row, 0, newItem)
-            row += 1
 
-        columns = QHBoxLayout()
-        columns.addWidget(self.table1)
-        columns.addWidget(self.table2)
+    def _markDirty(self, state, changedAxes, changedButtons):
+        self._dirty = True  # called on the spacemouse thread, only flag here
+
+
+    def refresh(self):
+        """Update cells whose value changed since the last refresh."""
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        for cell in self._cells:
+            text = str(self.ct.paramDict[cell[0]])
+            if text != cell[2]:
+                cell[1].setText(text)
+                cell[2] = text
+
 
-        container = QWidget()
-        container.setLayout(columns)
+    def stop(self):
+        self._timer.stop()
+        self.ct.unsubscribe(self._subscription)
 
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        # MEMBER VARIABLES
+        self.thread = QThread()
+        self.worker = SpaceMouseLoop()
+        self.display = ParamDisplayWidget(self.worker.ct)
+
+        # SETUP
+        self.windowSetup()
+        self.runSpaceMouse()
+
+
+    def windowSetup(self):
+        self.setWindowTitle('Spacemouse Pro Wireless')
         self.setMinimumSize(430, 350)
-        self.setCentralWidget(container)
+        self.setCentralWidget(self.display)
 
 
     def runSpaceMouse(self):
         self.worker.moveToThread(self.thread)
         self.thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.display.stop)
         self.worker.finished.connect(self.thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.finished.connect(QApplication.quit)
-        self.worker.progress.connect(self.displayParams)
         self.thread.start()
-
-
-    def displayParams(self):
-        for row, entry in enumerate(self.worker.ct.paramKeyList[:10]):
-            newItem = QTableWidgetItem(str(self.worker.ct.paramDict[entry]))
-            self.table1.setItem(row, 1, newItem)
-            row += 1
-
-        for row, entry in enumerate(self.worker.ct.paramKeyList[10:]):
-            newItem = QTableWidgetItem(str(self.worker.ct.paramDict[entry]))
-            self.table2.setItem(row, 1, newItem)
-            row += 1
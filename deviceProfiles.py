@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+Registry of the report layouts of 3Dconnexion devices, declared as data and compiled into decoders.
+
+A DeviceProfile maps each message type (first report byte) to a layout:
+    AxisReport   : struct format unpacked at offset, one (axis name, sign) per value. Devices with separate
+                   translation and rotation reports declare two AxisReports, each writing only its own axes.
+    ButtonReport : struct format of the button register at offset. bits: name of the button (see BUTTON_MASKS) of
+                   each device bit, lowest bit first, None for unused bits, or None if the register already has the
+                   BUTTON_MASKS layout.
+    EVENT        : known report without payload to decode (e.g. inactivity).
+compile_decoders generates one straight-line function per report type, without branches on the layout.
+
+Layouts other than the SpaceMouse Pro Wireless receiver are declared from the devices' published report formats,
+with the axis signs of the receiver.
+"""
+import collections
+import struct
+
+from spaceMouseState import AXIS_INDEX, BUTTON_MASKS
+
+
+AxisReport = collections.namedtuple('AxisReport', ['format', 'offset', 'axes'])
+ButtonReport = collections.namedtuple('ButtonReport', ['format', 'offset', 'bits'])
+EVENT = 'event'
+
+DeviceProfile = collections.namedtuple('DeviceProfile', ['name', 'vendor_id', 'product_id', 'reports'])
+DeviceProfile.__doc__ = """reports: {message type: AxisReport, ButtonReport or EVENT}."""
+
+# Decoder kinds returned by compile_decoders
+AXES = 'axes'
+BUTTONS = 'buttons'
+
+
+######################################################################################################
+# Profiles
+######################################################################################################
+
+# Rotation fields come as pitch, roll, yaw. All axes but x are negated into the state's orientation.
+_COMBINED_AXES = AxisReport('<6h', 1, (('x', 1), ('y', -1), ('z', -1), ('pitch', -1), ('roll', -1), ('yaw', -1)))
+_TRANSLATION_AXES = AxisReport('<3h', 1, (('x', 1), ('y', -1), ('z', -1)))
+_ROTATION_AXES = AxisReport('<3h', 1, (('pitch', -1), ('roll', -1), ('yaw', -1)))
+_TWO_BUTTONS = ButtonReport('<B', 1, ('menu', 'fit'))  # left, right button
+
+SPACEMOUSE_PRO_WIRELESS = DeviceProfile('SpaceMouse Pro Wireless (receiver)', 0x256f, 0xc652,
+                                        {1: _COMBINED_AXES,
+                                         3: ButtonReport('>I', 1, None),
+                                         22: EVENT,  # long press
+                                         23: EVENT})  # inactivity
+
+SPACEMOUSE_PRO_WIRELESS_CABLE = SPACEMOUSE_PRO_WIRELESS._replace(name='SpaceMouse Pro Wireless (cable)',
+                                                                 product_id=0xc631)
+
+SPACEMOUSE_WIRELESS = DeviceProfile('SpaceMouse Wireless (receiver)', 0x256f, 0xc62f,
+                                    {1: _COMBINED_AXES,
+                                     3: _TWO_BUTTONS,
+                                     23: EVENT})
+
+SPACEMOUSE_WIRELESS_CABLE = SPACEMOUSE_WIRELESS._replace(name='SpaceMouse Wireless (cable)', product_id=0xc62e)
+
+SPACEMOUSE_COMPACT = DeviceProfile('SpaceMouse Compact', 0x256f, 0xc635,
+                                   {1: _TRANSLATION_AXES,
+                                    2: _ROTATION_AXES,
+                                    3: _TWO_BUTTONS})
+
+SPACE_NAVIGATOR = DeviceProfile('SpaceNavigator', 0x046d, 0xc626,
+                                {1: _TRANSLATION_AXES,
+                                 2: _ROTATION_AXES,
+                                 3: _TWO_BUTTONS})
+
+PROFILES = {}
+
+
+def register_profile(profile):
+    """Add or replace the profile of its vendor and product id."""
+    compile_decoders(profile)  # reject broken layouts right away
+    PROFILES[(profile.vendor_id, profile.product_id)] = profile
+
+
+def find_profile(vendor_id, product_id, default=SPACEMOUSE_PRO_WIRELESS):
+    """Profile registered for the ids, default if there is none."""
+    return PROFILES.get((vendor_id, product_id), default)
+
+
+######################################################################################################
+# Compilation
+######################################################################################################
+
+def compile_decoders(profile):
+    """{message type: (kind, decode)} of the profile.
+    AXES: decode(msg, axes) returns all six axes in state order, axes not in the report are taken from axes.
+    BUTTONS: decode(msg) returns the button register in BUTTON_MASKS layout.
+    EVENT: (EVENT, None).
+    msg is any bytes-like report, long enough for the layout.
+    """
+    decoders = {}
+    for msgType, layout in profile.reports.items():
+        if layout == EVENT:
+            decoders[msgType] = (EVENT, None)
+        elif isinstance(layout, AxisReport):
+            decoders[msgType] = (AXES, _compile_axis_report(layout))
+        elif isinstance(layout, ButtonReport):
+            decoders[msgType] = (BUTTONS, _compile_button_report(layout))
+        else:
+            raise ValueError('Unknown layout of message type ' + str(msgType) + ': ' + repr(layout))
+    return decoders
+
+
+def _compile(lines, layout):
+    namespace = dict(unpack_from=struct.Struct(layout.format).unpack_from)
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+
+def _compile_axis_report(layout):
+    layoutStruct = struct.Struct(layout.format)
+    if len(layoutStruct.unpack(bytes(layoutStruct.size))) != len(layout.axes):
+        raise ValueError('Format ' + layout.format + ' does not hold one value per axis of ' + repr(layout.axes))
+
+    values = ['v%d' % i for i in range(len(layout.axes))]
+    plain = ['axes[%d]' % i for i in range(6)]  # axes not in this report keep their value
+    saturated = list(plain)
+    negated = []
+    for value, (axis, sign) in zip(values, layout.axes):
+        if axis not in AXIS_INDEX:
+            raise ValueError('Unknown axis ' + repr(axis))
+        index = AXIS_INDEX[axis]
+        if sign < 0:
+            plain[index] = '-' + value
+            saturated[index] = '(32767 if %s == -32768 else -%s)' % (value, value)  # -(-32768) does not fit int16
+            negated.append(value)
+        else:
+            plain[index] = saturated[index] = value
+
+    lines = ['def decode(msg, axes):',
+             '    %s, = unpack_from(msg, %d)' % (', '.join(values), layout.offset)]
+    if negated:
+        lines += ['    if -32768 in (%s,):' % ', '.join(negated),
+                  '        return (%s)' % ', '.join(saturated)]
+    lines.append('    return (%s)' % ', '.join(plain))
+    return _compile(lines, layout)
+
+
+def _compile_button_report(layout):
+    if layout.bits is None:
+        return _compile(['def decode(msg):',
+                         '    return unpack_from(msg, %d)[0]' % layout.offset], layout)
+
+    terms = []
+    for bit, name in enumerate(layout.bits):
+        if name is None:
+            continue
+        if name not in BUTTON_MASKS:
+            raise ValueError('Unknown button ' + repr(name))
+        terms.append('(%d if register & %d else 0)' % (BUTTON_MASKS[name], 1 << bit))
+
+    return _compile(['def decode(msg):',
+                     '    register = unpack_from(msg, %d)[0]' % layout.offset,
+                     '    return %s' % (' | '.join(terms) or '0')], layout)
+
+
+######################################################################################################
+# Registration
+######################################################################################################
+
+for _profile in (SPACEMOUSE_PRO_WIRELESS, SPACEMOUSE_PRO_WIRELESS_CABLE, SPACEMOUSE_WIRELESS,
+                 SPACEMOUSE_WIRELESS_CABLE, SPACEMOUSE_COMPACT, SPACE_NAVIGATOR):
+    register_profile(_profile)
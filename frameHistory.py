@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Bounded history of decoded frames (timestamp, six axes, button register) in parallel typed arrays.
+
+The arrays are mirrored double buffers: frame k is written at slot k % capacity and at slot k % capacity + capacity,
+so the last capacity frames are always one contiguous range. Queries return FrameWindows of memoryviews into the
+arrays, without copying. Single writer (the decoding thread); the memory of a view is overwritten once capacity newer
+frames were appended, copy (to_numpy(copy=True)) to keep a window longer.
+"""
+import array
+import bisect
+import time
+
+try:
+    import numpy as np
+except ImportError:  # only to_numpy needs numpy
+    np = None
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class FrameWindow:
+    """Consecutive frames. sequence: sequence number of the first frame. timestamps: memoryview of int64 ns,
+    axes: memoryview of n * 6 int16, six per frame in state order, buttons: memoryview of uint32 bit registers.
+    """
+    __slots__ = ('sequence', 'timestamps', 'axes', 'buttons')
+
+    def __init__(self, sequence, timestamps, axes, buttons):
+        self.sequence = sequence
+        self.timestamps = timestamps
+        self.axes = axes
+        self.buttons = buttons
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def to_numpy(self, copy=False):
+        """(timestamps (n,), axes (n, 6), buttons (n,)) as NumPy arrays, views on the history unless copy."""
+        if np is None:
+            raise ImportError('to_numpy needs numpy')
+        timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+        axes = np.frombuffer(self.axes, dtype=np.int16).reshape(-1, 6)
+        buttons = np.frombuffer(self.buttons, dtype=np.uint32)
+        if copy:
+            return timestamps.copy(), axes.copy(), buttons.copy()
+        return timestamps, axes, buttons
+
+
+class FrameHistory:
+    def __init__(self, capacity=4096):
+        """capacity: number of frames kept."""
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1')
+
+        self.capacity = capacity
+
+        # PRIVATE VARIABLES
+        self._timestamps = array.array('q', bytes(8 * 2 * capacity))
+        self._axes = array.array('h', bytes(2 * 6 * 2 * capacity))
+        self._buttons = array.array('I', bytes(4 * 2 * capacity))
+        self._timestampView = memoryview(self._timestamps)
+        self._axesView = memoryview(self._axes)
+        self._buttonView = memoryview(self._buttons)
+        self._count = 0  # frames appended so far, sequence number of the next frame
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    @property
+    def sequence(self):
+        """Sequence number of the next frame (frames appended so far)."""
+        return self._count
+
+    @property
+    def oldest_sequence(self):
+        return max(0, self._count - self.capacity)
+
+    def append(self, timestamp, axes, buttons):
+        """Writer side. timestamp in ns (not decreasing), axes: array('h') of six in state order (e.g. state.axes)."""
+        count = self._count
+        slot = count % self.capacity
+        mirror = slot + self.capacity
+
+        timestamps = self._timestamps
+        timestamps[slot] = timestamp
+        timestamps[mirror] = timestamp
+        axesArray = self._axes
+        axesArray[6 * slot:6 * slot + 6] = axes
+        axesArray[6 * mirror:6 * mirror + 6] = axes
+        self._buttons[slot] = buttons
+        self._buttons[mirror] = buttons
+
+        self._count = count + 1  # publish the frame only after it is completely written
+
+    def since_sequence(self, sequence):
+        """Frames from sequence number on (from the oldest one kept if older)."""
+        count = self._count
+        return self._window(max(sequence, count - self.capacity, 0), count)
+
+    def last_frames(self, n):
+        count = self._count
+        return self._window(max(count - n, count - self.capacity, 0), count)
+
+    def between(self, start, end=None):
+        """Frames with start <= timestamp < end (ns), end None: up to the newest frame."""
+        count = self._count
+        first = max(count - self.capacity, 0)
+        kept = self._window(first, count).timestamps
+        lower = bisect.bisect_left(kept, start)
+        upper = len(kept) if end is None else bisect.bisect_left(kept, end, lower)
+        return self._window(first + lower, first + max(lower, upper))
+
+    def last(self, seconds, now=None):
+        """Frames of the last seconds before now (ns, time.monotonic_ns() if None), e.g. last(0.5)."""
+        if now is None:
+            now = time.monotonic_ns()
+        return self.between(now - int(seconds * 1e9))
+
+    def _window(self, first, end):
+        """Frames with sequence numbers first <= sequence < end, end - first <= capacity."""
+        start = first % self.capacity
+        stop = start + (end - first)
+        return FrameWindow(first,
+                           self._timestampView[start:stop],
+                           self._axesView[6 * start:6 * stop],
+                           self._buttonView[start:stop])
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+Recognizes button gestures from the button bit register and report timestamps: chords, press order (nested
+presses), long presses, taps and double taps, and calls the action bound to them.
+
+Incremental and cheap enough for the decoding thread: a report without button change costs two int comparisons,
+a button change one dict lookup per gesture kind. Actions run on the thread feeding the engine, keep them short.
+Buttons are given by name (see BUTTON_MASKS), combinations as iterables of names.
+"""
+import collections
+
+from spaceMouseState import BUTTON_MASKS, button_edges
+
+
+# Gesture kinds
+CHORD = 'chord'  # the held buttons became exactly this combination by a press, in any order
+SEQUENCE = 'sequence'  # the held buttons were pressed in exactly this order
+LONG_PRESS = 'long_press'  # combination held unchanged for long_press s (or long press report of the device)
+TAP = 'tap'  # combination released completely without long press
+DOUBLE_TAP = 'double_tap'  # same combination tapped twice within double_tap s
+
+Gesture = collections.namedtuple('Gesture', ['kind', 'buttons', 'timestamp'])
+Gesture.__doc__ = """Recognized gesture passed to the action. buttons: tuple of button names, timestamp in ns."""
+
+
+def buttons_mask(buttons):
+    """Bit register mask of button names."""
+    mask = 0
+    for name in buttons:
+        mask |= BUTTON_MASKS[name]
+    return mask
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class GestureEngine:
+    def __init__(self, long_press=0.5, double_tap=0.3, long_press_msg_type=22):
+        """long_press, double_tap: s. long_press_msg_type: message type of the device's own long press report,
+        firing LONG_PRESS for the held buttons right away (None to ignore it).
+        """
+        self.longPressNs = int(long_press * 1e9)
+        self.doubleTapNs = int(double_tap * 1e9)
+        self.longPressMsgType = long_press_msg_type
+
+        # PRIVATE VARIABLES
+        self._actions = {}  # (kind, mask) or (SEQUENCE, tuple of masks in press order) -> action
+        self._held = 0
+        self._order = ()  # masks of the held buttons in press order
+        self._gestureMask = 0  # every button pressed since all were released
+        self._longPressDeadline = None  # ns, None: no long press pending
+        self._longPressFired = False  # for the held combination
+        self._gestureLongPressed = False  # any long press since all buttons were released: no tap
+        self._lastTapMask = 0
+        self._lastTapTime = 0
+
+        self._mouse = None
+
+    def bind(self, kind, buttons, action):
+        """Call action(gesture) when the gesture kind (CHORD, SEQUENCE, LONG_PRESS, TAP, DOUBLE_TAP) is recognized
+        on the buttons. Replaces an action bound to the same gesture before.
+        """
+        self._actions[self._key(kind, buttons)] = action
+
+    def unbind(self, kind, buttons):
+        self._actions.pop(self._key(kind, buttons), None)
+
+    def attach(self, mouse):
+        """Feed the engine from a SpaceMouseProWireless with every decoded report and read timeout."""
+        self.detach()
+        self._mouse = mouse
+        mouse.gestures = self
+
+    def detach(self):
+        if self._mouse is not None:
+            if self._mouse.gestures is self:
+                self._mouse.gestures = None
+            self._mouse = None
+
+    def on_report(self, msg_type, buttons, timestamp):
+        """Feed one decoded report: message type, button register after it, timestamp in ns."""
+        if buttons != self._held:
+            self.on_buttons(buttons, timestamp)
+        elif msg_type == self.longPressMsgType and self._held and not self._longPressFired:
+            self._fire_long_press(timestamp)
+        if self._longPressDeadline is not None and timestamp >= self._longPressDeadline:
+            self._fire_long_press(timestamp)
+
+    def tick(self, timestamp):
+        """Time passed without report (ns), fires a due long press."""
+        if self._longPressDeadline is not None and timestamp >= self._longPressDeadline:
+            self._fire_long_press(timestamp)
+
+    def on_buttons(self, bitReg, timestamp):
+        """Feed a new button register."""
+        previous = self._held
+        if bitReg == previous:
+            return
+        pressedMask = bitReg & ~previous
+        releasedMask = previous & ~bitReg
+        self._held = bitReg
+
+        if releasedMask:
+            self._order = tuple(mask for mask in self._order if not mask & releasedMask)
+        if pressedMask:
+            pressed = button_edges(0, pressedMask)[0]  # lowest bit first
+            self._order += tuple(BUTTON_MASKS[name] for name in pressed)
+            self._gestureMask |= pressedMask
+            self._dispatch((CHORD, bitReg), timestamp)
+            self._dispatch((SEQUENCE, self._order), timestamp)
+
+        if bitReg:
+            self._longPressDeadline = timestamp + self.longPressNs  # long press of the changed combination
+            self._longPressFired = False
+            return
+
+        # all released
+        mask = self._gestureMask
+        self._gestureMask = 0
+        self._longPressDeadline = None
+        self._longPressFired = False
+        if self._gestureLongPressed:
+            self._gestureLongPressed = False
+            return
+        self._dispatch((TAP, mask), timestamp)
+        if mask == self._lastTapMask and timestamp - self._lastTapTime <= self.doubleTapNs:
+            self._lastTapMask = 0
+            self._dispatch((DOUBLE_TAP, mask), timestamp)
+        else:
+            self._lastTapMask = mask
+            self._lastTapTime = timestamp
+
+    def reset(self):
+        """Forget the held buttons and the last tap without firing a gesture (e.g. the receiver was lost)."""
+        self._held = 0
+        self._order = ()
+        self._gestureMask = 0
+        self._longPressDeadline = None
+        self._longPressFired = False
+        self._gestureLongPressed = False
+        self._lastTapMask = 0
+        self._lastTapTime = 0
+
+    def _fire_long_press(self, timestamp):
+        self._longPressDeadline = None
+        self._longPressFired = True
+        self._gestureLongPressed = True
+        self._dispatch((LONG_PRESS, self._held), timestamp)
+
+    def _dispatch(self, key, timestamp):
+        action = self._actions.get(key)
+        if action is not None:
+            action(Gesture(key[0], self._names(key[1]), timestamp))
+
+    @staticmethod
+    def _key(kind, buttons):
+        if kind == SEQUENCE:
+            return (SEQUENCE, tuple(BUTTON_MASKS[name] for name in buttons))
+        if kind not in (CHORD, LONG_PRESS, TAP, DOUBLE_TAP):
+            raise ValueError('Unknown gesture kind ' + repr(kind))
+        return (kind, buttons_mask(buttons))
+
+    @staticmethod
+    def _names(masks):
+        if isinstance(masks, tuple):  # sequence, press order
+            return tuple(button_edges(0, mask)[0][0] for mask in masks)
+        return button_edges(0, masks)[0]
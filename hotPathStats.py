@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Cheap, always-on counters and latency histograms of the spacemouse read and decode path.
+Written by the thread decoding the reports, snapshot() can be called from any thread without stopping it
+(counters are plain ints, histograms are copied in one call).
+"""
+import array
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class LatencyHistogram:
+    """Histogram of durations in ns with power of two buckets: bucket k counts durations in [2**(k-1), 2**k)."""
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = array.array('Q', bytes(8 * 64))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[ns.bit_length()] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def snapshot(self):
+        """dict with count, mean_ns, max_ns, p50_ns, p99_ns (bucket upper bounds) and
+        buckets: {bucket upper bound in ns: count} of the non-empty buckets.
+        """
+        counts = self.counts.tolist()
+        count = sum(counts)
+        buckets = {1 << k: n for k, n in enumerate(counts) if n}
+        return dict(count=count,
+                    mean_ns=self.total / count if count else 0,
+                    max_ns=self.max,
+                    p50_ns=_percentile(buckets, count, 0.5),
+                    p99_ns=_percentile(buckets, count, 0.99),
+                    buckets=buckets)
+
+
+class ReportStatistics:
+    """reports: count per known message type, timeouts: reads without report (errno 110),
+    unknown: reports of unknown message type, decodeLatency: read return to decode complete,
+    interArrival: time between two consecutive reports.
+    usbErrors: usb errors other than timeouts, reconnects: successful reconnects after those,
+    recoveryTime: usb error to reconnected.
+    """
+    def __init__(self, msg_types=(1, 3, 22, 23)):
+        self.reports = dict.fromkeys(msg_types, 0)
+        self.timeouts = 0
+        self.unknown = 0
+        self.decodeLatency = LatencyHistogram()
+        self.interArrival = LatencyHistogram()
+        self.usbErrors = 0
+        self.reconnects = 0
+        self.recoveryTime = LatencyHistogram()
+
+        # PRIVATE VARIABLES
+        self._lastArrival = None
+
+    def record_report(self, msg_type, arrival, decoded):
+        """arrival, decoded: time.monotonic_ns() at read return and after decoding."""
+        if msg_type in self.reports:
+            self.reports[msg_type] += 1
+        else:
+            self.unknown += 1
+
+        self.decodeLatency.record(decoded - arrival)
+        if self._lastArrival is not None:
+            self.interArrival.record(arrival - self._lastArrival)
+        self._lastArrival = arrival
+
+    def snapshot(self):
+        return dict(reports=dict(self.reports),
+                    timeouts=self.timeouts,
+                    unknown=self.unknown,
+                    decode_latency=self.decodeLatency.snapshot(),
+                    inter_arrival=self.interArrival.snapshot(),
+                    usb_errors=self.usbErrors,
+                    reconnects=self.reconnects,
+                    recovery_time=self.recoveryTime.snapshot())
+
+
+def _percentile(buckets, count, fraction):
+    """Upper bound of the bucket holding the given fraction of all counts."""
+    if not count:
+        return 0
+    seen = 0
+    for upperBound, n in buckets.items():
+        seen += n
+        if seen >= fraction * count:
+            return upperBound
+    return upperBound
@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+"""
+Keeps several asynchronous interrupt transfers queued on the spacemouse endpoint, so the host controller always has
+a transfer ready when the receiver sends a report, also while the reading thread is busy decoding.
+Completed reports are handed back in completion order. Each transfer is resubmitted from its completion callback.
+
+Needs python-libusb1 (module usb1, optional dependency), pyusb has no asynchronous transfers.
+Callbacks run inside read() on the thread calling it (libusb event handling), so no locking is needed.
+"""
+import collections
+import time
+
+try:
+    import usb1
+except ImportError:
+    usb1 = None
+
+import usb.core
+import usb.util
+
+
+# libusb_transfer_status values
+TRANSFER_COMPLETED = 0
+TRANSFER_ERROR = 1
+TRANSFER_TIMED_OUT = 2
+TRANSFER_CANCELLED = 3
+TRANSFER_STALL = 4
+TRANSFER_NO_DEVICE = 5
+TRANSFER_OVERFLOW = 6
+
+# Transfer status -> errno of the usb.core.USBError raised by read, like the synchronous pyusb read would.
+_STATUS_ERRNO = {TRANSFER_ERROR: 5,  # EIO
+                 TRANSFER_TIMED_OUT: 110,
+                 TRANSFER_STALL: 32,  # EPIPE
+                 TRANSFER_NO_DEVICE: 19,  # ENODEV
+                 TRANSFER_OVERFLOW: 75}  # EOVERFLOW
+
+
+def open_transfer_queue(device, endpoint, packet_size, transfers=4, interface=0):
+    """InterruptTransferQueue on the usb1 handle of the device a pyusb device points to (same bus and address).
+    Releases the pyusb handle first: pyusb claims the interface on its first read, the usb1 claim would fail (busy).
+    """
+    if usb1 is None:
+        raise ImportError('Several outstanding transfers need python-libusb1 (pip install libusb1)')
+
+    usb.util.dispose_resources(device)  # pyusb reopens and claims again on its next read, after the queue is closed
+
+    context = usb1.USBContext()
+    context.open()
+    try:
+        handle = None
+        for candidate in context.getDeviceIterator(skip_on_error=True):
+            if candidate.getBusNumber() == device.bus and candidate.getDeviceAddress() == device.address:
+                handle = candidate.open()
+                break
+        if handle is None:
+            raise ValueError('No usb device at bus ' + str(device.bus) + ', address ' + str(device.address))
+        handle.claimInterface(interface)
+    except Exception:
+        context.close()
+        raise
+
+    return InterruptTransferQueue(context, handle, endpoint, packet_size, transfers, interface)
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class InterruptTransferQueue:
+    def __init__(self, context, handle, endpoint, packet_size, transfers=4, interface=0):
+        """context, handle: usb1.USBContext and usb1.USBDeviceHandle with the interface claimed (closed by close).
+        transfers: number of interrupt transfers kept submitted.
+        """
+        if transfers < 1:
+            raise ValueError('Need at least one transfer')
+
+        self.endpoint = endpoint
+        self.packetSize = packet_size
+        self.completed = 0  # reports received
+        self.maxQueued = 0  # most reports completed but not yet read at once
+
+        # PRIVATE VARIABLES
+        self._context = context
+        self._handle = handle
+        self._interface = interface
+        self._reports = collections.deque()
+        self._errorStatus = None
+        self._closing = False
+        self._transfers = []
+        for _ in range(transfers):
+            transfer = handle.getTransfer()
+            transfer.setInterrupt(endpoint, packet_size, callback=self._on_transfer, timeout=0)
+            transfer.submit()
+            self._transfers.append(transfer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._reports)
+
+    def read(self, endpoint, size, timeout):
+        """Oldest completed report (bytes), same signature as the pyusb read. timeout in ms.
+        Raises usb.core.USBError with errno 110 on timeout, or the errno of a failed transfer.
+        """
+        reports = self._reports
+        if not reports:
+            deadline = time.monotonic() + timeout / 1000
+            while not reports:
+                if self._errorStatus is not None:
+                    status = self._errorStatus
+                    raise usb.core.USBError('Interrupt transfer failed, status ' + str(status),
+                                            errno=_STATUS_ERRNO.get(status, 5))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise usb.core.USBError('Operation timed out', errno=110)
+                self._context.handleEventsTimeout(remaining)
+        return reports.popleft()
+
+    def close(self):
+        """Cancel the outstanding transfers, wait for their cancellation, release interface, handle and context."""
+        if self._closing:
+            return
+        self._closing = True
+        for transfer in self._transfers:
+            try:
+                transfer.cancel()
+            except Exception:
+                pass  # already completed or device gone
+        deadline = time.monotonic() + 1.0
+        while any(transfer.isSubmitted() for transfer in self._transfers) and time.monotonic() < deadline:
+            self._context.handleEventsTimeout(0.01)
+
+        try:
+            self._handle.releaseInterface(self._interface)
+        except Exception:
+            pass  # device gone
+        self._handle.close()
+        self._context.close()
+
+    def _on_transfer(self, transfer):
+        status = transfer.getStatus()
+        if status == TRANSFER_COMPLETED:
+            self._reports.append(transfer.getBuffer()[:transfer.getActualLength()])
+            self.completed += 1
+            if len(self._reports) > self.maxQueued:
+                self.maxQueued = len(self._reports)
+            if not self._closing:
+                transfer.submit()  # back in the queue right away
+        elif status != TRANSFER_CANCELLED:
+            self._errorStatus = status
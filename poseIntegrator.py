@@ -0,0 +1,301 @@
+#!/usr/bin/python3
+"""
+Integrates the six spacemouse axes, taken as velocity commands, into a 6-DoF pose.
+
+Translation (x, y, z) is a linear velocity, rotation (roll, pitch, yaw) an angular velocity about the x, y and z
+axis. Each report holds its velocity from its monotonic timestamp (ns) until the next one, so the integral only
+depends on the report timestamps, not on when it is computed. Orientation is a unit quaternion (w, x, y, z),
+renormalized after every step.
+A tick thread (start) advances the integration at a fixed rate, so the pose updates evenly also when the usb
+reports arrive in bursts. integrate_batch integrates recorded reports with NumPy (optional dependency).
+"""
+import math
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # only integrate_batch needs numpy
+    np = None
+
+from spaceMouseState import AXIS_NAMES
+
+
+######################################################################################################
+# Quaternion math, (w, x, y, z)
+######################################################################################################
+
+def quat_multiply(a, b):
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    return (aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw)
+
+
+def quat_from_rotation_vector(rx, ry, rz):
+    """Rotation by the angle |r| (rad) about the axis r."""
+    angle = math.sqrt(rx * rx + ry * ry + rz * rz)
+    if angle < 1e-12:
+        return (1.0, 0.5 * rx, 0.5 * ry, 0.5 * rz)  # first order, normalized by the caller
+    s = math.sin(0.5 * angle) / angle
+    return (math.cos(0.5 * angle), rx * s, ry * s, rz * s)
+
+
+def quat_rotate(q, v):
+    """Vector v rotated by the unit quaternion q."""
+    w, x, y, z = q
+    vx, vy, vz = v
+    # t = 2 * cross(q.xyz, v), v' = v + w * t + cross(q.xyz, t)
+    tx = 2 * (y * vz - z * vy)
+    ty = 2 * (z * vx - x * vz)
+    tz = 2 * (x * vy - y * vx)
+    return (vx + w * tx + y * tz - z * ty,
+            vy + w * ty + z * tx - x * tz,
+            vz + w * tz + x * ty - y * tx)
+
+
+def _normalized(q):
+    norm = math.sqrt(q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3])
+    return (q[0] / norm, q[1] / norm, q[2] / norm, q[3] / norm)
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class Pose:
+    """position (x, y, z), orientation unit quaternion (w, x, y, z), timestamp in ns (time.monotonic_ns)."""
+    __slots__ = ('position', 'orientation', 'timestamp')
+
+    def __init__(self, position=(0.0, 0.0, 0.0), orientation=(1.0, 0.0, 0.0, 0.0), timestamp=0):
+        self.position = tuple(position)
+        self.orientation = tuple(orientation)
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return 'Pose(position=%r, orientation=%r, timestamp=%d)' % (self.position, self.orientation, self.timestamp)
+
+
+class PoseIntegrator:
+    def __init__(self, translation_scale=1e-3, rotation_scale=1e-3, tick=0.01, body_frame=True):
+        """translation_scale: position units per s per axis count, rotation_scale: rad per s per axis count.
+        tick: period of the tick thread in s. body_frame: translation along the current orientation (flying),
+        else along the fixed world axes.
+        """
+        if tick <= 0:
+            raise ValueError('tick must be positive')
+
+        self.translationScale = translation_scale
+        self.rotationScale = rotation_scale
+        self.tickNs = int(tick * 1e9)
+        self.bodyFrame = body_frame
+
+        # Pose at the last tick (or advance), replaced as a whole, safe to read from any thread.
+        self.pose = Pose()
+
+        # PRIVATE VARIABLES
+        self._lock = threading.Lock()
+        self._position = (0.0, 0.0, 0.0)
+        self._orientation = (1.0, 0.0, 0.0, 0.0)
+        self._time = None  # ns, integrated up to here
+        self._velocity = (0.0, 0.0, 0.0)
+        self._angularVelocity = (0.0, 0.0, 0.0)
+
+        self._mouse = None
+        self._subscription = None
+        self._tickThread = None
+        self._tickStop = threading.Event()
+        self._tickListeners = []
+
+    def reset(self, position=(0.0, 0.0, 0.0), orientation=(1.0, 0.0, 0.0, 0.0)):
+        with self._lock:
+            self._position = tuple(float(value) for value in position)
+            self._orientation = _normalized(tuple(float(value) for value in orientation))
+            self.pose = Pose(self._position, self._orientation, self._time or 0)
+
+    def update(self, axes, timestamp):
+        """New velocity command: axes in state order (x, y, z, roll, pitch, yaw), valid from timestamp (ns) on.
+        A timestamp before the last integration point (tick thread ahead of the report) counts from that point.
+        """
+        with self._lock:
+            self._integrate_to(timestamp)
+            translation = self.translationScale
+            rotation = self.rotationScale
+            self._velocity = (axes[0] * translation, axes[1] * translation, axes[2] * translation)
+            self._angularVelocity = (axes[3] * rotation, axes[4] * rotation, axes[5] * rotation)
+
+    def advance(self, timestamp):
+        """Integrate the current velocity up to timestamp (ns), returns the new pose (also in self.pose)."""
+        with self._lock:
+            self._integrate_to(timestamp)
+            self.pose = Pose(self._position, self._orientation, self._time)
+            return self.pose
+
+    def attach(self, mouse):
+        """Take the velocity commands from a SpaceMouseProWireless (its conditionedAxes if conditioning is set)."""
+        self.detach()
+        self._mouse = mouse
+        self._subscription = mouse.subscribe(self._on_state, axes=AXIS_NAMES)
+
+    def detach(self):
+        if self._subscription is not None:
+            self._mouse.unsubscribe(self._subscription)
+            self._subscription = None
+            self._mouse = None
+
+    def add_tick_listener(self, listener):
+        """listener(pose) is called on the tick thread after every tick."""
+        self._tickListeners = self._tickListeners + [listener]  # copy, the tick thread may iterate the list
+
+    def remove_tick_listener(self, listener):
+        self._tickListeners = [entry for entry in self._tickListeners if entry is not listener]
+
+    def start(self):
+        """Advance the pose every tick on a background thread. Tick times are fixed multiples of the tick after the
+        start, a late tick does not shift the following ones, missed ticks are skipped.
+        """
+        if self._tickThread is not None:
+            raise RuntimeError('Tick thread already running')
+        self._tickStop.clear()
+        self._tickThread = threading.Thread(target=self._tick_loop, name='PoseIntegrator', daemon=True)
+        self._tickThread.start()
+
+    def stop(self, wait=True):
+        self._tickStop.set()
+        if wait and self._tickThread is not None and self._tickThread is not threading.current_thread():
+            self._tickThread.join()
+        self._tickThread = None
+
+    def integrate_batch(self, axes, timestamps):
+        """Integrate recorded velocity commands with NumPy. axes: (N, 6) in state order, timestamps: (N,) ns,
+        each row holding until the next one. Returns the poses at the N timestamps as positions (N, 3) and
+        orientations (N, 4). The integrator continues from its current state and ends at the last row.
+        """
+        if np is None:
+            raise ImportError('integrate_batch needs numpy')
+        axes = np.asarray(axes, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        count = len(axes)
+        positions = np.empty((count, 3))
+        orientations = np.empty((count, 4))
+        if count == 0:
+            return positions, orientations
+
+        with self._lock:
+            if self._time is None:
+                self._time = int(timestamps[0])
+            # Segment k runs from the previous point in time to timestamps[k] with the velocity held before it.
+            starts = np.maximum(np.concatenate(([self._time], timestamps[:-1])), self._time)
+            dt = np.maximum(timestamps - starts, 0) * 1e-9
+            velocity = np.vstack((self._velocity, axes[:-1, :3] * self.translationScale))
+            angular = np.vstack((self._angularVelocity, axes[:-1, 3:] * self.rotationScale))
+
+            rotation = angular * dt[:, None]
+            steps = _quat_from_rotation_vectors(rotation)
+            halfSteps = _quat_from_rotation_vectors(0.5 * rotation)
+            # orientation after segment k: q0 * step_0 * ... * step_k, as a vectorized prefix product
+            orientations[:] = _quat_prefix_product(np.vstack((self._orientation, steps)))[1:]
+            orientations /= np.linalg.norm(orientations, axis=1)[:, None]
+
+            displacement = velocity * dt[:, None]
+            if self.bodyFrame:
+                before = np.vstack((self._orientation, orientations[:-1]))
+                displacement = _quat_rotate_vectors(_quat_multiply_arrays(before, halfSteps), displacement)
+            positions[:] = np.asarray(self._position) + np.cumsum(displacement, axis=0)
+
+            self._position = tuple(positions[-1].tolist())
+            self._orientation = tuple(orientations[-1].tolist())
+            self._time = max(self._time, int(timestamps[-1]))
+            self._velocity = tuple((axes[-1, :3] * self.translationScale).tolist())
+            self._angularVelocity = tuple((axes[-1, 3:] * self.rotationScale).tolist())
+            self.pose = Pose(self._position, self._orientation, self._time)
+        return positions, orientations
+
+    def _on_state(self, state, changedAxes, changedButtons):
+        mouse = self._mouse
+        if mouse is None:
+            return
+        axes = mouse.conditionedAxes if mouse.conditioning is not None else state.axes
+        self.update(axes, mouse.timestamp)
+
+    def _tick_loop(self):
+        nextTick = time.monotonic_ns() + self.tickNs
+        while not self._tickStop.wait(max(0, nextTick - time.monotonic_ns()) * 1e-9):
+            pose = self.advance(nextTick)
+            for listener in self._tickListeners:
+                listener(pose)
+
+            nextTick += self.tickNs
+            now = time.monotonic_ns()
+            if nextTick < now:  # fell behind, skip the missed ticks
+                nextTick += (now - nextTick) // self.tickNs * self.tickNs + self.tickNs
+
+    def _integrate_to(self, timestamp):
+        """Integrate the held velocity from self._time to timestamp, in steps of at most one tick."""
+        if self._time is None:
+            self._time = timestamp
+            return
+        while self._time < timestamp:
+            end = min(timestamp, self._time + self.tickNs)
+            self._step((end - self._time) * 1e-9)
+            self._time = end
+
+    def _step(self, dt):
+        wx, wy, wz = self._angularVelocity
+        vx, vy, vz = self._velocity
+        if wx or wy or wz:
+            halfStep = quat_from_rotation_vector(0.5 * wx * dt, 0.5 * wy * dt, 0.5 * wz * dt)
+            middle = quat_multiply(self._orientation, halfStep)  # midpoint orientation for the translation
+            self._orientation = _normalized(quat_multiply(middle, halfStep))
+        else:
+            middle = self._orientation
+        if vx or vy or vz:
+            if self.bodyFrame:
+                vx, vy, vz = quat_rotate(_normalized(middle), (vx, vy, vz))
+            x, y, z = self._position
+            self._position = (x + vx * dt, y + vy * dt, z + vz * dt)
+
+
+######################################################################################################
+# Vectorized quaternion math for integrate_batch, rows of (w, x, y, z)
+######################################################################################################
+
+def _quat_from_rotation_vectors(r):
+    angle = np.linalg.norm(r, axis=1)
+    small = angle < 1e-12
+    safeAngle = np.where(small, 1.0, angle)
+    s = np.where(small, 0.5, np.sin(0.5 * safeAngle) / safeAngle)
+    q = np.empty((len(r), 4))
+    q[:, 0] = np.where(small, 1.0, np.cos(0.5 * safeAngle))
+    q[:, 1:] = r * s[:, None]
+    return q
+
+
+def _quat_multiply_arrays(a, b):
+    aw, ax, ay, az = a.T
+    bw, bx, by, bz = b.T
+    return np.stack((aw * bw - ax * bx - ay * by - az * bz,
+                     aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw), axis=1)
+
+
+def _quat_prefix_product(q):
+    """Inclusive prefix product q_0 * q_1 * ... * q_k for every k (Hillis-Steele scan, log2(N) vectorized passes)."""
+    q = q.copy()
+    shift = 1
+    while shift < len(q):
+        q[shift:] = _quat_multiply_arrays(q[:-shift], q[shift:])
+        q[shift:] /= np.linalg.norm(q[shift:], axis=1)[:, None]
+        shift *= 2
+    return q
+
+
+def _quat_rotate_vectors(q, v):
+    q = q / np.linalg.norm(q, axis=1)[:, None]
+    w = q[:, :1]
+    xyz = q[:, 1:]
+    t = 2 * np.cross(xyz, v)
+    return v + w * t + np.cross(xyz, t)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Read timeout policy for the spacemouse interrupt endpoint.
+A short timeout while the spacemouse is in use, a long one once it reports inactivity (message type 23) or stays
+silent. Reports are returned as soon as they arrive in both modes, the timeout only sets how often an idle reader
+wakes up (and how long stopping the reader may take).
+"""
+import time
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class ReadTimeoutPolicy:
+    def __init__(self, active_timeout=10, idle_timeout=1000, idle_after=2000):
+        """active_timeout, idle_timeout: usb read timeout in ms while active / idle. Both must be > 0: a pending
+        pyusb read cannot be cancelled, so a finite timeout bounds the time stop_reader waits.
+        idle_after: ms without report after which the reader goes idle (immediately on an inactivity report).
+        By default an idle reader wakes up once per second instead of 100 times, stop_reader then takes up to 1 s.
+        ReadTimeoutPolicy(idle_timeout=10) keeps the fixed 10 ms timeout.
+        """
+        if active_timeout <= 0 or idle_timeout <= 0:
+            raise ValueError('Timeouts must be positive (ms)')
+
+        self.activeTimeout = active_timeout
+        self.idleTimeout = idle_timeout
+        self.idleAfter = idle_after
+        self.idle = False
+        self.timeout = active_timeout  # timeout of the next read, in ms
+
+        # PRIVATE VARIABLES
+        self._lastReport = time.monotonic_ns()
+
+    def on_report(self, msg_type):
+        if msg_type == 23:  # inactivity
+            self.idle = True
+            self.timeout = self.idleTimeout
+            return
+
+        self._lastReport = time.monotonic_ns()
+        if self.idle:
+            self.idle = False
+            self.timeout = self.activeTimeout
+
+    def on_timeout(self):
+        if not self.idle and time.monotonic_ns() - self._lastReport >= self.idleAfter * 1000000:
+            self.idle = True
+            self.timeout = self.idleTimeout
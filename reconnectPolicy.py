@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+"""
+Reconnect policy of the spacemouse after usb errors (receiver dropped off the bus).
+Exponential backoff between reconnect attempts, bounded by a maximum delay, for at most give_up_after seconds.
+"""
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class ReconnectPolicy:
+    def __init__(self, initial_delay=0.01, factor=2.0, max_delay=0.2, give_up_after=10.0):
+        """Delays in s. give_up_after: s after the usb error until the error is raised after all, None retries forever.
+        The short default delays let a receiver that is back on the bus be reconnected within well under a second.
+        """
+        if initial_delay < 0 or factor < 1 or max_delay < initial_delay:
+            raise ValueError('Need 0 <= initial_delay <= max_delay and factor >= 1')
+
+        self.initialDelay = initial_delay
+        self.factor = factor
+        self.maxDelay = max_delay
+        self.giveUpAfter = give_up_after
+
+    def delays(self):
+        """Delays before each reconnect attempt."""
+        delay = self.initialDelay
+        while True:
+            yield delay
+            delay = min(delay * self.factor, self.maxDelay)
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+""" replay_usb.core
+
+    Replay backend for the usb package. Core: plays a report capture (see reportCapture.py) back
+    through the same read interface as a physical device. Stands in for usb.core the way stub_usb does.
+
+"""
+
+__all__ = ['find', 'Device', 'Endpoint', 'USBError', 'load', 'install']
+
+
+import array
+import sys
+import time
+
+from reportCapture import ReportCapture
+
+
+_device = None
+
+
+def load(path, speed=1.0):
+    """New replay device of the capture file, returned by every find until the next load (so a reconnect finds the
+       same device and playback does not start over). Closes the capture of the previous one.
+       speed: 1.0 plays back in real time, 2.0 twice as fast, None as fast as possible.
+    """
+    global _device
+    if speed is not None and speed <= 0:
+        raise ValueError('Speed must be positive or None')
+    device = Device(ReportCapture(path), speed)
+    if _device is not None:
+        _device.capture.close()
+    _device = device
+    return device
+
+
+def install(path, speed=1.0):
+    """Replace the usb package by this backend. Call before importing spaceMouseProWireless."""
+    load(path, speed)
+    import replay_usb.util
+    sys.modules['usb'] = sys.modules['replay_usb']
+    sys.modules['usb.core'] = sys.modules[__name__]
+    sys.modules['usb.util'] = replay_usb.util
+
+
+def find(idVendor=None, idProduct=None, find_all=False, custom_match=None, **kwargs):
+    device = _device
+    if device is None:
+        raise RuntimeError('No capture loaded, call replay_usb.core.load first')
+
+    if device.exhausted or \
+            (idVendor is not None and idVendor != device.idVendor) or \
+            (idProduct is not None and idProduct != device.idProduct) or \
+            (custom_match is not None and not custom_match(device)):
+        return iter([]) if find_all else None  # an exhausted capture is an unplugged receiver
+
+    return iter([device]) if find_all else device
+
+
+class Device:
+    def __init__(self, capture, speed=1.0):
+        self.capture = capture
+        self.speed = speed
+        self.idVendor = capture.idVendor
+        self.idProduct = capture.idProduct
+        self.bus = 1
+        self.address = 1
+        self.port_numbers = None  # no physical port: the device cache does not look for it in sysfs
+
+        self._index = 0
+        self._start = None  # (capture timestamp, monotonic time) of the first report read
+
+    def get_active_configuration(self):
+        # configuration[(interface, alternate setting)][endpoint index], reports of the recorded length
+        return {(0, 0): [Endpoint(0x81, self.capture.reportLength)]}
+
+    @property
+    def exhausted(self):
+        return self._index >= len(self.capture)
+
+    @staticmethod
+    def is_kernel_driver_active(var):
+        return False
+
+    @staticmethod
+    def detach_kernel_driver(var):
+        pass
+
+    def read(self, address, size_or_buffer, timeout):
+        """Next report of the capture, at its recorded time (scaled by speed).
+           Like pyusb, size_or_buffer is the msg length (returns a new array) or an array.array('B') to read into
+           (returns the number of bytes read).
+           Raises a timeout (errno 110) if the report is not due within timeout ms,
+           and no device (errno 19) once the capture is exhausted.
+        """
+        if self.exhausted:
+            raise USBError('No such device (capture exhausted)', errno=19)
+
+        timestamp = self.capture.timestamp(self._index)
+
+        if self.speed is not None:
+            now = time.monotonic_ns()
+            if self._start is None:
+                self._start = (timestamp, now)
+            due = self._start[1] + (timestamp - self._start[0]) / self.speed
+            wait = (due - now) / 1e9
+            if wait > 0:
+                if timeout and wait > timeout / 1000:
+                    time.sleep(timeout / 1000)
+                    raise USBError('Operation timed out', errno=110)
+                time.sleep(wait)
+
+        report = self.capture[self._index][1]
+        self._index += 1
+        if isinstance(size_or_buffer, array.array):
+            length = min(len(report), len(size_or_buffer))
+            memoryview(size_or_buffer)[:length] = report[:length]
+            report.release()
+            return length
+        usb_msg = array.array('B', report[:size_or_buffer])
+        report.release()
+        return usb_msg
+
+
+class Endpoint:
+    def __init__(self, bEndpointAddress, wMaxPacketSize):
+        self.bEndpointAddress = bEndpointAddress
+        self.wMaxPacketSize = wMaxPacketSize
+
+
+class USBError(IOError):
+    def __init__(self, strerror, error_code=None, errno=None):
+        IOError.__init__(self, errno, strerror)
+        self.backend_error_code = error_code
@@ -0,0 +1,9 @@
+#!/usr/bin/python3
+""" replay_usb.util
+
+    Replay backend for the usb package. Util: Usb utility functions.
+"""
+
+
+def dispose_resources(device):
+    pass  # like pyusb, the device can be opened again (reconnect), replay_usb.core.load closes its capture
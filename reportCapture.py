@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+"""
+Compact, append-only binary capture of raw spacemouse reports.
+
+File layout (little endian):
+    header : magic b'SMREPCAP', version uint16, report length uint16, idVendor uint16, idProduct uint16
+    records: timestamp int64 (ns, time.monotonic_ns), msg length uint16, 6 pad bytes, report padded to report length
+All records have the same size, so the file can be memory-mapped and indexed directly (see ReportCapture).
+"""
+import array
+import mmap
+import os
+import struct
+import threading
+import time
+
+
+MAGIC = b'SMREPCAP'
+VERSION = 1
+HEADER = struct.Struct('<8sHHHH')
+RECORD_PREFIX = struct.Struct('<qH6x')
+
+
+def _as_bytes(usb_msg):
+    # pyusb returns array('B'), arrays of wider items (tests, stubs) hold one byte per item as well.
+    if isinstance(usb_msg, array.array) and usb_msg.itemsize != 1:
+        return bytes(usb_msg.tolist())
+    return bytes(usb_msg)
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class ReportRecorder:
+    def __init__(self, path, report_length=0x20, usb_vendor_id=0x256f, usb_product_id=0xc652):
+        """Appends to path. A new file gets a header, an existing one must have been written with the same
+        report length.
+        """
+        self.path = path
+        self.reportLength = report_length
+        self._record = struct.Struct('<qH6x' + str(report_length) + 's')
+        self._lock = threading.Lock()  # close may come from another thread than write
+
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, report_length, usb_vendor_id, usb_product_id))
+        else:
+            with open(path, 'rb') as existing:
+                header = _read_header(existing.read(HEADER.size))
+            if header[2] != report_length:
+                self._file.close()
+                raise ValueError('Capture file has report length ' + str(header[2]) + ', not ' + str(report_length))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, usb_msg, timestamp=None):
+        """Append one raw report. timestamp in ns, time.monotonic_ns() if not given."""
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        payload = _as_bytes(usb_msg)
+        record = self._record.pack(timestamp, min(len(payload), self.reportLength), payload)  # pads/truncates
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(record)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReportCapture:
+    """Read-only, memory-mapped view of a capture file.
+    capture[i] returns (timestamp, report) with report a memoryview into the file (no copy).
+    """
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError('Not a report capture file : ' + path)
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, self.version, self.reportLength, self.idVendor, self.idProduct = _read_header(self._mmap[:HEADER.size])
+        self.recordSize = RECORD_PREFIX.size + self.reportLength
+        self._view = memoryview(self._mmap)
+        self._count = (size - HEADER.size) // self.recordSize  # ignore a partially written last record
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('Record index out of range')
+
+        offset = HEADER.size + index * self.recordSize
+        timestamp, length = RECORD_PREFIX.unpack_from(self._mmap, offset)
+        start = offset + RECORD_PREFIX.size
+        return timestamp, self._view[start:start + length]
+
+    def timestamp(self, index):
+        """Timestamp of record index, without a view on its report."""
+        return RECORD_PREFIX.unpack_from(self._mmap, HEADER.size + index * self.recordSize)[0]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def records(self):
+        """Memoryview of all records (header excluded), e.g. for numpy.frombuffer with a structured dtype."""
+        return self._view[HEADER.size:HEADER.size + self._count * self.recordSize]
+
+    def close(self):
+        """Fails with BufferError while report views returned by capture[i] are still referenced."""
+        self._view.release()
+        self._mmap.close()
+
+
+def _read_header(data):
+    header = HEADER.unpack(data)
+    if header[0] != MAGIC:
+        raise ValueError('Not a report capture file')
+    if header[1] != VERSION:
+        raise ValueError('Unsupported capture version ' + str(header[1]))
+    return header
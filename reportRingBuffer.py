@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Preallocated ring buffer for decoded spacemouse reports.
+Single producer (reader thread) and single consumer. The producer is the only one writing the head index,
+the consumer the only one writing the tail index. Both are plain ints which are replaced atomically, so no lock
+is needed between the two threads.
+
+Backpressure policies when the consumer falls behind (BACKPRESSURE_POLICIES, see make_report_buffer):
+    'queue'  : ReportRingBuffer, every report is kept until the buffer is full, then new reports are dropped
+               and counted in overflows.
+    'latest' : CoalescingReportBuffer, only the latest joystick report is kept (older ones are counted in coalesced),
+               button and other reports are queued as with 'queue', so no button edge is lost.
+"""
+import array
+import collections
+
+
+Report = collections.namedtuple('Report', ['timestamp', 'msg_type', 'axes', 'buttons'])
+Report.__doc__ = """Decoded report. timestamp in ns (time.monotonic_ns at read return),
+axes in paramKeyList order (0 when released), buttons as bit register."""
+
+BACKPRESSURE_POLICIES = ('queue', 'latest')
+
+
+def make_report_buffer(capacity=1024, backpressure='queue', motion_types=(1,)):
+    """Report buffer of the given backpressure policy, see BACKPRESSURE_POLICIES.
+    motion_types: message types of the joystick reports, coalesced by the 'latest' policy.
+    """
+    if backpressure == 'queue':
+        return ReportRingBuffer(capacity)
+    if backpressure == 'latest':
+        return CoalescingReportBuffer(capacity, motion_types)
+    raise ValueError('Unknown backpressure policy ' + repr(backpressure) + ', use one of ' + str(BACKPRESSURE_POLICIES))
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class ReportRingBuffer:
+    def __init__(self, capacity=1024):
+        """capacity: number of reports kept until the consumer drains them. Reports arriving while the buffer
+        is full are dropped and counted in overflows.
+        """
+        if capacity < 1:
+            raise ValueError('Capacity must be at least 1')
+
+        self.capacity = capacity
+        self.overflows = 0
+
+        # PRIVATE VARIABLES
+        self._timestamps = array.array('q', bytes(8 * capacity))
+        self._msgTypes = array.array('B', bytes(capacity))
+        self._axes = array.array('h', bytes(2 * 6 * capacity))
+        self._buttons = array.array('I', bytes(4 * capacity))
+        self._head = 0  # written by producer only
+        self._tail = 0  # written by consumer only
+
+
+    def __len__(self):
+        return self._head - self._tail
+
+
+    def push(self, timestamp, msg_type, axes, buttons):
+        """Producer side. Returns False if the report was dropped because the buffer is full."""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.overflows += 1
+            return False
+
+        slot = head % self.capacity
+        self._timestamps[slot] = timestamp
+        self._msgTypes[slot] = msg_type
+        offset = 6 * slot
+        for i in range(6):
+            self._axes[offset + i] = axes[i]
+        self._buttons[slot] = buttons
+
+        self._head = head + 1  # publish slot only after it is completely written
+        return True
+
+
+    def peek_timestamp(self):
+        """Consumer side. Timestamp of the oldest report, None if empty."""
+        tail = self._tail
+        if tail == self._head:
+            return None
+        return self._timestamps[tail % self.capacity]
+
+
+    def pop(self):
+        """Consumer side. Returns the oldest Report or None if empty."""
+        tail = self._tail
+        if tail == self._head:
+            return None
+
+        slot = tail % self.capacity
+        report = Report(self._timestamps[slot],
+                        self._msgTypes[slot],
+                        tuple(self._axes[6 * slot:6 * slot + 6]),
+                        self._buttons[slot])
+
+        self._tail = tail + 1  # release slot only after it is completely read
+        return report
+
+
+    def drain(self):
+        """Consumer side. Returns all available reports, oldest first."""
+        reports = []
+        report = self.pop()
+        while report is not None:
+            reports.append(report)
+            report = self.pop()
+        return reports
+
+
+class CoalescingReportBuffer:
+    """Latest-wins buffer: the latest joystick report (msg type 1, or one of motion_types) replaces an older one not
+    yet popped, all other reports (button edges, 22, 23) are queued in a ReportRingBuffer of the given capacity.
+    pop returns the reports in timestamp order. Same single producer, single consumer rules as ReportRingBuffer.
+    """
+    def __init__(self, capacity=1024, motion_types=(1,)):
+        self.motionTypes = frozenset(motion_types)
+        self.coalesced = 0
+
+        # PRIVATE VARIABLES
+        self._events = ReportRingBuffer(capacity)
+        # (sequence, Report) of the latest joystick report, replaced as a whole by the producer.
+        # The consumer only writes _consumed, the sequence it popped last.
+        self._latest = (0, None)
+        self._consumed = 0
+
+
+    @property
+    def capacity(self):
+        return self._events.capacity
+
+
+    @property
+    def overflows(self):
+        return self._events.overflows
+
+
+    def __len__(self):
+        return len(self._events) + (self._latest[0] != self._consumed)
+
+
+    def push(self, timestamp, msg_type, axes, buttons):
+        """Producer side. Returns False if a queued report was dropped because the buffer is full."""
+        if msg_type not in self.motionTypes:
+            return self._events.push(timestamp, msg_type, axes, buttons)
+
+        sequence = self._latest[0]
+        if sequence != self._consumed:
+            self.coalesced += 1  # previous joystick report was never popped
+        self._latest = (sequence + 1, Report(timestamp, msg_type, tuple(axes), buttons))
+        return True
+
+
+    def pop(self):
+        """Consumer side. Returns the oldest Report or None if empty."""
+        sequence, joystick = self._latest
+        if sequence == self._consumed:
+            return self._events.pop()
+
+        eventTimestamp = self._events.peek_timestamp()
+        if eventTimestamp is not None and eventTimestamp <= joystick.timestamp:
+            return self._events.pop()
+
+        self._consumed = sequence
+        return joystick
+
+
+    def drain(self):
+        """Consumer side. Returns all available reports, oldest first."""
+        reports = []
+        report = self.pop()
+        while report is not None:
+            reports.append(report)
+            report = self.pop()
+        return reports
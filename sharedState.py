@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Publishes the decoded spacemouse state in a multiprocessing.shared_memory block, so several processes can read it
+while only one process owns the usb interface.
+
+Layout (little endian), seqlock protected:
+    offset 0 : sequence uint64, odd while the writer is updating the payload
+    offset 8 : timestamp int64 (ns, time.monotonic_ns), axes 6 x int16, buttons uint32, valid uint8
+A reader copies the payload between two reads of the sequence and retries if the sequence was odd or changed.
+Reading is plain memory access, no syscall and no lock.
+"""
+import struct
+import time
+from multiprocessing import shared_memory
+
+from spaceMouseState import SpaceMouseState
+
+
+SEQUENCE = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<q6hIB')
+PAYLOAD_OFFSET = SEQUENCE.size
+BLOCK_SIZE = 64
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class SharedStatePublisher:
+    def __init__(self, name=None):
+        """Creates the shared memory block (name chosen by the system if None, see self.name)."""
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=BLOCK_SIZE)
+        self._shm.buf[:BLOCK_SIZE] = bytes(BLOCK_SIZE)
+        self.name = self._shm.name
+        self.sequence = 0
+        self._subscription = None
+        self._mouse = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def publish(self, state, timestamp=None):
+        """Writes a SpaceMouseState. timestamp in ns, time.monotonic_ns() if not given."""
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+        buf = self._shm.buf
+        SEQUENCE.pack_into(buf, 0, self.sequence + 1)  # odd: update in progress
+        PAYLOAD.pack_into(buf, PAYLOAD_OFFSET, timestamp, *state.axes, state.buttons, state.valid)
+        self.sequence += 2
+        SEQUENCE.pack_into(buf, 0, self.sequence)
+
+    def attach(self, mouse):
+        """Publish every change of the state of a SpaceMouseProWireless (from its decoding thread), stamped with the
+        arrival time of its report (mouse.timestamp).
+        """
+        self.detach()
+        self._mouse = mouse
+        self._subscription = mouse.subscribe(
+            lambda state, changedAxes, changedButtons: self.publish(state, mouse.timestamp))
+        self.publish(mouse.publishedState, mouse.timestamp or None)  # 0: no report received yet
+
+    def detach(self):
+        if self._subscription is not None:
+            self._mouse.unsubscribe(self._subscription)
+            self._subscription = None
+            self._mouse = None
+
+    def close(self):
+        """Detach and remove the shared memory block."""
+        self.detach()
+        self._shm.close()
+        self._shm.unlink()
+
+
+class SharedStateReader:
+    def __init__(self, name):
+        """Attaches to the block of a SharedStatePublisher (publisher.name)."""
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # before python 3.13, the resource tracker would unlink the block when this process exits
+            from multiprocessing import resource_tracker
+            self._shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+        self.name = name
+        self.state = SpaceMouseState()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def read(self):
+        """Consistent snapshot: (sequence, timestamp). The values are written into self.state (reused, no allocation
+        of a new state). sequence is 0 as long as nothing was published and grows with every publish.
+        """
+        buf = self._shm.buf
+        while True:
+            sequence = SEQUENCE.unpack_from(buf, 0)[0]
+            if sequence & 1:
+                continue  # writer busy
+            payload = PAYLOAD.unpack_from(buf, PAYLOAD_OFFSET)
+            if SEQUENCE.unpack_from(buf, 0)[0] == sequence:
+                break
+
+        axes = self.state.axes
+        for i in range(6):
+            axes[i] = payload[1 + i]
+        self.state.buttons = payload[7]
+        self.state.valid = bool(payload[8])
+        return sequence, payload[0]
+
+    def close(self):
+        self._shm.close()
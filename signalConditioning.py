@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+"""
+Composable signal conditioning of the six spacemouse axes: deadzone, exponential or One-Euro smoothing, scaling
+and response curves.
+Single samples are processed in place on a list of six floats (pure python, for the decoding thread), batches
+of shape (N, 6) with NumPy (optional dependency, only needed for process_batch).
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # single sample processing works without numpy
+    np = None
+
+
+def _per_axis(value):
+    """Scalar or six values -> list of six floats."""
+    if isinstance(value, (int, float)):
+        return [float(value)] * 6
+    values = [float(item) for item in value]
+    if len(values) != 6:
+        raise ValueError('Need one value or six values (one per axis)')
+    return values
+
+
+######################################################################################################
+# Stages
+######################################################################################################
+
+class Deadzone:
+    def __init__(self, threshold, rescale=True):
+        """threshold: scalar or per axis. Values with |value| <= threshold become 0.
+        rescale: shift the remaining values towards 0 by threshold, so the output has no step at the threshold.
+        """
+        self.threshold = _per_axis(threshold)
+        self.rescale = rescale
+
+    def reset(self):
+        pass
+
+    def process(self, values, timestamp):
+        for i in range(6):
+            value = values[i]
+            threshold = self.threshold[i]
+            if -threshold <= value <= threshold:
+                values[i] = 0.0
+            elif self.rescale:
+                values[i] = value - threshold if value > 0 else value + threshold
+
+    def process_batch(self, values, timestamps):
+        threshold = np.asarray(self.threshold)
+        magnitude = np.abs(values)
+        if self.rescale:
+            return np.sign(values) * np.maximum(magnitude - threshold, 0.0)
+        return np.where(magnitude <= threshold, 0.0, values)
+
+
+class ExponentialSmoothing:
+    def __init__(self, alpha):
+        """alpha in (0, 1]: weight of the new sample (1: no smoothing). Scalar or per axis."""
+        self.alpha = _per_axis(alpha)
+        if not all(0 < alpha <= 1 for alpha in self.alpha):
+            raise ValueError('alpha must be in (0, 1]')
+        self._last = None
+
+    def reset(self):
+        self._last = None
+
+    def process(self, values, timestamp):
+        last = self._last
+        if last is None:
+            self._last = list(values)
+            return
+        for i in range(6):
+            last[i] += self.alpha[i] * (values[i] - last[i])
+            values[i] = last[i]
+
+    def process_batch(self, values, timestamps):
+        """Closed form y_k = d^k * (y_0 + sum_j alpha * d^-j * x_j), d = 1 - alpha, in chunks short enough
+        for d^-k to stay finite.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        out = np.empty_like(values)
+        if len(values) == 0:
+            return out
+
+        alpha = np.asarray(self.alpha)
+        decay = 1.0 - alpha
+        start = 0
+        if self._last is None:
+            out[0] = values[0]
+            self._last = values[0].tolist()
+            start = 1
+
+        last = np.asarray(self._last)
+        smallest = max(float(decay[decay > 0].min()) if (decay > 0).any() else 0.5, 1e-12)
+        chunk = max(1, int(200 * math.log(10) / -math.log(smallest))) if smallest < 1 else len(values)
+
+        while start < len(values):
+            stop = min(start + chunk, len(values))
+            k = np.arange(1, stop - start + 1)[:, None]
+            with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+                powers = decay ** k
+                weighted = np.cumsum(alpha * values[start:stop] / powers, axis=0)
+                block = powers * (last + weighted)
+            block = np.where(decay == 0, values[start:stop], block)  # alpha 1: output follows input
+            out[start:stop] = block
+            last = block[-1]
+            start = stop
+
+        self._last = last.tolist()
+        return out
+
+
+class OneEuroFilter:
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        """One-Euro filter (Casiez et al. 2012): low pass whose cutoff (Hz) rises with the speed of the signal.
+        Slow motion is smoothed strongly, fast motion passes with little lag. Uses the report timestamps (ns).
+        """
+        self.minCutoff = _per_axis(min_cutoff)
+        self.beta = _per_axis(beta)
+        self.dCutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self._lastDerivative = [0.0] * 6
+        self._lastTimestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def process(self, values, timestamp):
+        if self._last is None:
+            self._last = list(values)
+            self._lastTimestamp = timestamp
+            return
+
+        dt = (timestamp - self._lastTimestamp) / 1e9
+        self._lastTimestamp = timestamp
+        if dt <= 0:
+            values[:] = self._last
+            return
+
+        alphaDerivative = self._alpha(self.dCutoff, dt)
+        for i in range(6):
+            derivative = (values[i] - self._last[i]) / dt
+            derivative = self._lastDerivative[i] + alphaDerivative * (derivative - self._lastDerivative[i])
+            self._lastDerivative[i] = derivative
+            alpha = self._alpha(self.minCutoff[i] + self.beta[i] * abs(derivative), dt)
+            self._last[i] += alpha * (values[i] - self._last[i])
+            values[i] = self._last[i]
+
+    def process_batch(self, values, timestamps):
+        """The cutoff depends on each previous output, so samples are processed one after the other."""
+        out = np.array(values, dtype=np.float64)
+        for row, timestamp in zip(out, timestamps):
+            sample = row.tolist()
+            self.process(sample, int(timestamp))
+            row[:] = sample
+        return out
+
+
+class Scale:
+    def __init__(self, factor):
+        """factor: scalar or per axis, e.g. -1 to invert an axis."""
+        self.factor = _per_axis(factor)
+
+    def reset(self):
+        pass
+
+    def process(self, values, timestamp):
+        for i in range(6):
+            values[i] *= self.factor[i]
+
+    def process_batch(self, values, timestamps):
+        return np.asarray(values, dtype=np.float64) * np.asarray(self.factor)
+
+
+class ResponseCurve:
+    def __init__(self, expo=0.5, full_scale=350.0):
+        """Cubic expo curve: with n = value / full_scale, output = full_scale * ((1 - expo) * n + expo * n^3).
+        expo 0 is linear, 1 purely cubic (fine control around the center). Scalar or per axis.
+        """
+        self.expo = _per_axis(expo)
+        self.fullScale = _per_axis(full_scale)
+
+    def reset(self):
+        pass
+
+    def process(self, values, timestamp):
+        for i in range(6):
+            n = values[i] / self.fullScale[i]
+            values[i] = self.fullScale[i] * ((1 - self.expo[i]) * n + self.expo[i] * n * n * n)
+
+    def process_batch(self, values, timestamps):
+        fullScale = np.asarray(self.fullScale)
+        expo = np.asarray(self.expo)
+        n = np.asarray(values, dtype=np.float64) / fullScale
+        return fullScale * ((1 - expo) * n + expo * n ** 3)
+
+
+######################################################################################################
+# Pipeline
+######################################################################################################
+
+class Pipeline:
+    def __init__(self, *stages):
+        """Stages applied in the given order, e.g. Pipeline(Deadzone(10), OneEuroFilter(), ResponseCurve(0.3))."""
+        self.stages = list(stages)
+
+    def reset(self):
+        """Forget the filter states (e.g. when the joystick is released)."""
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, values, timestamp):
+        """values: list of six floats, processed in place. timestamp in ns."""
+        for stage in self.stages:
+            stage.process(values, timestamp)
+        return values
+
+    def process_batch(self, values, timestamps=None):
+        """values: (N, 6) array, timestamps: (N,) ns (needed by OneEuroFilter). Returns a new float64 array."""
+        if np is None:
+            raise ImportError('process_batch needs numpy')
+        out = np.asarray(values, dtype=np.float64)
+        for stage in self.stages:
+            out = stage.process_batch(out, timestamps)
+        return out
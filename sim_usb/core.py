@@ -0,0 +1,210 @@
+#!/usr/bin/python3
+""" sim_usb.core
+
+    Simulation backend for the usb package. Core: a synthetic SpaceMouse Pro Wireless receiver producing a random
+    mixed stream of joystick, button, long press and inactivity reports at a configurable rate, with jitter, bursts,
+    silent gaps (read timeouts) and injected usb errors. Stands in for usb.core the way stub_usb and replay_usb do.
+
+"""
+
+__all__ = ['find', 'Device', 'Endpoint', 'USBError', 'configure', 'install', 'DEFAULT_MIX']
+
+
+import array
+import random
+import struct
+import sys
+import time
+
+from spaceMouseState import BUTTON_MASKS
+
+
+REPORT_LENGTH = 13
+
+# Report kind -> share of the stream (relative weights).
+DEFAULT_MIX = {'motion': 0.88,  # joystick report, axes doing a random walk
+               'release': 0.02,  # joystick report, all axes 0
+               'buttons': 0.08,  # one button pressed or released
+               'long_press': 0.01,  # msg type 22
+               'inactivity': 0.01}  # msg type 23
+
+_device = None
+
+
+def configure(**settings):
+    """New simulated device with the keyword arguments of Device, returned by every find until the next configure.
+       The same device is found again on reconnects, so its stream continues.
+    """
+    global _device
+    _device = Device(**settings)
+    return _device
+
+
+def install(**settings):
+    """Replace the usb package by this backend. Call before importing spaceMouseProWireless."""
+    configure(**settings)
+    import sim_usb.util
+    sys.modules['usb'] = sys.modules['sim_usb']
+    sys.modules['usb.core'] = sys.modules[__name__]
+    sys.modules['usb.util'] = sim_usb.util
+
+
+def find(idVendor=None, idProduct=None, find_all=False, custom_match=None, **kwargs):
+    device = configure() if _device is None else _device
+    if (idVendor is not None and idVendor != device.idVendor) or \
+            (idProduct is not None and idProduct != device.idProduct) or \
+            (custom_match is not None and not custom_match(device)):
+        return iter([]) if find_all else None
+
+    return iter([device]) if find_all else device
+
+
+class Device:
+    def __init__(self, rate=1000.0, jitter=0.0, burst=1, mix=None, gap_probability=0.0, gap=0.1,
+                 error_probability=0.0, error_errno=19, reports=None, realtime=True, seed=None,
+                 idVendor=0x256f, idProduct=0xc652):
+        """rate: reports per s (on average, bursts included). jitter: s, uniform random offset of each burst.
+           burst: reports arriving back to back, then burst / rate s of silence.
+           mix: {'motion', 'release', 'buttons', 'long_press', 'inactivity': weight}, DEFAULT_MIX if None.
+           gap_probability: chance of gap s silence before a burst, reads with a shorter timeout time out.
+           error_probability: chance of a read raising USBError with error_errno (19: device gone).
+           reports: number of reports before the device is gone (errno 19), None for an endless stream.
+           realtime: True waits for the report times, False runs on a virtual clock (no sleeping, for CI).
+        """
+        if rate <= 0 or burst < 1 or jitter < 0 or gap < 0:
+            raise ValueError('Rate and burst must be positive, jitter and gap not negative')
+        mix = DEFAULT_MIX if mix is None else mix
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown or not any(weight > 0 for weight in mix.values()):
+            raise ValueError('Mix needs positive weights of ' + ', '.join(DEFAULT_MIX) + ', got ' + repr(mix))
+
+        self.rate = rate
+        self.jitter = jitter
+        self.burst = burst
+        self.mix = dict(mix)
+        self.gapProbability = gap_probability
+        self.gap = gap
+        self.errorProbability = error_probability
+        self.errorErrno = error_errno
+        self.reportLimit = reports
+        self.realtime = realtime
+        self.idVendor = idVendor
+        self.idProduct = idProduct
+        self.bus = 1
+        self.address = 4
+        self.port_numbers = None  # no physical port: the device cache does not look for it in sysfs
+
+        self.sent = {1: 0, 3: 0, 22: 0, 23: 0}  # reports returned per message type
+        self.timeouts = 0
+        self.errors = 0
+
+        # PRIVATE VARIABLES
+        self._random = random.Random(seed)
+        self._kinds = list(self.mix)
+        self._weights = list(self.mix.values())
+        self._axes = [0] * 6
+        self._buttons = 0
+        self._buttonMasks = list(BUTTON_MASKS.values())
+        self._clock = 0  # ns, virtual clock if not realtime
+        self._start = None  # clock at the first read
+        self._base = 0  # ns after start, burst time without jitter
+        self._due = 0  # ns after start, arrival of the next burst
+        self._pending = 0  # reports left in the current burst
+
+    @staticmethod
+    def get_active_configuration():
+        return {(0, 0): [Endpoint(0x81, 0x20)]}  # configuration[(interface, alternate setting)][endpoint index]
+
+    @staticmethod
+    def is_kernel_driver_active(var):
+        return False
+
+    @staticmethod
+    def detach_kernel_driver(var):
+        pass
+
+    @property
+    def count(self):
+        """Reports returned so far."""
+        return sum(self.sent.values())
+
+    def read(self, address, size_or_buffer, timeout):
+        """Next report once it is due.
+           Like pyusb, size_or_buffer is the msg length (returns a new array) or an array.array('B') to read into
+           (returns the number of bytes read).
+           Raises a timeout (errno 110) if no report is due within timeout ms, an injected error (error_errno),
+           and no device (errno 19) after reports reports.
+        """
+        if self.reportLimit is not None and self.count >= self.reportLimit:
+            raise USBError('No such device (simulation ended)', errno=19)
+        if self.errorProbability and self._random.random() < self.errorProbability:
+            self.errors += 1
+            raise USBError('Simulated usb error', errno=self.errorErrno)
+
+        now = self._now()
+        if self._start is None:
+            self._start = now
+        if not self._pending:
+            self._schedule_burst()
+        wait = self._due - (now - self._start)
+        if wait > 0:
+            if timeout and wait > timeout * 1_000_000:
+                self._sleep(timeout * 1_000_000)
+                self.timeouts += 1
+                raise USBError('Operation timed out', errno=110)
+            self._sleep(wait)
+        self._pending -= 1
+
+        report = self._next_report()
+        self.sent[report[0]] += 1
+        if isinstance(size_or_buffer, array.array):
+            length = min(len(report), len(size_or_buffer))
+            memoryview(size_or_buffer)[:length] = report[:length]
+            return length
+        return array.array('B', report[:size_or_buffer])
+
+    def _schedule_burst(self):
+        self._pending = self.burst
+        self._base += int(self.burst / self.rate * 1e9)
+        if self.gapProbability and self._random.random() < self.gapProbability:
+            self._base += int(self.gap * 1e9)
+        due = self._base
+        if self.jitter:
+            due += int(self._random.uniform(-self.jitter, self.jitter) * 1e9)
+        self._due = max(due, self._due)  # reports keep their order
+
+    def _next_report(self):
+        kind = self._random.choices(self._kinds, self._weights)[0]
+        if kind == 'motion':
+            axes = self._axes
+            for index in range(6):
+                axes[index] = max(-350, min(350, axes[index] + self._random.randint(-20, 20)))
+            return struct.pack('<B6h', 1, *axes)
+        if kind == 'release':
+            self._axes = [0] * 6
+            return struct.pack('<B6h', 1, *self._axes)
+        if kind == 'buttons':
+            self._buttons ^= self._random.choice(self._buttonMasks)
+            return struct.pack('>BI', 3, self._buttons).ljust(REPORT_LENGTH, b'\0')
+        return bytes([22 if kind == 'long_press' else 23]).ljust(REPORT_LENGTH, b'\0')
+
+    def _now(self):
+        return time.monotonic_ns() if self.realtime else self._clock
+
+    def _sleep(self, ns):
+        if self.realtime:
+            time.sleep(ns / 1e9)
+        else:
+            self._clock += ns
+
+
+class Endpoint:
+    def __init__(self, bEndpointAddress, wMaxPacketSize):
+        self.bEndpointAddress = bEndpointAddress
+        self.wMaxPacketSize = wMaxPacketSize
+
+
+class USBError(IOError):
+    def __init__(self, strerror, error_code=None, errno=None):
+        IOError.__init__(self, errno, strerror)
+        self.backend_error_code = error_code
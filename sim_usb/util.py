@@ -0,0 +1,9 @@
+#!/usr/bin/python3
+""" sim_usb.util
+
+    Simulation backend for the usb package. Util: Usb utility functions.
+"""
+
+
+def dispose_resources(device):
+    pass
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+"""
+Manager for several spacemouse receivers on one host. Finds all receivers matching the given vendor/product id
+pairs, reads each of them on its own reader thread and offers one merged, device tagged report stream besides
+the per-device streams.
+"""
+import asyncio
+import heapq
+import threading
+
+import usb.core
+
+from spaceMouseProWireless import SpaceMouseProWireless
+
+
+# Vendor and product ids of the supported receivers.
+DEFAULT_USB_IDS = ((0x256f, 0xc652),)
+
+
+def find_receivers(usb_ids=DEFAULT_USB_IDS):
+    """All connected usb devices matching one of the (vendor id, product id) pairs, as (vendor, product, device)."""
+    found = []
+    for vendor, product in usb_ids:
+        for device in usb.core.find(find_all=True, idVendor=vendor, idProduct=product):
+            found.append((vendor, product, device))
+    return found
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class SpaceMouseManager:
+    def __init__(self, usb_ids=DEFAULT_USB_IDS):
+        """Connects to every receiver found. mice[i] is the SpaceMouseProWireless of device i, reports of the merged
+        stream are tagged with this index.
+        """
+        self.mice = [SpaceMouseProWireless(vendor, product, device=device)
+                     for vendor, product, device in find_receivers(usb_ids)]
+
+        if not self.mice:
+            raise ValueError('No spacemouse found')
+
+        self.failed = {}  # device index: error that stopped its reader, the other receivers keep reporting
+
+        # PRIVATE VARIABLES
+        self._available = threading.Event()
+        self._waiting = False
+
+    def __len__(self):
+        return len(self.mice)
+
+    def start(self, capacity=1024, backpressure='queue'):
+        """Start the reader thread of every receiver (capacity: ring buffer size per receiver,
+        backpressure: see SpaceMouseProWireless.start_reader).
+        """
+        self.failed = {}
+        for mouse in self.mice:
+            mouse.add_report_listener(self._wake_up)
+            mouse.start_reader(capacity, backpressure)
+
+    def stop(self):
+        for mouse in self.mice:
+            mouse.stop_reader(wait=False)
+        for mouse in self.mice:
+            mouse.stop_reader()
+            mouse.remove_report_listener(self._wake_up)
+
+    def get_device_reports(self, index):
+        """Reports of receiver index only, oldest first."""
+        return self.mice[index].get_reports()
+
+    def get_reports(self):
+        """Reports of all receivers as (device index, report), merged in timestamp order.
+        A receiver whose reader stopped with an error is recorded in failed and skipped. Raises the error of the
+        first receiver once all of them failed and no report is left.
+        """
+        perDevice = []
+        for index, mouse in enumerate(self.mice):
+            try:
+                reports = mouse.get_reports()
+            except Exception as er:
+                self.failed[index] = er
+                continue
+            perDevice.append([(report.timestamp, index, report) for report in reports])
+
+        merged = [(index, report) for _, index, report in heapq.merge(*perDevice)]
+        if not merged and len(self.failed) == len(self.mice):
+            raise self.failed[0]
+        return merged
+
+    def wait_reports(self, timeout=None):
+        """Like get_reports, but blocks until at least one report is available or timeout (s) passed."""
+        reports = self.get_reports()
+        if reports:
+            return reports
+
+        # Announce waiting before checking again, a report pushed inbetween sets the event.
+        self._available.clear()
+        self._waiting = True
+        reports = self.get_reports()
+        if not reports and self._available.wait(timeout):
+            reports = self.get_reports()
+        self._waiting = False
+        return reports
+
+    async def events(self):
+        """Asynchronous iterator over (device index, report) of all receivers. Readers must be started."""
+        loop = asyncio.get_running_loop()
+        available = asyncio.Event()
+        waiting = False
+
+        def wake_up():
+            nonlocal waiting
+            if waiting:
+                waiting = False
+                loop.call_soon_threadsafe(available.set)
+
+        for mouse in self.mice:
+            mouse.add_report_listener(wake_up)
+        try:
+            while True:
+                reports = self.get_reports()
+                if not reports:
+                    available.clear()
+                    waiting = True
+                    reports = self.get_reports()
+                    if not reports:
+                        await available.wait()
+                        continue
+                    waiting = False
+                for taggedReport in reports:
+                    yield taggedReport
+        finally:
+            for mouse in self.mice:
+                mouse.remove_report_listener(wake_up)
+
+    def _wake_up(self):
+        if self._waiting:
+            self._waiting = False
+            self._available.set()
@@ -1,49 +1,55 @@
 #!/usr/bin/python3
 """
 This class reads the data from the 3d connexion Spacemouse Pro Wireless makes them available through member variables.
-Currently only single button presses are considered. The information available would allow concurrent and nested pushes
-to be recognized.
+The button state is the full bit register, concurrent and nested pushes, long presses and double taps are recognized
+by gestureEngine.GestureEngine (see gestures).
 """
+import array
+import asyncio
+import functools
 import sys
-
-from byteToIntConversion import *
+import threading
+import time
+
+from deviceProfiles import find_profile, compile_decoders, AXES, BUTTONS
+from hotPathStats import ReportStatistics
+from interruptTransferQueue import open_transfer_queue
+from readTimeoutPolicy import ReadTimeoutPolicy
+from reportCapture import ReportRecorder
+from reportRingBuffer import make_report_buffer
+from usbDeviceCache import DEFAULT_DEVICE_CACHE
+from spaceMouseState import SpaceMouseState, AXIS_NAMES, AXIS_MASKS, ALL_AXES_MASK, BUTTON_MASKS, \
+    ALL_BUTTONS_MASK, button_edges
 
 import usb.core
 import usb.util
 
 
+_RELEASED_AXES = (0, 0, 0, 0, 0, 0)
+
+
 ######################################################################################################
 # Class
 ######################################################################################################
 
 class SpaceMouseProWireless:
-    def __init__(self, usb_vendor_id=0x256f, usb_product_id=0xc652):
+    def __init__(self, usb_vendor_id=0x256f, usb_product_id=0xc652, device=None, connect_timeout=None,
+                 device_cache=None, profile=None):
         """USB id -> change for your space mouse receiver in the default arguments
         or pass yours when initialising.
         use usbFindVendorProductID.py or $ lsusb to find yours.
+        device: already found usb device (e.g. by SpaceMouseManager), no search is done then.
+        connect_timeout: s to wait for the receiver to be plugged in, None raises immediately if it is not there.
+        device_cache: usbDeviceCache.DeviceCache remembering the receiver's usb path (shared in-memory cache if None).
+        profile: deviceProfiles.DeviceProfile with the report layouts, the registered one of the usb ids if None.
         """
         # INTERFACE VARIABLES
-        self.paramDict = dict(x=None,
-                              y=None,
-                              z=None,
-                              roll=None,
-                              pitch=None,
-                              yaw=None,
-                              b1=False,
-                              b2=False,
-                              b3=False,
-                              b4=False,
-                              escape=False,
-                              shift=False,
-                              control=False,
-                              alt=False,
-                              top=False,
-                              front=False,
-                              right=False,
-                              rollView=False,
-                              lockRotation=False,
-                              menu=False,
-                              fit=False)
+        # Decoded state, cheapest to read (attribute/index access, no None checks).
+        self.state = SpaceMouseState()
+
+        # Buttons pressed/released by the last decoded report (tuples of paramDict keys), see button_edges
+        self.buttonsPressed = ()
+        self.buttonsReleased = ()
 
         # DEVICE INFO
         # dict.keys is not accessible by index
@@ -69,18 +75,87 @@ class SpaceMouseProWireless:
                              'menu',
                              'fit']
 
+        # Plain dict of the decoded values: axes None when released, buttons bool. Only the fields changed by a report
+        # are written (see _update_param_dict).
+        self.paramDict = {key: None if key in AXIS_MASKS else False for key in self.paramKeyList}
 
         self.idVendor = usb_vendor_id
         self.idProduct = usb_product_id
+        self.profile = find_profile(usb_vendor_id, usb_product_id) if profile is None else profile
+
+        # Usb read timeout, 10 ms while in use, 1 s when idle. ReadTimeoutPolicy(idle_timeout=10) for a fixed 10 ms.
+        self.readPolicy = ReadTimeoutPolicy()
+
+        # None: usb errors are raised. ReconnectPolicy(): reconnect with backoff instead (see _reconnect).
+        self.reconnectPolicy = None
+
+        # Report counters and latency histograms, read with stats.snapshot() (also while the reader runs).
+        self.stats = ReportStatistics(tuple(self.profile.reports))
+
+        # time.monotonic_ns() at the arrival of the last decoded report, e.g. for subscribers.
+        self.timestamp = 0
+
+        # None: no conditioning. signalConditioning.Pipeline(...): run on every joystick report before publication,
+        # the result (floats, state order) is in conditionedAxes, the raw values stay in state. conditionedState holds
+        # it rounded to int16, with the buttons, and is what the reader buffer, history and subscribers get
+        # (see publishedState).
+        self.conditioning = None
+        self.conditionedAxes = [0.0] * 6
+        self.conditionedState = SpaceMouseState()
+
+        # None: no gesture recognition. gestureEngine.GestureEngine().attach(mouse): fed with every report.
+        self.gestures = None
+
+        # None: no history. frameHistory.FrameHistory(capacity): every decoded report is appended as a frame.
+        self.history = None
+
+        self.connectTimeout = connect_timeout
+        self.deviceCache = DEFAULT_DEVICE_CACHE if device_cache is None else device_cache
+        self.portPath = None  # (bus, port numbers) of the receiver once connected, reconnects only go to this path
 
         # PRIVATE VARIABLES
         self._dev = None
+        self._endpoint = 0x81  # interrupt endpoint address and wMaxPacketSize, from the device descriptors
+        self._packetSize = 0x20
+        self._recorder = None  # see start_recording
+
+        # Reused read buffer: pyusb fills it in place, the decoders unpack from it (see _get_usb_msg_timeout_to_none)
+        self._readBuffer = array.array('B', bytes(self._packetSize))
+        self._readLength = 0
+
+        # Reader thread, see start_reader
+        self._reportBuffer = None
+        self._readerThread = None
+        self._readerStop = threading.Event()
+        self._readerError = None
+        self._reportListeners = []  # called on the reader thread after each report and when it stops
+        self._transfers = 1  # interrupt transfers kept queued by the reader, see start_reader
+        self._transferQueue = None
+
+        # Change masks of the last decoded report, see subscribe
+        self._subscriptions = []
+        self._changedAxes = 0
+        self._changedButtons = 0
+
+        # Decoders of the profile, see _compile_profile
+        self._handlers = {}
+        self._axisTypes = ()
+        self._compile_profile()
 
         # CONNECT
-        self._find_usb_device()
+        if device is None:
+            self._find_usb_device()
+        else:
+            self._dev = device
+            path = self.deviceCache.remember(self.idVendor, self.idProduct, device)
+            self.portPath = (path.bus, path.port_numbers)
+            self._endpoint, self._packetSize = path.endpoint, path.packet_size
+            self._detach_kernel_driver()
 
 
     def __del__(self):
+        self.stop_reader()
+        self.stop_recording()
         if self._dev is not None:
             usb.util.dispose_resources(self._dev)  # free usb device
 
@@ -88,46 +163,227 @@ class SpaceMouseProWireless:
     def get_interrupt_msg(self):
         """Spacemouse talks via receiver over Usb, using interrupt msgs.
            Timeout for waiting on interrupt, in s. (Milliseconds recommended).
+           Do not call while the reader thread is running, it owns the endpoint.
         """
         usb_int = self._get_usb_msg_timeout_to_none()
 
         if usb_int is None:
+            if self.gestures is not None:
+                self.gestures.tick(time.monotonic_ns())  # long presses become due without reports
             return 1 # No interrupt message received, stop function execution
 
+        arrival = time.monotonic_ns()
         msg_type = usb_int[0]
+        self.buttonsPressed = self.buttonsReleased = ()
+        self._changedAxes = self._changedButtons = 0
 
-        if msg_type == 1:  # Joystick
-            if __class__._is_spacemouse_released(usb_int):  # joystick in 0-position
-                self._write_joystick_released()
-                return 0
+        try:
+            handler = self._handlers[msg_type]
+        except KeyError:
+            self.stats.record_report(msg_type, arrival, time.monotonic_ns())
+            raise ValueError('Unknown message type, number ' + str(msg_type) + '. Different Spacemouse?') from None
+        if handler is not None:  # None: event without payload (e.g. 23, inactivity)
+            handler(usb_int)
+
+        self.stats.record_report(msg_type, arrival, time.monotonic_ns())
 
-            self._write_joystick(usb_int)
+        self._publish(msg_type, arrival)
+        return 0
 
-        elif msg_type == 3: # Button
-            if __class__._is_spacemouse_released(usb_int):  # No button pressed
-                self._write_buttons_released()
-                return 0
 
-            self._write_button(usb_int)
+    @property
+    def publishedState(self):
+        """State handed to the reader buffer, history and subscribers: conditionedState while conditioning is set,
+           state otherwise.
+        """
+        return self.state if self.conditioning is None else self.conditionedState
 
-        elif msg_type == 22:
-            # print('long press?')
-            pass
-        elif msg_type == 23:
-            # print('inactivity?')
-            pass
+
+    def subscribe(self, callback, axes=None, buttons=None):
+        """Call callback(state, changedAxes, changedButtons) whenever one of the selected fields changes.
+           state is publishedState, so the conditioned axes while conditioning is set.
+           axes, buttons: iterables of paramKeyList names. Without either, every field is selected.
+           changedAxes is a bit mask (see AXIS_MASKS), changedButtons a bit register mask (see BUTTON_MASKS).
+           Callbacks run in the thread decoding the reports. Returns a handle for unsubscribe.
+        """
+        if axes is None and buttons is None:
+            axisMask = ALL_AXES_MASK
+            buttonMask = ALL_BUTTONS_MASK
         else:
-            raise ValueError('Unknown message type, number ' + str(msg_type) + '. Different Spacemouse?')
-        return 0
+            axisMask = sum(AXIS_MASKS[name] for name in axes or ())
+            buttonMask = sum(BUTTON_MASKS[name] for name in buttons or ())
+
+        subscription = (callback, axisMask, buttonMask)
+        self._subscriptions = self._subscriptions + [subscription]  # copy, the reader thread may iterate the list
+        return subscription
+
+
+    def unsubscribe(self, subscription):
+        self._subscriptions = [entry for entry in self._subscriptions if entry is not subscription]
+
+
+    def start_reader(self, capacity=1024, backpressure='queue', transfers=1):
+        """Read the usb endpoint on a dedicated thread. Every report is decoded (paramDict stays up to date)
+           and stored in a ring buffer of the given capacity, drained with get_report/get_reports.
+           backpressure: what happens when the consumer falls behind. 'queue': keep every report, drop new reports
+           once the buffer is full. 'latest': keep only the latest joystick report, but every button report.
+           See get_buffer_stats.
+           transfers: more than 1 keeps that many asynchronous interrupt transfers queued on the endpoint instead of
+           one synchronous read at a time (needs python-libusb1, see interruptTransferQueue.py).
+        """
+        if self._readerThread is not None:
+            if not self._readerStop.is_set():
+                raise RuntimeError('Reader thread already running')
+            self._readerThread.join()  # stopped without waiting, let it finish its last read
+
+        reportBuffer = make_report_buffer(capacity, backpressure, self._axisTypes)
+        if transfers > 1:
+            self._transferQueue = open_transfer_queue(self._dev, self._endpoint, self._packetSize, transfers)
+        self._transfers = transfers
+        self._reportBuffer = reportBuffer
+        self._readerError = None
+        self._readerStop.clear()
+        self._readerThread = threading.Thread(target=self._reader_loop, name='SpaceMouseReader', daemon=True)
+        self._readerThread.start()
+
+
+    def stop_reader(self, wait=True):
+        """Stop the reader thread. Returns after the pending usb read has timed out (see readPolicy),
+           or immediately if wait is False.
+           Reports not yet drained remain available.
+        """
+        if self._readerThread is None:
+            return
+
+        self._readerStop.set()
+        if not wait or self._readerThread is threading.current_thread():
+            return
+        self._readerThread.join()
+        self._readerThread = None
+
+
+    def get_report(self):
+        """Oldest decoded report of the reader thread, None if there is none.
+           Errors of the reader thread are re-raised here.
+        """
+        if self._reportBuffer is None:
+            raise RuntimeError('Reader thread was never started')
+
+        report = self._reportBuffer.pop()
+        if report is None and self._readerError is not None:
+            raise self._readerError
+        return report
+
+
+    def get_reports(self):
+        """All decoded reports of the reader thread, oldest first.
+           Errors of the reader thread are re-raised once the buffer is drained.
+        """
+        if self._reportBuffer is None:
+            raise RuntimeError('Reader thread was never started')
+
+        reports = self._reportBuffer.drain()
+        if not reports and self._readerError is not None:
+            raise self._readerError
+        return reports
+
+
+    def get_buffer_stats(self):
+        """dict with queued: reports not yet drained, overflows: reports dropped because the buffer was full,
+           coalesced: joystick reports replaced by a newer one before being drained ('latest' policy).
+        """
+        if self._reportBuffer is None:
+            raise RuntimeError('Reader thread was never started')
+
+        buffer = self._reportBuffer
+        return dict(queued=len(buffer), overflows=buffer.overflows, coalesced=getattr(buffer, 'coalesced', 0))
+
+
+    def start_recording(self, path):
+        """Append every raw report read from now on, with its monotonic timestamp in ns, to a capture file.
+           See reportCapture.py for the format and replay_usb for playing it back.
+        """
+        if self._recorder is not None:
+            raise RuntimeError('Already recording to ' + self._recorder.path)
+        self._recorder = ReportRecorder(path, self._packetSize, self.idVendor, self.idProduct)
+
+
+    def stop_recording(self):
+        if self._recorder is None:
+            return
+        recorder = self._recorder
+        self._recorder = None
+        recorder.close()
+
+
+    def add_report_listener(self, listener):
+        """listener() is called on the reader thread after each report is buffered, and once when the reader
+           stops because of an error. Keep it short, e.g. only wake up a consumer.
+        """
+        self._reportListeners = self._reportListeners + [listener]  # copy, the reader thread may iterate the list
+
+
+    def remove_report_listener(self, listener):
+        self._reportListeners = [entry for entry in self._reportListeners if entry is not listener]
+
+
+    async def events(self, capacity=1024, backpressure='queue'):
+        """Asynchronous iterator over decoded reports: async for report in mouse.events()
+           Uses the reader thread (started if not running, stopped again when the iteration ends). The event loop
+           is only woken up when it is waiting for a report, never for usb timeouts.
+        """
+        loop = asyncio.get_running_loop()
+        available = asyncio.Event()
+        waiting = False
+
+        def wake_up():
+            nonlocal waiting
+            if waiting:
+                waiting = False
+                loop.call_soon_threadsafe(available.set)
+
+        ownsReader = self._readerThread is None or self._readerStop.is_set()
+        self.add_report_listener(wake_up)
+        if ownsReader:
+            self.start_reader(capacity, backpressure)
+
+        try:
+            while True:
+                report = self.get_report()
+                if report is None:
+                    # Announce waiting before checking again, a report pushed inbetween wakes us up.
+                    available.clear()
+                    waiting = True
+                    report = self.get_report()
+                    if report is None:
+                        await available.wait()
+                        continue
+                    waiting = False
+                yield report
+        finally:
+            self.remove_report_listener(wake_up)
+            if ownsReader:
+                self.stop_reader(wait=False)
 
 
     def _find_usb_device(self):
-        """Look for Spacemouse and connect if found."""
-        self._dev = usb.core.find(idVendor=self.idVendor, idProduct=self.idProduct)
+        """Look for Spacemouse (at its cached usb path first) and connect if found."""
+        if self.connectTimeout is None:
+            self._dev, path = self.deviceCache.find(self.idVendor, self.idProduct)
+        else:
+            self._dev, path = self.deviceCache.wait(self.idVendor, self.idProduct, self.connectTimeout)
 
         if self._dev is None:
             raise ValueError('Spacemouse not found')
 
+        self.portPath = (path.bus, path.port_numbers)
+        self._endpoint = path.endpoint
+        self._packetSize = path.packet_size
+
+        self._detach_kernel_driver()
+
+
+    def _detach_kernel_driver(self):
         # dev.set_configuration() # Apparently automatically chosen config, as this throws an error.
 
         # Deal with Error resource-busy
@@ -140,116 +396,280 @@ class SpaceMouseProWireless:
 
 
     def _get_usb_msg_timeout_to_none(self):
+        """Read one report into the reused read buffer, returns the buffer (None on timeout).
+           Bytes after the report are zero, so the fixed report layouts never decode stale bytes.
+        """
+        policy = self.readPolicy
+        buffer = self._readBuffer
+        if len(buffer) != self._packetSize:  # other endpoint after (re)connecting
+            buffer = self._readBuffer = array.array('B', bytes(self._packetSize))
+            self._readLength = 0
         try:
-            # args: endpoint address, msg length (wMaxPacketSize), timeout (optional, device default if not set)
-            usb_msg = self._dev.read(0x81, 0x20, 10)
+            # args: endpoint address, buffer (or msg length), timeout (optional, device default if not set)
+            if self._transferQueue is None:
+                result = self._dev.read(self._endpoint, buffer, policy.timeout)
+            else:
+                result = self._transferQueue.read(self._endpoint, self._packetSize, policy.timeout)
         except usb.core.USBError as er:
             if er.errno == 110:  # Timeout
+                self.stats.timeouts += 1
+                policy.on_timeout()
                 return None
-            raise
-        return usb_msg
+            self.stats.usbErrors += 1
+            if self.reconnectPolicy is None:
+                raise
+            self._reconnect(er)
+            return None
+
+        if result.__class__ is int:  # pyusb: bytes read into the buffer
+            length = result
+        else:  # source returning a new sequence (transfer queue, replay), copy it into the buffer
+            length = min(len(result), len(buffer))
+            buffer[:length] = array.array('B', result[:length])
+        if length < self._readLength:
+            buffer[length:self._readLength] = array.array('B', bytes(self._readLength - length))
+        self._readLength = length
+
+        policy.on_report(buffer[0])
+
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.write(memoryview(buffer)[:length])
+        return buffer
+
+
+    def _reconnect(self, error):
+        """Receiver dropped off the bus: mark everything released, then reopen the receiver at portPath (never another
+           one) with the backoff of reconnectPolicy. Raises error if this does not succeed in time.
+        """
+        start = time.monotonic_ns()
+
+        self.buttonsPressed = self.buttonsReleased = ()
+        self._changedAxes = self._changedButtons = 0
+        self._write_joystick_released()
+        self._write_buttons_released()
+        if self.gestures is not None:
+            self.gestures.reset()  # a lost receiver releases no buttons: no tap
+        self._publish(1, start)
 
+        self._close_transfer_queue()
+        try:
+            usb.util.dispose_resources(self._dev)
+        except usb.core.USBError:
+            pass  # already gone
+
+        policy = self.reconnectPolicy
+        deadline = None if policy.giveUpAfter is None else start + int(policy.giveUpAfter * 1e9)
+        for delay in policy.delays():
+            if self._readerThread is threading.current_thread():
+                if self._readerStop.wait(delay):  # leave at once if the reader is stopped meanwhile
+                    raise error
+            else:
+                time.sleep(delay)
+
+            try:
+                device, path = self.deviceCache.find(self.idVendor, self.idProduct, self.portPath)
+                if device is not None:
+                    self._dev = device
+                    self._endpoint, self._packetSize = path.endpoint, path.packet_size
+                    self._detach_kernel_driver()
+                    if self._transfers > 1:
+                        self._transferQueue = open_transfer_queue(device, self._endpoint, self._packetSize,
+                                                                  self._transfers)
+                    self.stats.reconnects += 1
+                    self.stats.recoveryTime.record(time.monotonic_ns() - start)
+                    return
+            except (usb.core.USBError, RuntimeError, ValueError):
+                pass  # receiver still coming up, try again
+
+            if deadline is not None and time.monotonic_ns() >= deadline:
+                raise error
+
+
+    def _reader_loop(self):
+        try:
+            while not self._readerStop.is_set():
+                self.get_interrupt_msg()
+        except Exception as er:
+            self._readerError = er
+
+            for listener in self._reportListeners:
+                listener()
+        finally:
+            self._close_transfer_queue()  # transfers are handled on this thread, so are they cancelled
+            self._transfers = 1
+
+
+    def _close_transfer_queue(self):
+        transferQueue = self._transferQueue
+        if transferQueue is not None:
+            self._transferQueue = None
+            transferQueue.close()
+
+
+    def _publish(self, msg_type, arrival):
+        """Hand the decoded report (conditioned if conditioning is set) to the ring buffer, the history and the
+           subscribers of the changed fields.
+        """
+        self.timestamp = arrival
+        if self._changedAxes or self._changedButtons:
+            self._update_param_dict()
+        state = self.state
+        if self.conditioning is not None:
+            state = self.conditionedState
+            state.buttons = self.state.buttons
+            if msg_type in self._axisTypes:
+                self._condition_axes(arrival)
+        if self.gestures is not None:
+            self.gestures.on_report(msg_type, state.buttons, arrival)
+        if self.history is not None:
+            self.history.append(arrival, state.axes, state.buttons)
+        if self._reportBuffer is not None:
+            self._push_report(msg_type, arrival, state)
+        if self._subscriptions and (self._changedAxes or self._changedButtons):
+            self._notify_subscribers(state)
+
+
+    def _update_param_dict(self):
+        """Write the fields changed by the last report into paramDict. The joystick becoming valid or released
+           always changes an axis, all six are written then.
+        """
+        paramDict = self.paramDict
+        changedAxes = self._changedAxes
+        if changedAxes:
+            axes = self.state.axes
+            if not self.state.valid:
+                for name in AXIS_NAMES:
+                    paramDict[name] = None
+            elif paramDict['x'] is None:  # was released
+                for index, name in enumerate(AXIS_NAMES):
+                    paramDict[name] = axes[index]
+            else:
+                for index, name in enumerate(AXIS_NAMES):
+                    if changedAxes & (1 << index):
+                        paramDict[name] = axes[index]
+        if self._changedButtons:
+            for name in self.buttonsPressed:
+                paramDict[name] = True
+            for name in self.buttonsReleased:
+                paramDict[name] = False
+
+
+    def _condition_axes(self, arrival):
+        """Conditions the raw axes into conditionedAxes and conditionedState, the axis change mask then refers to
+           the conditioned values (smoothed axes keep moving after the raw ones stopped).
+        """
+        conditioned = self.conditionedAxes
+        if not self.state.valid:  # released: back to 0 at once, filters start over with the next touch
+            self.conditioning.reset()
+            conditioned[:] = (0.0,) * 6
+        else:
+            conditioned[:] = self.state.axes
+            self.conditioning.process(conditioned, arrival)
 
-    @staticmethod
-    def _is_spacemouse_released(usb_msg):
-        # if buttons released/Joystick not touched, msg is all zeros except msg type
-        released = True
+        axes = self.conditionedState.axes
+        changedAxes = 0
+        for index in range(6):
+            value = round(conditioned[index])
+            value = 32767 if value > 32767 else -32768 if value < -32768 else value
+            if value != axes[index]:
+                axes[index] = value
+                changedAxes |= 1 << index
+        self.conditionedState.valid = self.state.valid
+        self._changedAxes = changedAxes
 
-        for item in usb_msg[1:]:
-            if item != 0:
-                return False
-        return True
+
+    def _push_report(self, msg_type, arrival, state):
+        self._reportBuffer.push(arrival, msg_type, state.axes, state.buttons)
+
+        for listener in self._reportListeners:
+            listener()
+
+
+    def _notify_subscribers(self, state):
+        changedAxes = self._changedAxes
+        changedButtons = self._changedButtons
+        for callback, axisMask, buttonMask in self._subscriptions:
+            if changedAxes & axisMask or changedButtons & buttonMask:
+                callback(state, changedAxes, changedButtons)
+
+
+    def _compile_profile(self):
+        """Handler of each message type of the profile, with its compiled decoder bound, so decoding a report is one
+           dict lookup and one call.
+        """
+        handlers = {}
+        axisTypes = []
+        for msgType, (kind, decode) in compile_decoders(self.profile).items():
+            if kind == AXES:
+                handlers[msgType] = functools.partial(self._write_joystick, decode)
+                axisTypes.append(msgType)
+            elif kind == BUTTONS:
+                handlers[msgType] = functools.partial(self._write_button, decode)
+            else:
+                handlers[msgType] = None
+        self._handlers = handlers
+        self._axisTypes = tuple(axisTypes)
 
 
     def _write_joystick_released(self):
-        for key in self.paramKeyList[:6]:
-            self.paramDict[key] = None
+        self._write_axes(_RELEASED_AXES)
+        self.state.valid = False
 
 
     def _write_buttons_released(self):
-        for key in self.paramKeyList[6:]:
-            self.paramDict[key] = False
+        self._write_button_register(0)
 
 
-    def _write_joystick(self, usb_msg):
-        """Write 6 DoF of Joystick to parameter dictionary."""
-        self.paramDict['x'] = to_int16(usb_msg[1], usb_msg[2])
-        self.paramDict['y'] = -1 * to_int16(usb_msg[3], usb_msg[4])
-        self.paramDict['z'] = -1 * to_int16(usb_msg[5], usb_msg[6])
-        self.paramDict['pitch'] = -1 * to_int16(usb_msg[7], usb_msg[8])
-        self.paramDict['roll'] = -1 * to_int16(usb_msg[9], usb_msg[10])
-        self.paramDict['yaw'] = -1 * to_int16(usb_msg[11], usb_msg[12])
+    def _write_joystick(self, decode, usb_msg):
+        """Write 6 DoF of Joystick to the state, all axes 0 marks the joystick released.
+           decode: compiled axis report decoder of the profile, see deviceProfiles.compile_decoders.
+        """
+        values = decode(usb_msg, self.state.axes)
+        self._write_axes(values)
+        self.state.valid = values != _RELEASED_AXES  # joystick in 0-position: released
 
 
-    def _write_button(self, usb_msg):
-        """Button states are transmitted as a bit Register. Bytes at index 5 and 6 carry
-           no information for this spacemouse.
-           BitRegister Mapping (zero-indexed):
+    def _write_axes(self, values):
+        """Values in state order (x, y, z, roll, pitch, yaw). Only changed axes are written and marked.
+           Unrolled, this runs for every joystick report.
+        """
+        x, y, z, roll, pitch, yaw = values
+        axes = self.state.axes
+        changed = 0
+        if axes[0] != x:
+            axes[0] = x
+            changed = 0b1
+        if axes[1] != y:
+            axes[1] = y
+            changed |= 0b10
+        if axes[2] != z:
+            axes[2] = z
+            changed |= 0b100
+        if axes[3] != roll:
+            axes[3] = roll
+            changed |= 0b1000
+        if axes[4] != pitch:
+            axes[4] = pitch
+            changed |= 0b10000
+        if axes[5] != yaw:
+            axes[5] = yaw
+            changed |= 0b100000
+        self._changedAxes = changed
+
+
+    def _write_button(self, decode, usb_msg):
+        """Button states are transmitted as a bit Register, decode (compiled button report decoder of the profile)
+           returns it in BUTTON_MASKS layout.
+           BitRegister Mapping (zero-indexed) of the SpaceMouse Pro Wireless:
            [,, front, right,, top, fit, menu, b4, b3, b2, b1,,,, rollView, alt, escape,,,,,,,,,,,, lockRotation, control, shift]
            [,, 29,    28,   , 26,  25,  24,   23, 22, 21, 20,,,, 16,       15,  14,    ,,,,,,,,,,, 2,            1,       0    ]
         """
-        bitReg = to_uint32(usb_msg[4], usb_msg[3], usb_msg[2], usb_msg[1])
-
-        # Each individually set to false to avoid false reading of member variable with timing inbetween setting false and verifying bit register.
-        if bitReg & 0x80000000 >> 2:
-            self.paramDict['front'] = True
-        else:
-            self.paramDict['front'] = False
-        if bitReg & 0x80000000 >> 3:
-            self.paramDict['right'] = True
-        else:
-            self.paramDict['right'] = False
-        if bitReg & 0x80000000 >> 5:
-            self.paramDict['top'] = True
-        else:
-            self.paramDict['top'] = False
-        if bitReg & 0x80000000 >> 6:
-            self.paramDict['fit'] = True
-        else:
-            self.paramDict['fit'] = False
-        if bitReg & 0x80000000 >> 7:
-            self.paramDict['menu'] = True
-        else:
-            self.paramDict['menu'] = False
-        if bitReg & 0x80000000 >> 8:
-            self.paramDict['b4'] = True
-        else:
-            self.paramDict['b4'] = False
-        if bitReg & 0x80000000 >> 9:
-            self.paramDict['b3'] = True
-        else:
-            self.paramDict['b3'] = False
-        if bitReg & 0x80000000 >> 10:
-            self.paramDict['b2'] = True
-        else:
-            self.paramDict['b2'] = False
-        if bitReg & 0x80000000 >> 11:
-            self.paramDict['b1'] = True
-        else:
-            self.paramDict['b1'] = False
-        if bitReg & 0x80000000 >> 15:
-            self.paramDict['rollView'] = True
-        else:
-            self.paramDict['rollView'] = False
-        if bitReg & 0x80000000 >> 16:
-            self.paramDict['alt'] = True
-        else:
-            self.paramDict['alt'] = False
-        if bitReg & 0x80000000 >> 17:
-            self.paramDict['escape'] = True
-        else:
-            self.paramDict['escape'] = False
-        if bitReg & 0x80000000 >> 29:
-            self.paramDict['lockRotation'] = True
-        else:
-            self.paramDict['lockRotation'] = False
-        if bitReg & 0x80000000 >> 30:
-            self.paramDict['control'] = True
-        else:
-            self.paramDict['control'] = False
-        if bitReg & 0x80000000 >> 31:
-            self.paramDict['shift'] = True
-        else:
-            self.paramDict['shift'] = False
+        self._write_button_register(decode(usb_msg))
 
 
+    def _write_button_register(self, bitReg):
+        self._changedButtons = (self.state.buttons ^ bitReg) & ALL_BUTTONS_MASK
+        if self._changedButtons:
+            self.buttonsPressed, self.buttonsReleased = button_edges(self.state.buttons, bitReg)
+        self.state.buttons = bitReg
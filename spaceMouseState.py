@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Compact decoded state of the spacemouse: six int16 axes with one validity flag and the button bit register.
+"""
+import array
+
+
+######################################################################################################
+# Layout
+######################################################################################################
+
+AXIS_NAMES = ('x', 'y', 'z', 'roll', 'pitch', 'yaw')
+AXIS_INDEX = {name: index for index, name in enumerate(AXIS_NAMES)}
+AXIS_MASKS = {name: 1 << index for index, name in enumerate(AXIS_NAMES)}  # bit i set: axis i changed
+ALL_AXES_MASK = 0b111111
+
+# Mask of each button in the bit register (bit 31 - index of the mapping in SpaceMouseProWireless._write_button).
+BUTTON_MASKS = dict(front=0x80000000 >> 2,
+                    right=0x80000000 >> 3,
+                    top=0x80000000 >> 5,
+                    fit=0x80000000 >> 6,
+                    menu=0x80000000 >> 7,
+                    b4=0x80000000 >> 8,
+                    b3=0x80000000 >> 9,
+                    b2=0x80000000 >> 10,
+                    b1=0x80000000 >> 11,
+                    rollView=0x80000000 >> 15,
+                    alt=0x80000000 >> 16,
+                    escape=0x80000000 >> 17,
+                    lockRotation=0x80000000 >> 29,
+                    control=0x80000000 >> 30,
+                    shift=0x80000000 >> 31)
+
+_BUTTON_NAME_BY_MASK = {mask: name for name, mask in BUTTON_MASKS.items()}
+ALL_BUTTONS_MASK = sum(BUTTON_MASKS.values())
+
+
+def button_edges(previousReg, bitReg):
+    """Names of the buttons pressed and released between two bit registers, as two tuples.
+       Only the changed bits are visited.
+    """
+    changed = (previousReg ^ bitReg) & ALL_BUTTONS_MASK
+    if not changed:
+        return (), ()
+
+    pressed = []
+    released = []
+    while changed:
+        bit = changed & -changed  # lowest set bit
+        changed ^= bit
+        if bitReg & bit:
+            pressed.append(_BUTTON_NAME_BY_MASK[bit])
+        else:
+            released.append(_BUTTON_NAME_BY_MASK[bit])
+    return tuple(pressed), tuple(released)
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class SpaceMouseState:
+    """axes: array of six int16 in AXIS_NAMES order, all 0 while the joystick is released.
+       valid: False while the joystick is released.
+       buttons: uint32 button bit register, see BUTTON_MASKS.
+       Index access state[i] returns axis i.
+    """
+    __slots__ = ('axes', 'valid', 'buttons')
+
+    def __init__(self):
+        self.axes = array.array('h', bytes(12))
+        self.valid = False
+        self.buttons = 0
+
+    def __getitem__(self, index):
+        return self.axes[index]
+
+    def __len__(self):
+        return 6
+
+    def __repr__(self):
+        return 'SpaceMouseState(axes=' + str(self.axes.tolist()) + ', valid=' + str(self.valid) \
+               + ', buttons=' + hex(self.buttons) + ')'
+
+    def is_pressed(self, name):
+        return bool(self.buttons & BUTTON_MASKS[name])
+
+    @property
+    def x(self):
+        return self.axes[0]
+
+    @property
+    def y(self):
+        return self.axes[1]
+
+    @property
+    def z(self):
+        return self.axes[2]
+
+    @property
+    def roll(self):
+        return self.axes[3]
+
+    @property
+    def pitch(self):
+        return self.axes[4]
+
+    @property
+    def yaw(self):
+        return self.axes[5]
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""
+Streams the decoded spacemouse state to local subscribers over a Unix domain datagram socket or localhost UDP.
+
+Frame layout, fixed size, little endian (FRAME): timestamp int64 (ns, time.monotonic_ns at the arrival of the
+report), sequence uint32, axes 6 x int16 (paramKeyList order, 0 when released), buttons uint32 (bit register, see
+BUTTON_MASKS). A client subscribes by sending any datagram to the server ('bye' unsubscribes) and then receives one frame per
+state change.
+
+Server entry point:
+    python streamServer.py --unix /tmp/spacemouse.sock
+    python streamServer.py --udp 5555
+"""
+import argparse
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+
+
+FRAME = struct.Struct('<qI6hI')
+UNSUBSCRIBE = b'bye'
+
+
+def _open_socket(address):
+    """address: path of a Unix socket (str) or (host, port) for UDP."""
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+
+######################################################################################################
+# Classes
+######################################################################################################
+
+class SpaceMouseStreamServer:
+    def __init__(self, mouse, address):
+        """mouse: SpaceMouseProWireless whose state changes are broadcast. address: see _open_socket."""
+        self.mouse = mouse
+        self.address = address
+        self.sequence = 0
+        self.subscribers = set()
+
+        # PRIVATE VARIABLES
+        self._frame = bytearray(FRAME.size)  # packed in place for every broadcast
+        self._sock = _open_socket(address)
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)  # stale socket file of a previous run
+        self._sock.bind(address)
+        self._sock.settimeout(0.2)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._subscription_loop, name='SpaceMouseStreamServer', daemon=True)
+        self._subscription = None
+
+    def start(self):
+        """Accept subscribers and broadcast every state change of the mouse (from its decoding thread)."""
+        self._thread.start()
+        self._subscription = self.mouse.subscribe(self.broadcast)
+
+    def stop(self):
+        if self._subscription is not None:
+            self.mouse.unsubscribe(self._subscription)
+            self._subscription = None
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._sock.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def broadcast(self, state, changedAxes=0, changedButtons=0):
+        """Send the state as one frame to every subscriber, stamped with mouse.timestamp. Signature of a subscribe
+        callback.
+        """
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        FRAME.pack_into(self._frame, 0, self.mouse.timestamp, self.sequence, *state.axes, state.buttons)
+
+        for subscriber in tuple(self.subscribers):
+            try:
+                self._sock.sendto(self._frame, socket.MSG_DONTWAIT, subscriber)  # never block the decoding thread
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.subscribers.discard(subscriber)  # client gone
+            except BlockingIOError:
+                pass  # client not keeping up, drop this frame for it
+
+    def _subscription_loop(self):
+        while not self._stop.is_set():
+            try:
+                data, subscriber = self._sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._stop.is_set():
+                    return
+                continue
+
+            if not subscriber:
+                continue  # unbound unix client, cannot reply
+            if data == UNSUBSCRIBE:
+                self.subscribers.discard(subscriber)
+            else:
+                self.subscribers.add(subscriber)
+
+
+class SpaceMouseStreamClient:
+    """Receives frames into one preallocated buffer. timestamp, sequence, buttons and axes (memoryview of six int16)
+    always show the last frame received, nothing is allocated per frame.
+    """
+    def __init__(self, address, local_address=None):
+        """address: server address. local_address: own address, for Unix sockets a temporary path if None."""
+        if sys.byteorder != 'little':
+            raise RuntimeError('Frames are little endian, decoding views need a little endian host')
+
+        self.address = address
+
+        # PRIVATE VARIABLES
+        self._sock = _open_socket(address)
+        self._ownPath = None
+        if isinstance(address, str):
+            if local_address is None:
+                local_address = os.path.join(tempfile.gettempdir(),
+                                             'spacemouse-client-%d-%x.sock' % (os.getpid(), id(self)))
+            self._ownPath = local_address
+        elif local_address is None:
+            local_address = ('127.0.0.1', 0)
+        self._sock.bind(local_address)
+
+        self._buffer = bytearray(FRAME.size)
+        view = memoryview(self._buffer)
+        self._timestamp = view[0:8].cast('q')
+        self._sequence = view[8:12].cast('I')
+        self.axes = view[12:24].cast('h')
+        self._buttons = view[24:28].cast('I')
+
+        self.subscribe()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def timestamp(self):
+        return self._timestamp[0]
+
+    @property
+    def sequence(self):
+        return self._sequence[0]
+
+    @property
+    def buttons(self):
+        return self._buttons[0]
+
+    def subscribe(self):
+        self._sock.sendto(b'sub', self.address)
+
+    def receive(self, timeout=None):
+        """Wait for the next frame, timeout in s (None: forever). Returns False on timeout."""
+        self._sock.settimeout(timeout)
+        while True:
+            try:
+                length = self._sock.recv_into(self._buffer)
+            except socket.timeout:
+                return False
+            if length == FRAME.size:
+                return True
+
+    def close(self):
+        try:
+            self._sock.sendto(UNSUBSCRIBE, self.address)
+        except OSError:
+            pass  # server gone
+        self._sock.close()
+        if self._ownPath is not None and os.path.exists(self._ownPath):
+            os.unlink(self._ownPath)
+
+
+######################################################################################################
+# Main
+######################################################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Broadcast the spacemouse state to local subscribers.')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--unix', help='path of the Unix datagram socket')
+    group.add_argument('--udp', type=int, help='localhost UDP port')
+    args = parser.parse_args()
+
+    from spaceMouseProWireless import SpaceMouseProWireless
+
+    ct = SpaceMouseProWireless()
+    server = SpaceMouseStreamServer(ct, args.unix if args.unix else ('127.0.0.1', args.udp))
+    server.start()
+    try:
+        while True:
+            ct.get_interrupt_msg()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
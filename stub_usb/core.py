@@ -5,24 +5,31 @@
 
 """
 
-__all__ = ['find', 'Device', 'USBError']
+__all__ = ['find', 'Device', 'Endpoint', 'USBError']
 
 
 import array
 
 
-def find(idVendor, idProduct):
+def find(idVendor=None, idProduct=None, find_all=False, custom_match=None, **kwargs):
     print('Mockfind')
-    if idVendor == idProduct == 0:
-        return None  # No device found, timeout
-
     stub_device = Device()
-    return stub_device
+    if idVendor == idProduct == 0 or (custom_match is not None and not custom_match(stub_device)):
+        return iter([]) if find_all else None  # No device found, timeout
+
+    return iter([stub_device]) if find_all else stub_device
 
 
 class Device:
     def __init__(self):
         self.msg = "This is a mock object for testing."
+        self.bus = 1
+        self.address = 4
+        self.port_numbers = (2,)
+
+    @staticmethod
+    def get_active_configuration():
+        return {(0, 0): [Endpoint(0x81, 0x20)]}  # configuration[(interface, alternate setting)][endpoint index]
 
     @staticmethod
     def is_kernel_driver_active(var):
@@ -40,6 +47,12 @@ class Device:
         return array.array('i', [0, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00])
 
 
+class Endpoint:
+    def __init__(self, bEndpointAddress, wMaxPacketSize):
+        self.bEndpointAddress = bEndpointAddress
+        self.wMaxPacketSize = wMaxPacketSize
+
+
 class USBError(IOError):
     def __init__(self, strerror, error_code=None, errno=None):
         r"""Initialize the object.
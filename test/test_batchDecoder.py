@@ -0,0 +1,73 @@
+import pytest
+import sys
+
+np = pytest.importorskip('numpy')
+
+from batchDecoder import *
+
+
+def pad(msg, report_length=0x20):
+    return bytes(msg) + bytes(report_length - len(msg))
+
+
+class TestBatchDecoder:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_joystick_all_axes_minus_90_decoded():
+        buf = pad([1, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00])
+
+        res = decode_reports(buf)
+
+        assert res.joystick.dtype == np.int16
+        assert res.joystick.tolist() == [[-90] * 6]
+
+    @staticmethod
+    def test_joystick_columns_in_param_key_list_order():
+        # pitch (bytes 7-8) = -1, roll (bytes 9-10) = -2 after sign inversion
+        buf = pad([1, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0])
+
+        res = decode_reports(buf)
+
+        assert res.joystick.tolist() == [[0, 0, 0, -2, -1, 0]]
+
+    @staticmethod
+    def test_button_bit_register_byte_1_is_msb():
+        buf = pad([3, 0b00110000, 0, 0, 0b111])
+
+        res = decode_reports(buf)
+
+        assert res.buttons.dtype == np.uint32
+        assert res.buttons.tolist() == [0x30000007]
+
+    @staticmethod
+    def test_mixed_stream_split_by_type_with_indices():
+        buf = pad([3, 0, 0, 0, 1]) + pad([1, 1, 0]) + pad([23]) + pad([1, 2, 0])
+
+        res = decode_reports(buf)
+
+        assert res.joystick_index.tolist() == [1, 3]
+        assert res.joystick[:, 0].tolist() == [1, 2]
+        assert res.button_index.tolist() == [0]
+
+    @staticmethod
+    def test_2d_array_accepted_without_copy():
+        rows = np.zeros((4, 16), dtype=np.uint8)
+
+        assert as_report_array(rows) is rows
+
+    @staticmethod
+    def test_buffer_length_not_multiple_of_report_length_raises_value_error():
+        with pytest.raises(ValueError):
+            decode_reports(bytes(33))
+
+    @staticmethod
+    def test_min_int16_saturates_when_inverted():
+        buf = pad([1, 0, 0, 0, 0x80])
+
+        res = decode_reports(buf)
+
+        assert res.joystick[0, 1] == 32767
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
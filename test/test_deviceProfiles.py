@@ -0,0 +1,80 @@
+import pytest
+import sys
+
+from deviceProfiles import *
+from spaceMouseState import BUTTON_MASKS
+
+
+class TestCompileDecoders:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_combined_report_decodes_all_axes_in_state_order():
+        kind, decode = compile_decoders(SPACEMOUSE_PRO_WIRELESS)[1]
+        msg = bytes([1, 10, 0, 20, 0, 30, 0, 40, 0, 50, 0, 60, 0])
+
+        assert kind == AXES
+        assert decode(msg, (0,) * 6) == (10, -20, -30, -50, -40, -60)  # roll before pitch in the state
+
+    @staticmethod
+    def test_negated_minimum_saturates():
+        decode = compile_decoders(SPACEMOUSE_PRO_WIRELESS)[1][1]
+        msg = bytes([1, 0, 0x80, 0, 0x80, 0, 0, 0, 0, 0, 0, 0, 0])
+
+        assert decode(msg, (0,) * 6) == (-32768, 32767, 0, 0, 0, 0)
+
+    @staticmethod
+    def test_split_reports_keep_the_other_axes():
+        decoders = compile_decoders(SPACE_NAVIGATOR)
+        translation = decoders[1][1]
+        rotation = decoders[2][1]
+
+        axes = translation(bytes([1, 1, 0, 2, 0, 3, 0]), (0, 0, 0, 7, 8, 9))
+        assert axes == (1, -2, -3, 7, 8, 9)
+        assert rotation(bytes([2, 4, 0, 5, 0, 6, 0]), axes) == (1, -2, -3, -5, -4, -6)
+
+    @staticmethod
+    def test_button_bits_are_mapped_to_button_masks():
+        kind, decode = compile_decoders(SPACE_NAVIGATOR)[3]
+
+        assert kind == BUTTONS
+        assert decode(bytes([3, 0b11])) == BUTTON_MASKS['menu'] | BUTTON_MASKS['fit']
+        assert decode(bytes([3, 0b10])) == BUTTON_MASKS['fit']
+
+    @staticmethod
+    def test_register_in_button_mask_layout_is_passed_through():
+        decode = compile_decoders(SPACEMOUSE_PRO_WIRELESS)[3][1]
+
+        assert decode(bytes([3, 0, 0, 0x40, 0])) == BUTTON_MASKS['escape']
+
+    @staticmethod
+    def test_events_have_no_decoder():
+        assert compile_decoders(SPACEMOUSE_PRO_WIRELESS)[23] == (EVENT, None)
+
+    @staticmethod
+    def test_format_not_matching_axes_raises_value_error():
+        profile = DeviceProfile('broken', 1, 2, {1: AxisReport('<2h', 1, (('x', 1), ('y', 1), ('z', 1)))})
+
+        with pytest.raises(ValueError):
+            register_profile(profile)
+
+    @staticmethod
+    def test_unknown_button_raises_value_error():
+        profile = DeviceProfile('broken', 1, 2, {3: ButtonReport('<B', 1, ('knob',))})
+
+        with pytest.raises(ValueError):
+            compile_decoders(profile)
+
+
+class TestRegistry:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_profile_found_by_usb_ids():
+        assert find_profile(0x046d, 0xc626) is SPACE_NAVIGATOR
+
+    @staticmethod
+    def test_unregistered_ids_fall_back_to_default():
+        assert find_profile(0x1234, 0x5678) is SPACEMOUSE_PRO_WIRELESS
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
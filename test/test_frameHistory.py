@@ -0,0 +1,76 @@
+import array
+import pytest
+import sys
+
+from frameHistory import FrameHistory
+
+
+MS = 1_000_000
+
+
+def filled(capacity, count):
+    history = FrameHistory(capacity)
+    for i in range(count):
+        history.append(i * MS, array.array('h', [i, -i, 0, 0, 0, i % 7]), i)
+    return history
+
+
+class TestFrameHistory:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_capacity_below_one_raises_value_error():
+        with pytest.raises(ValueError):
+            FrameHistory(0)
+
+    @staticmethod
+    def test_keeps_last_capacity_frames_contiguous_after_wrap_around():
+        history = filled(4, 10)
+        window = history.since_sequence(0)
+
+        assert len(history) == 4
+        assert window.sequence == 6
+        assert list(window.timestamps) == [6 * MS, 7 * MS, 8 * MS, 9 * MS]
+        assert list(window.buttons) == [6, 7, 8, 9]
+        assert list(window.axes[6:12]) == [7, -7, 0, 0, 0, 0]
+
+    @staticmethod
+    def test_since_sequence_and_last_frames():
+        history = filled(8, 10)
+
+        assert list(history.since_sequence(8).buttons) == [8, 9]
+        assert history.last_frames(3).sequence == 7
+        assert len(history.since_sequence(10)) == 0
+
+    @staticmethod
+    def test_time_window_queries():
+        history = filled(100, 50)
+
+        assert list(history.between(10 * MS, 13 * MS).buttons) == [10, 11, 12]
+        window = history.last(0.005, now=49 * MS)
+        assert window.sequence == 44
+        assert len(window) == 6
+        assert len(history.between(100 * MS)) == 0
+
+    @staticmethod
+    def test_windows_are_views_without_copy():
+        history = filled(4, 4)
+        window = history.since_sequence(0)
+        history.append(100 * MS, array.array('h', [0] * 6), 99)
+
+        assert window.buttons[0] == 99  # oldest slot overwritten by the new frame
+
+    @staticmethod
+    def test_numpy_export():
+        np = pytest.importorskip('numpy')
+        history = filled(4, 6)
+        timestamps, axes, buttons = history.since_sequence(0).to_numpy()
+
+        assert timestamps.tolist() == [2 * MS, 3 * MS, 4 * MS, 5 * MS]
+        assert axes.shape == (4, 6)
+        assert axes[:, 1].tolist() == [-2, -3, -4, -5]
+        assert buttons.dtype == np.uint32
+        assert np.shares_memory(buttons, np.frombuffer(history.since_sequence(0).buttons, dtype=np.uint32))
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
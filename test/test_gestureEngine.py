@@ -0,0 +1,135 @@
+import pytest
+import sys
+
+from gestureEngine import *
+
+
+MS = 1_000_000
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def engine():
+    return GestureEngine(long_press=0.5, double_tap=0.3)
+
+
+def record(engine, kind, buttons):
+    gestures = []
+    engine.bind(kind, buttons, gestures.append)
+    return gestures
+
+
+class TestGestureEngine:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_chord_fires_in_any_press_order(engine):
+        gestures = record(engine, CHORD, ['shift', 'escape'])
+
+        engine.on_buttons(buttons_mask(['escape']), 0)
+        engine.on_buttons(buttons_mask(['escape', 'shift']), 10 * MS)
+        engine.on_buttons(0, 20 * MS)
+        engine.on_buttons(buttons_mask(['shift']), 30 * MS)
+        engine.on_buttons(buttons_mask(['escape', 'shift']), 40 * MS)
+
+        assert [gesture.timestamp for gesture in gestures] == [10 * MS, 40 * MS]
+        assert set(gestures[0].buttons) == {'shift', 'escape'}
+
+    @staticmethod
+    def test_sequence_fires_only_in_its_press_order(engine):
+        gestures = record(engine, SEQUENCE, ['shift', 'escape'])
+
+        engine.on_buttons(buttons_mask(['escape']), 0)
+        engine.on_buttons(buttons_mask(['escape', 'shift']), 10 * MS)
+        engine.on_buttons(0, 20 * MS)
+        engine.on_buttons(buttons_mask(['shift']), 30 * MS)
+        engine.on_buttons(buttons_mask(['escape', 'shift']), 40 * MS)
+
+        assert gestures == [Gesture(SEQUENCE, ('shift', 'escape'), 40 * MS)]
+
+    @staticmethod
+    def test_long_press_fires_once_from_report_timestamps_and_suppresses_tap(engine):
+        longPresses = record(engine, LONG_PRESS, ['menu'])
+        taps = record(engine, TAP, ['menu'])
+
+        engine.on_report(3, buttons_mask(['menu']), 0)
+        engine.on_report(1, buttons_mask(['menu']), 400 * MS)
+        engine.tick(500 * MS)
+        engine.on_report(1, buttons_mask(['menu']), 600 * MS)
+        engine.on_report(3, 0, 700 * MS)
+
+        assert longPresses == [Gesture(LONG_PRESS, ('menu',), 500 * MS)]
+        assert taps == []
+
+    @staticmethod
+    def test_device_long_press_report_fires_long_press(engine):
+        longPresses = record(engine, LONG_PRESS, ['fit'])
+
+        engine.on_report(3, buttons_mask(['fit']), 0)
+        engine.on_report(22, buttons_mask(['fit']), 100 * MS)
+
+        assert [gesture.timestamp for gesture in longPresses] == [100 * MS]
+
+    @staticmethod
+    def test_double_tap_within_window(engine):
+        taps = record(engine, TAP, ['fit'])
+        doubleTaps = record(engine, DOUBLE_TAP, ['fit'])
+        fit = buttons_mask(['fit'])
+
+        for start in (0, 200 * MS, 1000 * MS):
+            engine.on_buttons(fit, start)
+            engine.on_buttons(0, start + 50 * MS)
+
+        assert len(taps) == 3
+        assert doubleTaps == [Gesture(DOUBLE_TAP, ('fit',), 250 * MS)]
+
+    @staticmethod
+    def test_reset_forgets_held_buttons_and_last_tap_without_firing(engine):
+        taps = record(engine, TAP, ['fit'])
+        doubleTaps = record(engine, DOUBLE_TAP, ['fit'])
+        longPresses = record(engine, LONG_PRESS, ['fit'])
+        fit = buttons_mask(['fit'])
+
+        engine.on_buttons(fit, 0)
+        engine.on_buttons(0, 50 * MS)
+        engine.on_buttons(fit, 100 * MS)
+        engine.reset()
+        engine.on_report(1, 0, 150 * MS)
+        engine.tick(1000 * MS)
+        engine.on_buttons(fit, 1100 * MS)
+        engine.on_buttons(0, 1150 * MS)
+
+        assert [gesture.timestamp for gesture in taps] == [50 * MS, 1150 * MS]
+        assert doubleTaps == [] and longPresses == []
+
+    @staticmethod
+    def test_chord_tap_is_not_a_tap_of_its_last_button(engine):
+        taps = record(engine, TAP, ['fit'])
+        chordTaps = record(engine, TAP, ['fit', 'menu'])
+
+        engine.on_buttons(buttons_mask(['fit', 'menu']), 0)
+        engine.on_buttons(buttons_mask(['fit']), 10 * MS)
+        engine.on_buttons(0, 20 * MS)
+
+        assert taps == []
+        assert len(chordTaps) == 1
+
+    @staticmethod
+    def test_unbound_gesture_is_ignored_and_unbind_removes_action(engine):
+        gestures = record(engine, TAP, ['fit'])
+        engine.unbind(TAP, ['fit'])
+
+        engine.on_buttons(buttons_mask(['menu']), 0)
+        engine.on_buttons(0, 10 * MS)
+        engine.on_buttons(buttons_mask(['fit']), 20 * MS)
+        engine.on_buttons(0, 30 * MS)
+
+        assert gestures == []
+
+    @staticmethod
+    def test_unknown_kind_raises_value_error(engine):
+        with pytest.raises(ValueError):
+            engine.bind('triple_tap', ['fit'], print)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
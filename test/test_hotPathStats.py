@@ -0,0 +1,82 @@
+import pytest
+import sys
+
+from hotPathStats import *
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def stats():
+    return ReportStatistics()
+
+
+class TestLatencyHistogram:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_durations_counted_in_power_of_two_buckets():
+        hist = LatencyHistogram()
+        for ns in [0, 3, 4, 7, 1000]:
+            hist.record(ns)
+
+        snapshot = hist.snapshot()
+
+        assert snapshot['buckets'] == {1: 1, 4: 1, 8: 2, 1024: 1}
+        assert snapshot['count'] == 5
+        assert snapshot['max_ns'] == 1000
+
+    @staticmethod
+    def test_percentiles_are_bucket_upper_bounds():
+        hist = LatencyHistogram()
+        for _ in range(99):
+            hist.record(100)
+        hist.record(100000)
+
+        snapshot = hist.snapshot()
+
+        assert snapshot['p50_ns'] == 128
+        assert snapshot['p99_ns'] == 128
+        assert snapshot['mean_ns'] == pytest.approx(1099)
+
+    @staticmethod
+    def test_empty_histogram_snapshot():
+        snapshot = LatencyHistogram().snapshot()
+
+        assert snapshot['count'] == 0
+        assert snapshot['p99_ns'] == 0
+
+
+class TestReportStatistics:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_reports_counted_per_type_unknown_separately(stats):
+        stats.record_report(1, 0, 10)
+        stats.record_report(1, 100, 110)
+        stats.record_report(23, 200, 210)
+        stats.record_report(5, 300, 310)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot['reports'] == {1: 2, 3: 0, 22: 0, 23: 1}
+        assert snapshot['unknown'] == 1
+
+    @staticmethod
+    def test_inter_arrival_starts_with_second_report(stats):
+        stats.record_report(1, 1000, 1010)
+        stats.record_report(1, 2000, 2010)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot['inter_arrival']['count'] == 1
+        assert snapshot['inter_arrival']['max_ns'] == 1000
+        assert snapshot['decode_latency']['count'] == 2
+
+    @staticmethod
+    def test_snapshot_is_independent_of_later_reports(stats):
+        snapshot = stats.snapshot()
+        stats.record_report(3, 0, 1)
+
+        assert snapshot['reports'][3] == 0
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,159 @@
+import pytest
+import sys
+
+import stub_usb.core
+import interruptTransferQueue as Itq
+from interruptTransferQueue import InterruptTransferQueue, TRANSFER_COMPLETED, TRANSFER_CANCELLED, \
+    TRANSFER_NO_DEVICE
+
+
+# Minimal stand-ins for the python-libusb1 objects, the device side is driven by the test.
+class FakeTransfer:
+    def __init__(self):
+        self.submitted = False
+        self.submissions = 0
+        self.status = None
+        self.data = b''
+        self.callback = None
+
+    def setInterrupt(self, endpoint, length, callback, timeout):
+        self.callback = callback
+
+    def submit(self):
+        self.submitted = True
+        self.submissions += 1
+
+    def cancel(self):
+        if self.submitted:
+            self.complete(TRANSFER_CANCELLED)
+
+    def isSubmitted(self):
+        return self.submitted
+
+    def getStatus(self):
+        return self.status
+
+    def getBuffer(self):
+        return bytearray(self.data)
+
+    def getActualLength(self):
+        return len(self.data)
+
+    def complete(self, status, data=b''):
+        self.submitted = False
+        self.status = status
+        self.data = data
+        self.callback(self)
+
+
+class FakeHandle:
+    def __init__(self):
+        self.transfers = []
+        self.closed = False
+
+    def getTransfer(self):
+        transfer = FakeTransfer()
+        self.transfers.append(transfer)
+        return transfer
+
+    def claimInterface(self, interface):
+        pass
+
+    def releaseInterface(self, interface):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    """handleEventsTimeout completes the scheduled (transfer index, status, data) events, one per call."""
+    def __init__(self, handle):
+        self.handle = handle
+        self.events = []
+        self.closed = False
+
+    def handleEventsTimeout(self, timeout):
+        if self.events:
+            index, status, data = self.events.pop(0)
+            self.handle.transfers[index].complete(status, data)
+
+    def close(self):
+        self.closed = True
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def queue():
+    handle = FakeHandle()
+    return InterruptTransferQueue(FakeContext(handle), handle, 0x81, 0x20, transfers=3)
+
+
+class TestInterruptTransferQueue:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_all_transfers_are_submitted(queue):
+        assert [transfer.submitted for transfer in queue._handle.transfers] == [True, True, True]
+
+    @staticmethod
+    def test_reports_returned_in_completion_order_and_transfers_resubmitted(queue):
+        queue._context.events = [(1, TRANSFER_COMPLETED, b'\x01\x02'), (0, TRANSFER_COMPLETED, b'\x03\x00')]
+
+        assert queue.read(0x81, 0x20, 10) == b'\x01\x02'
+        assert queue.read(0x81, 0x20, 10) == b'\x03\x00'
+        assert queue.completed == 2
+        assert [transfer.submissions for transfer in queue._handle.transfers] == [2, 2, 1]
+
+    @staticmethod
+    def test_no_report_raises_timeout_errno(queue):
+        with pytest.raises(stub_usb.core.USBError) as er:
+            queue.read(0x81, 0x20, 1)
+
+        assert er.value.errno == 110
+
+    @staticmethod
+    def test_failed_transfer_raises_its_errno(queue):
+        queue._context.events = [(2, TRANSFER_NO_DEVICE, b'')]
+
+        with pytest.raises(stub_usb.core.USBError) as er:
+            queue.read(0x81, 0x20, 10)
+
+        assert er.value.errno == 19
+
+    @staticmethod
+    def test_close_cancels_transfers_and_closes_handle(queue):
+        queue.close()
+
+        assert not any(transfer.submitted for transfer in queue._handle.transfers)
+        assert queue._handle.closed
+        assert queue._context.closed
+
+    @staticmethod
+    def test_less_than_one_transfer_raises_value_error():
+        handle = FakeHandle()
+        with pytest.raises(ValueError):
+            InterruptTransferQueue(FakeContext(handle), handle, 0x81, 0x20, transfers=0)
+
+
+class TestOpenTransferQueue:
+    @staticmethod
+    def test_pyusb_handle_released_before_usb1_claims_interface(mocker):
+        calls = []
+        handle = FakeHandle()
+        mocker.patch.object(handle, 'claimInterface', side_effect=lambda interface: calls.append('claim'))
+        candidate = mocker.Mock(**{'getBusNumber.return_value': 1, 'getDeviceAddress.return_value': 4,
+                                   'open.return_value': handle})
+        context = FakeContext(handle)
+        context.open = lambda: None
+        context.getDeviceIterator = lambda skip_on_error: iter([candidate])
+        mocker.patch.object(Itq, 'usb1', mocker.Mock(**{'USBContext.return_value': context}))
+        mocker.patch.object(Itq.usb.util, 'dispose_resources', side_effect=lambda device: calls.append('dispose'))
+
+        queue = Itq.open_transfer_queue(stub_usb.core.Device(), 0x81, 0x20, transfers=2)
+
+        assert calls == ['dispose', 'claim']
+        queue.close()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,115 @@
+import math
+import pytest
+import sys
+import time
+
+from poseIntegrator import PoseIntegrator, quat_rotate, quat_from_rotation_vector
+
+
+class TestQuaternions:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_quarter_turn_about_z_rotates_x_to_y():
+        q = quat_from_rotation_vector(0, 0, math.pi / 2)
+
+        assert quat_rotate(q, (1.0, 0.0, 0.0)) == pytest.approx((0.0, 1.0, 0.0))
+
+
+class TestPoseIntegrator:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_constant_velocity_integrates_by_report_timestamps():
+        integrator = PoseIntegrator(translation_scale=0.01)
+        integrator.update([100, 0, -50, 0, 0, 0], 1_000_000_000)
+        pose = integrator.advance(3_000_000_000)
+
+        assert pose.position == pytest.approx((2.0, 0.0, -1.0))
+        assert pose.timestamp == 3_000_000_000
+
+    @staticmethod
+    def test_velocity_holds_until_the_next_report():
+        integrator = PoseIntegrator(translation_scale=1.0)
+        integrator.update([1, 0, 0, 0, 0, 0], 0)
+        integrator.update([0, 0, 0, 0, 0, 0], 500_000_000)
+        pose = integrator.advance(2_000_000_000)
+
+        assert pose.position[0] == pytest.approx(0.5)
+
+    @staticmethod
+    def test_rotation_stays_normalized_and_returns_after_full_turn():
+        integrator = PoseIntegrator(rotation_scale=2 * math.pi / 100)
+        integrator.update([0, 0, 0, 0, 0, 100], 0)
+        integrator.update([0, 0, 0, 0, 0, 0], 1_000_000_000)  # one turn per s for 1 s, in 100 ticks
+        pose = integrator.advance(2_000_000_000)
+
+        assert sum(value * value for value in pose.orientation) == pytest.approx(1.0)
+        assert quat_rotate(pose.orientation, (1.0, 0.0, 0.0)) == pytest.approx((1.0, 0.0, 0.0))
+
+    @staticmethod
+    def test_body_frame_translation_follows_orientation():
+        integrator = PoseIntegrator(translation_scale=1.0, rotation_scale=1.0)
+        integrator.update([0, 0, 0, 0, 0, math.pi / 2], 0)
+        integrator.update([1, 0, 0, 0, 0, 0], 1_000_000_000)  # quarter turn about z done
+        pose = integrator.advance(2_000_000_000)
+
+        assert pose.position == pytest.approx((0.0, 1.0, 0.0), abs=1e-9)
+
+    @staticmethod
+    def test_world_frame_translation_ignores_orientation():
+        integrator = PoseIntegrator(translation_scale=1.0, rotation_scale=1.0, body_frame=False)
+        integrator.update([0, 0, 0, 0, 0, math.pi / 2], 0)
+        integrator.update([1, 0, 0, 0, 0, 0], 1_000_000_000)
+        pose = integrator.advance(2_000_000_000)
+
+        assert pose.position == pytest.approx((1.0, 0.0, 0.0), abs=1e-9)
+
+    @staticmethod
+    def test_batch_matches_report_by_report_integration():
+        np = pytest.importorskip('numpy')
+        rng = np.random.default_rng(3)
+        axes = rng.integers(-350, 350, size=(300, 6))
+        timestamps = np.cumsum(rng.integers(1_000_000, 9_000_000, size=300))
+
+        sequential = PoseIntegrator(translation_scale=1e-3, rotation_scale=1e-3, tick=1.0)
+        positions = []
+        orientations = []
+        for row, timestamp in zip(axes.tolist(), timestamps.tolist()):
+            pose = sequential.advance(timestamp)
+            positions.append(pose.position)
+            orientations.append(pose.orientation)
+            sequential.update(row, timestamp)
+
+        batch = PoseIntegrator(translation_scale=1e-3, rotation_scale=1e-3, tick=1.0)
+        batchPositions, batchOrientations = batch.integrate_batch(axes, timestamps)
+
+        np.testing.assert_allclose(batchPositions, positions, atol=1e-9)
+        np.testing.assert_allclose(batchOrientations, orientations, atol=1e-9)
+        assert batch.advance(int(timestamps[-1]) + 10_000_000).position == \
+            pytest.approx(sequential.advance(int(timestamps[-1]) + 10_000_000).position)
+
+    @staticmethod
+    def test_tick_thread_calls_listeners_at_fixed_ticks():
+        integrator = PoseIntegrator(tick=0.002)
+        ticks = []
+        integrator.add_tick_listener(lambda pose: ticks.append(pose.timestamp))
+        integrator.update([0] * 6, time.monotonic_ns())
+        integrator.start()
+        time.sleep(0.05)
+        integrator.stop()
+
+        assert len(ticks) > 3
+        assert all((b - a) % 2_000_000 == 0 for a, b in zip(ticks, ticks[1:]))
+
+    @staticmethod
+    def test_start_twice_raises_runtime_error():
+        integrator = PoseIntegrator()
+        integrator.start()
+        try:
+            with pytest.raises(RuntimeError):
+                integrator.start()
+        finally:
+            integrator.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,55 @@
+import pytest
+import sys
+
+from readTimeoutPolicy import ReadTimeoutPolicy
+
+
+class TestReadTimeoutPolicy:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_default_policy_is_adaptive():
+        policy = ReadTimeoutPolicy()
+        assert policy.timeout == 10
+
+        policy.on_report(23)
+        assert policy.timeout == 1000
+
+    @staticmethod
+    def test_non_positive_timeout_raises_value_error():
+        with pytest.raises(ValueError):
+            ReadTimeoutPolicy(idle_timeout=0)
+
+    @staticmethod
+    def test_inactivity_report_switches_to_idle_timeout():
+        policy = ReadTimeoutPolicy(idle_timeout=1000)
+        policy.on_report(23)
+
+        assert policy.idle is True
+        assert policy.timeout == 1000
+
+    @staticmethod
+    def test_report_after_idle_switches_back_to_active_timeout():
+        policy = ReadTimeoutPolicy(idle_timeout=1000)
+        policy.on_report(23)
+        policy.on_report(1)
+
+        assert policy.idle is False
+        assert policy.timeout == 10
+
+    @staticmethod
+    def test_silence_longer_than_idle_after_switches_to_idle():
+        policy = ReadTimeoutPolicy(idle_timeout=1000, idle_after=0)
+        policy.on_timeout()
+
+        assert policy.timeout == 1000
+
+    @staticmethod
+    def test_timeout_before_idle_after_stays_active():
+        policy = ReadTimeoutPolicy(idle_timeout=1000, idle_after=60000)
+        policy.on_timeout()
+
+        assert policy.timeout == 10
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
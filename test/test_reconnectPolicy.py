@@ -0,0 +1,23 @@
+import pytest
+import sys
+import itertools
+
+from reconnectPolicy import ReconnectPolicy
+
+
+class TestReconnectPolicy:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_delays_grow_exponentially_up_to_max_delay():
+        policy = ReconnectPolicy(initial_delay=0.01, factor=2, max_delay=0.05)
+
+        assert list(itertools.islice(policy.delays(), 5)) == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+    @staticmethod
+    def test_max_delay_below_initial_delay_raises_value_error():
+        with pytest.raises(ValueError):
+            ReconnectPolicy(initial_delay=1, max_delay=0.5)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,182 @@
+import pytest
+import sys
+import array
+import time
+
+from reportCapture import *
+import replay_usb.core
+import replay_usb.util
+import spaceMouseProWireless as Sm
+import stub_usb.core
+import usbDeviceCache as Udc
+from reconnectPolicy import ReconnectPolicy
+
+
+JOYSTICK_MSG = [1, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00]
+BUTTON_MSG = [3, 0, 0, 0, 1]
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def capture_path(tmp_path):
+    path = str(tmp_path / 'session.smcap')
+    with ReportRecorder(path) as recorder:
+        recorder.write(array.array('B', JOYSTICK_MSG), timestamp=1000)
+        recorder.write(array.array('i', BUTTON_MSG), timestamp=2000)
+    return path
+
+
+class TestReportCapture:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_recorded_reports_read_back_with_timestamps(capture_path):
+        with ReportCapture(capture_path) as capture:
+            records = [(timestamp, bytes(report)) for timestamp, report in capture]
+
+        assert records == [(1000, bytes(JOYSTICK_MSG)), (2000, bytes(BUTTON_MSG))]
+
+    @staticmethod
+    def test_header_keeps_device_ids(capture_path):
+        with ReportCapture(capture_path) as capture:
+            assert (capture.idVendor, capture.idProduct, capture.reportLength) == (0x256f, 0xc652, 0x20)
+
+    @staticmethod
+    def test_recorder_appends_to_existing_capture(capture_path):
+        with ReportRecorder(capture_path) as recorder:
+            recorder.write(bytes([23]), timestamp=3000)
+
+        with ReportCapture(capture_path) as capture:
+            assert len(capture) == 3
+            assert capture[-1][0] == 3000
+
+    @staticmethod
+    def test_append_with_other_report_length_raises_value_error(capture_path):
+        with pytest.raises(ValueError):
+            ReportRecorder(capture_path, report_length=0x40)
+
+    @staticmethod
+    def test_partially_written_record_is_ignored(capture_path):
+        with open(capture_path, 'ab') as file:
+            file.write(bytes(10))
+
+        with ReportCapture(capture_path) as capture:
+            assert len(capture) == 2
+
+    @staticmethod
+    def test_not_a_capture_file_raises_value_error(tmp_path):
+        path = tmp_path / 'other.bin'
+        path.write_bytes(bytes(64))
+
+        with pytest.raises(ValueError):
+            ReportCapture(str(path))
+
+
+class TestReplayBackend:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_replay_as_fast_as_possible_returns_reports_in_order(capture_path):
+        replay_usb.core.load(capture_path, speed=None)
+        device = replay_usb.core.find(idVendor=0x256f, idProduct=0xc652)
+
+        assert list(device.read(0x81, 0x20, 10)) == JOYSTICK_MSG
+        assert list(device.read(0x81, 0x20, 10)) == BUTTON_MSG
+        replay_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_replay_reads_into_buffer_like_pyusb(capture_path):
+        replay_usb.core.load(capture_path, speed=None)
+        device = replay_usb.core.find()
+        buffer = array.array('B', bytes(0x20))
+
+        length = device.read(0x81, buffer, 10)
+
+        assert list(buffer[:length]) == JOYSTICK_MSG
+        replay_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_exhausted_capture_raises_no_device_error(capture_path):
+        replay_usb.core.load(capture_path, speed=None)
+        device = replay_usb.core.find()
+        device.read(0x81, 0x20, 10)
+        device.read(0x81, 0x20, 10)
+
+        with pytest.raises(replay_usb.core.USBError) as er:
+            device.read(0x81, 0x20, 10)
+        assert er.value.errno == 19
+        replay_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_report_not_due_within_timeout_raises_timeout(tmp_path):
+        path = str(tmp_path / 'slow.smcap')
+        with ReportRecorder(path) as recorder:
+            recorder.write(bytes(BUTTON_MSG), timestamp=0)
+            recorder.write(bytes(BUTTON_MSG), timestamp=10 ** 9)  # 1 s later
+
+        replay_usb.core.load(path, speed=1.0)
+        device = replay_usb.core.find()
+        device.read(0x81, 0x20, 10)
+
+        with pytest.raises(replay_usb.core.USBError) as er:
+            device.read(0x81, 0x20, 10)
+        assert er.value.errno == 110
+        replay_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_accelerated_replay_keeps_scaled_timing(tmp_path):
+        path = str(tmp_path / 'fast.smcap')
+        with ReportRecorder(path) as recorder:
+            recorder.write(bytes(BUTTON_MSG), timestamp=0)
+            recorder.write(bytes(BUTTON_MSG), timestamp=100 * 10 ** 6)  # 100 ms later
+
+        replay_usb.core.load(path, speed=10.0)
+        device = replay_usb.core.find()
+        start = time.monotonic()
+        device.read(0x81, 0x20, 100)
+        device.read(0x81, 0x20, 100)
+
+        assert 0.008 < time.monotonic() - start < 0.08
+        replay_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_other_device_ids_not_found(capture_path):
+        replay_usb.core.load(capture_path)
+
+        assert replay_usb.core.find(idVendor=1, idProduct=2) is None
+
+    @staticmethod
+    def test_replay_drives_spacemouse_in_place_of_pyusb(mocker, capture_path):
+        # What replay_usb.core.install does, on top of the stub conftest.py installed.
+        mocker.patch.object(stub_usb.core, 'find', replay_usb.core.find)
+        mocker.patch.object(stub_usb.core, 'USBError', replay_usb.core.USBError)
+        replay_usb.core.load(capture_path, speed=None)
+
+        ct = Sm.SpaceMouseProWireless(device_cache=Udc.DeviceCache())
+        assert ct.get_interrupt_msg() == 0
+        assert ct.paramDict['x'] == -90
+        assert ct.get_interrupt_msg() == 0
+        assert ct.state.buttons == 1
+        with pytest.raises(replay_usb.core.USBError):
+            ct.get_interrupt_msg()  # capture exhausted, no reconnect policy
+        replay_usb.util.dispose_resources(ct._dev)
+
+    @staticmethod
+    def test_reconnect_finds_the_same_replay_without_starting_over(mocker, capture_path, tmp_path):
+        mocker.patch.object(stub_usb.core, 'find', replay_usb.core.find)
+        mocker.patch.object(stub_usb.core, 'USBError', replay_usb.core.USBError)
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', str(tmp_path))  # sysfs of a host without receiver
+        device = replay_usb.core.load(capture_path, speed=None)
+        ct = Sm.SpaceMouseProWireless(device_cache=Udc.DeviceCache())
+        ct.reconnectPolicy = ReconnectPolicy(initial_delay=0.001, max_delay=0.001, give_up_after=0.02)
+        msgTypes = []
+
+        with pytest.raises(replay_usb.core.USBError):
+            while True:
+                if ct.get_interrupt_msg() == 0:
+                    msgTypes.append(ct._readBuffer[0])
+
+        assert msgTypes == [1, 3]  # exhausted capture stays exhausted
+        assert ct._dev is device and replay_usb.core.find() is None  # gone once exhausted
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,97 @@
+import pytest
+import sys
+
+from reportRingBuffer import ReportRingBuffer, CoalescingReportBuffer, make_report_buffer
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def ring():
+    return ReportRingBuffer(capacity=4)
+
+
+class TestReportRingBuffer:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_capacity_below_one_raises_value_error():
+        with pytest.raises(ValueError):
+            ReportRingBuffer(capacity=0)
+
+    @staticmethod
+    def test_empty_buffer_pop_returns_none(ring):
+        assert ring.pop() is None
+
+    @staticmethod
+    def test_pushed_report_is_popped_with_all_fields(ring):
+        ring.push(123, 1, [1, -2, 3, -4, 5, -32768], 0x80000001)
+
+        report = ring.pop()
+
+        assert report.timestamp == 123
+        assert report.msg_type == 1
+        assert report.axes == (1, -2, 3, -4, 5, -32768)
+        assert report.buttons == 0x80000001
+
+    @staticmethod
+    def test_reports_popped_in_push_order_across_wrap_around(ring):
+        for i in range(3):
+            ring.push(i, 1, [i] * 6, 0)
+        ring.drain()
+
+        for i in range(3, 7):
+            ring.push(i, 1, [i] * 6, 0)
+
+        assert [report.timestamp for report in ring.drain()] == [3, 4, 5, 6]
+
+    @staticmethod
+    def test_full_buffer_drops_new_report_and_counts_overflow(ring):
+        for i in range(5):
+            ring.push(i, 1, [0] * 6, 0)
+
+        assert ring.overflows == 1
+        assert len(ring) == 4
+        assert ring.pop().timestamp == 0
+
+
+class TestCoalescingReportBuffer:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_only_latest_joystick_report_is_kept():
+        buffer = CoalescingReportBuffer(capacity=4)
+        for i in range(5):
+            buffer.push(i, 1, [i] * 6, 0)
+
+        assert len(buffer) == 1
+        assert buffer.drain() == [(4, 1, (4,) * 6, 0)]
+        assert buffer.coalesced == 4
+        assert buffer.pop() is None
+
+    @staticmethod
+    def test_button_edges_are_all_kept_in_timestamp_order():
+        buffer = CoalescingReportBuffer(capacity=4)
+        buffer.push(0, 3, [0] * 6, 1)
+        buffer.push(1, 1, [1] * 6, 1)
+        buffer.push(2, 3, [1] * 6, 0)
+        buffer.push(3, 1, [3] * 6, 0)
+        buffer.push(4, 3, [3] * 6, 1)
+
+        assert [(report.timestamp, report.msg_type) for report in buffer.drain()] == [(0, 3), (2, 3), (3, 1), (4, 3)]
+        assert buffer.coalesced == 1
+
+    @staticmethod
+    def test_full_event_queue_counts_overflows():
+        buffer = CoalescingReportBuffer(capacity=2)
+        for i in range(3):
+            buffer.push(i, 3, [0] * 6, i)
+
+        assert buffer.overflows == 1
+        assert len(buffer) == 2
+
+    @staticmethod
+    def test_unknown_policy_raises_value_error():
+        with pytest.raises(ValueError):
+            make_report_buffer(4, 'newest')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
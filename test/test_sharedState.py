@@ -0,0 +1,89 @@
+import pytest
+import sys
+import multiprocessing
+
+from sharedState import *
+from spaceMouseState import SpaceMouseState, BUTTON_MASKS
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def publisher():
+    publisher = SharedStatePublisher()
+    yield publisher
+    publisher.close()
+
+
+def read_in_other_process(name, queue):
+    with SharedStateReader(name) as reader:
+        sequence, timestamp = reader.read()
+        queue.put((sequence, timestamp, list(reader.state.axes), reader.state.buttons, reader.state.valid))
+
+
+class TestSharedState:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_nothing_published_reads_sequence_zero(publisher):
+        with SharedStateReader(publisher.name) as reader:
+            assert reader.read() == (0, 0)
+            assert reader.state.valid is False
+
+    @staticmethod
+    def test_published_state_read_back(publisher):
+        state = SpaceMouseState()
+        state.axes[0] = -90
+        state.axes[5] = 350
+        state.valid = True
+        state.buttons = BUTTON_MASKS['escape']
+
+        publisher.publish(state, timestamp=1234)
+
+        with SharedStateReader(publisher.name) as reader:
+            assert reader.read() == (2, 1234)
+            assert list(reader.state.axes) == [-90, 0, 0, 0, 0, 350]
+            assert reader.state.is_pressed('escape')
+            assert reader.state.valid is True
+
+    @staticmethod
+    def test_sequence_grows_by_two_per_publish(publisher):
+        state = SpaceMouseState()
+        publisher.publish(state)
+        publisher.publish(state)
+
+        with SharedStateReader(publisher.name) as reader:
+            assert reader.read()[0] == 4
+
+    @staticmethod
+    def test_reader_in_other_process_sees_state(publisher):
+        state = SpaceMouseState()
+        state.axes[2] = 7
+        publisher.publish(state, timestamp=99)
+
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=read_in_other_process, args=(publisher.name, queue))
+        process.start()
+        result = queue.get(timeout=20)
+        process.join()
+
+        assert result == (2, 99, [0, 0, 7, 0, 0, 0], 0, False)
+
+    @staticmethod
+    def test_attached_publisher_follows_state_changes(mocker, publisher):
+        mouse = mocker.Mock()
+        mouse.state = mouse.publishedState = SpaceMouseState()
+        mouse.timestamp = 0
+
+        publisher.attach(mouse)
+        callback = mouse.subscribe.call_args.args[0]
+        mouse.state.axes[1] = 5
+        mouse.timestamp = 1234
+        callback(mouse.state, 0b10, 0)
+
+        with SharedStateReader(publisher.name) as reader:
+            assert reader.read() == (4, 1234)  # stamped with the arrival of the report
+            assert reader.state.y == 5
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
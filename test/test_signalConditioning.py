@@ -0,0 +1,121 @@
+import pytest
+import sys
+
+from signalConditioning import Deadzone, ExponentialSmoothing, OneEuroFilter, Scale, ResponseCurve, Pipeline
+
+
+def _process_each(pipeline, values, timestamps):
+    out = []
+    for row, timestamp in zip(values, timestamps):
+        out.append(pipeline.process([float(value) for value in row], int(timestamp)))
+    return out
+
+
+class TestStages:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_deadzone_zeroes_small_values_and_rescales_the_rest():
+        values = [5.0, -10.0, 11.0, -30.0, 0.0, 100.0]
+        Deadzone(10).process(values, 0)
+
+        assert values == [0.0, 0.0, 1.0, -20.0, 0.0, 90.0]
+
+    @staticmethod
+    def test_deadzone_per_axis_without_rescale():
+        values = [5.0, 5.0, 5.0, 5.0, 5.0, 5.0]
+        Deadzone([0, 10, 0, 10, 0, 10], rescale=False).process(values, 0)
+
+        assert values == [5.0, 0.0, 5.0, 0.0, 5.0, 0.0]
+
+    @staticmethod
+    def test_wrong_number_of_axis_values_raises_value_error():
+        with pytest.raises(ValueError):
+            Scale([1, 2, 3])
+
+    @staticmethod
+    def test_exponential_smoothing_moves_by_alpha():
+        smoothing = ExponentialSmoothing(0.5)
+        first = [0.0] * 6
+        second = [100.0] * 6
+        smoothing.process(first, 0)
+        smoothing.process(second, 1)
+
+        assert second == [50.0] * 6
+
+    @staticmethod
+    def test_alpha_out_of_range_raises_value_error():
+        with pytest.raises(ValueError):
+            ExponentialSmoothing(0)
+
+    @staticmethod
+    def test_one_euro_filter_smooths_slow_motion_and_follows_fast_motion():
+        slow = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+        fast = OneEuroFilter(min_cutoff=1.0, beta=1.0)
+        for pipeline in (slow, fast):
+            pipeline.process([0.0] * 6, 0)
+        slowValues = [100.0] * 6
+        fastValues = [100.0] * 6
+        slow.process(slowValues, 10_000_000)
+        fast.process(fastValues, 10_000_000)
+
+        assert 0 < slowValues[0] < 10
+        assert fastValues[0] > 90
+
+    @staticmethod
+    def test_response_curve_keeps_full_scale_and_flattens_center():
+        values = [350.0, -350.0, 35.0, 0.0, 0.0, 0.0]
+        ResponseCurve(expo=1.0, full_scale=350).process(values, 0)
+
+        assert values[:2] == [350.0, -350.0]
+        assert values[2] == pytest.approx(0.35)
+
+
+class TestPipeline:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_stages_run_in_order():
+        values = [20.0] * 6
+        Pipeline(Deadzone(10), Scale(2)).process(values, 0)
+
+        assert values == [20.0] * 6
+
+    @staticmethod
+    def test_batch_matches_single_samples():
+        np = pytest.importorskip('numpy')
+        rng = np.random.default_rng(1)
+        values = rng.integers(-350, 350, size=(500, 6))
+        timestamps = np.arange(500) * 8_000_000
+
+        def make():
+            return Pipeline(Deadzone(15), ExponentialSmoothing([0.1, 0.2, 0.3, 0.4, 0.5, 1.0]), OneEuroFilter(),
+                            Scale(-1), ResponseCurve(0.3))
+
+        single = _process_each(make(), values, timestamps)
+        batch = make().process_batch(values, timestamps)
+
+        np.testing.assert_allclose(batch, single, rtol=1e-9, atol=1e-9)
+
+    @staticmethod
+    def test_batches_continue_the_filter_state():
+        np = pytest.importorskip('numpy')
+        values = np.tile(np.linspace(-300, 300, 10000)[:, None], (1, 6))
+        single = _process_each(Pipeline(ExponentialSmoothing(0.01)), values, np.zeros(10000))
+
+        pipeline = Pipeline(ExponentialSmoothing(0.01))
+        batch = np.concatenate([pipeline.process_batch(values[:3000]), pipeline.process_batch(values[3000:])])
+
+        np.testing.assert_allclose(batch, single, rtol=1e-9, atol=1e-9)
+
+    @staticmethod
+    def test_reset_forgets_filter_state():
+        pipeline = Pipeline(ExponentialSmoothing(0.5))
+        pipeline.process([100.0] * 6, 0)
+        pipeline.reset()
+        values = [0.0] * 6
+        pipeline.process(values, 1)
+
+        assert values == [0.0] * 6
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
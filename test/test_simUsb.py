@@ -0,0 +1,141 @@
+import array
+import pytest
+import sys
+
+import sim_usb.core
+import sim_usb.util
+import spaceMouseProWireless as Sm
+import stub_usb.core
+import usbDeviceCache as Udc
+from reconnectPolicy import ReconnectPolicy
+
+
+def virtual_device(**settings):
+    return sim_usb.core.Device(realtime=False, seed=1, **settings)
+
+
+class TestSimulatedDevice:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_bad_settings_raise_value_error():
+        with pytest.raises(ValueError):
+            sim_usb.core.Device(rate=0)
+        with pytest.raises(ValueError):
+            sim_usb.core.configure(mix={'sneeze': 1.0})
+
+    @staticmethod
+    def test_find_matches_configured_ids():
+        sim_usb.core.configure(idVendor=0x256f, idProduct=0xc631)
+
+        assert sim_usb.core.find(idVendor=0x256f, idProduct=0xc652) is None
+        assert sim_usb.core.find(idVendor=0x256f, idProduct=0xc631).idProduct == 0xc631
+        sim_usb.core.configure()
+
+    @staticmethod
+    def test_find_returns_the_configured_device_every_time():
+        device = sim_usb.core.configure(seed=1)
+
+        assert sim_usb.core.find() is device
+        assert sim_usb.core.find(idVendor=0x256f, idProduct=0xc652) is device
+        sim_usb.core.configure()
+
+    @staticmethod
+    def test_stream_mixes_report_types_reproducibly():
+        first, second = virtual_device(), virtual_device()
+        reports = [bytes(first.read(0x81, 0x20, 10)) for _ in range(2000)]
+
+        assert reports == [bytes(second.read(0x81, 0x20, 10)) for _ in range(2000)]
+        assert all(count > 0 for count in first.sent.values())
+        assert first.sent[1] > first.sent[3] > first.sent[22]
+
+    @staticmethod
+    def test_reads_into_buffer_like_pyusb():
+        device = virtual_device(mix={'release': 1.0})
+        buffer = array.array('B', [0xFF] * 0x20)
+
+        length = device.read(0x81, buffer, 10)
+
+        assert length == 13
+        assert list(buffer[:length]) == [1] + [0] * 12
+
+    @staticmethod
+    def test_virtual_clock_follows_rate_and_bursts():
+        device = virtual_device(rate=4000, burst=4)
+        for _ in range(400):
+            device.read(0x81, 0x20, 10)
+
+        assert device._now() == pytest.approx(0.1e9, rel=0.01)  # 400 reports at 4 kHz
+
+    @staticmethod
+    def test_gaps_longer_than_the_timeout_time_out():
+        device = virtual_device(gap_probability=1.0, gap=0.05)
+
+        with pytest.raises(sim_usb.core.USBError) as er:
+            device.read(0x81, 0x20, 10)
+        assert er.value.errno == 110
+        for _ in range(5):
+            try:
+                device.read(0x81, 0x20, 10)
+            except sim_usb.core.USBError:
+                pass
+        assert device.timeouts == 5 and device.count == 1  # 5 timeouts of 10 ms, then the report
+
+    @staticmethod
+    def test_injected_errors_and_end_of_stream():
+        device = virtual_device(error_probability=1.0, error_errno=5)
+        with pytest.raises(sim_usb.core.USBError) as er:
+            device.read(0x81, 0x20, 10)
+        assert er.value.errno == 5
+
+        device = virtual_device(reports=1)
+        device.read(0x81, 0x20, 10)
+        with pytest.raises(sim_usb.core.USBError) as er:
+            device.read(0x81, 0x20, 10)
+        assert er.value.errno == 19
+        sim_usb.util.dispose_resources(device)
+
+    @staticmethod
+    def test_realtime_stream_at_several_khz():
+        device = sim_usb.core.Device(rate=5000, burst=5, seed=1)
+        for _ in range(250):
+            device.read(0x81, 0x20, 10)
+
+        assert device._now() - device._start == pytest.approx(0.05e9, rel=0.5)
+
+
+class TestSimulatedPipeline:
+    @staticmethod
+    def test_mouse_decodes_every_report_of_the_stream(mocker):
+        device = virtual_device(rate=8000, jitter=0.0002, burst=8, gap_probability=0.01, reports=5000)
+        mocker.patch.object(stub_usb.core, 'find', return_value=device)
+        mocker.patch.object(stub_usb.core, 'USBError', sim_usb.core.USBError)
+        ct = Sm.SpaceMouseProWireless()
+
+        with pytest.raises(sim_usb.core.USBError):
+            while True:
+                ct.get_interrupt_msg()
+
+        assert ct.stats.timeouts == device.timeouts > 0
+        assert ct.stats.reports[1] == device.sent[1]
+        assert ct.stats.reports[3] == device.sent[3]
+
+    @staticmethod
+    def test_stream_continues_across_reconnects_after_injected_errors(mocker, tmp_path):
+        device = sim_usb.core.configure(realtime=False, seed=3, error_probability=0.01)
+        mocker.patch.object(stub_usb.core, 'find', sim_usb.core.find)
+        mocker.patch.object(stub_usb.core, 'USBError', sim_usb.core.USBError)
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', str(tmp_path))  # sysfs of a host without receiver
+        ct = Sm.SpaceMouseProWireless(device_cache=Udc.DeviceCache())
+        ct.reconnectPolicy = ReconnectPolicy(initial_delay=0)
+
+        for _ in range(2000):
+            ct.get_interrupt_msg()
+
+        assert ct._dev is device
+        assert device.errors > 0 and ct.stats.reconnects == device.errors
+        assert device.count == 2000 - device.errors
+        sim_usb.core.configure()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
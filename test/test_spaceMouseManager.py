@@ -0,0 +1,153 @@
+"""
+USB-package is replaced with a stub before this file is loaded, in conftest.py.
+"""
+
+import pytest
+import sys
+import array
+import asyncio
+
+import spaceMouseManager as Smm
+import stub_usb.core
+import usbDeviceCache as Udc
+from reconnectPolicy import ReconnectPolicy
+
+
+def device_with_msg(msg):
+    device = stub_usb.core.Device()
+    device.read = lambda address, length, timeout: array.array('i', msg)
+    return device
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def manager(mocker):
+    # Three receivers, each sending its own button.
+    devices = [device_with_msg([3, 0, 0, 0, 1 << i]) for i in range(3)]
+    mocker.patch.object(
+        stub_usb.core,
+        'find',
+        side_effect=lambda **kwargs: iter(devices)
+    )
+    manager = Smm.SpaceMouseManager()
+    yield manager
+    manager.stop()
+
+
+class TestSpaceMouseManager:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_no_receiver_found_raises_value_error(mocker):
+        mocker.patch.object(
+            stub_usb.core,
+            'find',
+            return_value=iter([])
+        )
+
+        with pytest.raises(ValueError):
+            Smm.SpaceMouseManager()
+
+    @staticmethod
+    def test_one_instance_per_receiver(manager):
+        assert len(manager) == 3
+        assert len({id(mouse._dev) for mouse in manager.mice}) == 3
+
+    @staticmethod
+    def test_merged_reports_tagged_with_device_and_in_time_order(manager):
+        manager.start(capacity=16)
+        seen = set()
+        reports = []
+        while len(seen) < 3:
+            for index, report in manager.wait_reports(timeout=1):
+                seen.add(index)
+                reports.append((index, report))
+
+        for index, report in reports:
+            assert report.buttons == 1 << index
+        timestamps = [report.timestamp for index, report in manager.get_reports()]
+        assert timestamps == sorted(timestamps)
+
+    @staticmethod
+    def test_device_reports_only_of_that_device(manager):
+        manager.start(capacity=16)
+        reports = []
+        while not reports:
+            reports = manager.get_device_reports(2)
+
+        assert {report.buttons for report in reports} == {4}
+
+    @staticmethod
+    def test_async_events_merge_all_devices(manager):
+        manager.start(capacity=16)
+
+        async def devices_seen():
+            seen = set()
+            async for index, report in manager.events():
+                seen.add(index)
+                if len(seen) == 3:
+                    return seen
+
+        assert asyncio.run(asyncio.wait_for(devices_seen(), 5)) == {0, 1, 2}
+
+    @staticmethod
+    def test_failed_receiver_is_reported_others_keep_reporting(manager):
+        def unplugged(address, length, timeout):
+            raise stub_usb.core.USBError('No such device', errno=19)
+        manager.mice[1]._dev.read = unplugged
+        manager.start(capacity=16)
+        seen = set()
+        while len(seen) < 2 or 1 not in manager.failed:
+            seen.update(index for index, report in manager.wait_reports(timeout=1))
+
+        assert seen == {0, 2}
+        assert manager.failed[1].errno == 19
+        assert manager.get_reports() is not None  # no raise while receivers 0 and 2 still read
+
+    @staticmethod
+    def test_all_receivers_failed_raises(manager):
+        def unplugged(address, length, timeout):
+            raise stub_usb.core.USBError('No such device', errno=19)
+        for mouse in manager.mice:
+            mouse._dev.read = unplugged
+        manager.start(capacity=16)
+
+        with pytest.raises(stub_usb.core.USBError):
+            while True:
+                manager.wait_reports(timeout=1)
+
+
+class TestReconnect:
+    @staticmethod
+    def test_receiver_reconnects_at_its_own_usb_path(mocker):
+        def unplugged(address, length, timeout):
+            raise stub_usb.core.USBError('No such device', errno=19)
+
+        def find(find_all=False, bus=None, custom_match=None, **kwargs):
+            matching = [device for device in devices
+                        if (bus is None or device.bus == bus) and (custom_match is None or custom_match(device))]
+            if find_all:
+                return iter(matching)
+            return matching[0] if matching else None
+
+        devices = [device_with_msg([3, 0, 0, 0, 1 << i]) for i in range(2)]
+        for port, device in enumerate(devices):
+            device.port_numbers = (port + 1,)
+        mocker.patch.object(stub_usb.core, 'find', side_effect=find)
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', '/nonexistent')
+        manager = Smm.SpaceMouseManager()
+        deviceA, deviceB = devices
+
+        deviceA.read = unplugged
+        replugged = device_with_msg([3, 0, 0, 0, 1])
+        replugged.port_numbers = (1,)
+        devices[0] = replugged
+        manager.mice[0].reconnectPolicy = ReconnectPolicy(initial_delay=0)
+        manager.mice[0].get_interrupt_msg()
+
+        assert manager.mice[0]._dev is replugged  # not receiver B, the most recently cached one
+        assert manager.mice[1]._dev is deviceB
+        assert manager.mice[0].portPath == (1, (1,))
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
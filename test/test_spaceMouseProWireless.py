@@ -7,12 +7,22 @@ This allows for less fixtures and mocking, and also correct handling of (stubbed
 disposal without headaches.
 """
 
+import asyncio
+import json
 import pytest
 import sys
 import array
 
 import spaceMouseProWireless as Sm
 import stub_usb.core
+from reportCapture import ReportCapture
+from signalConditioning import Pipeline, Deadzone, ExponentialSmoothing
+from poseIntegrator import PoseIntegrator
+from deviceProfiles import SPACE_NAVIGATOR
+from gestureEngine import GestureEngine, CHORD, LONG_PRESS, TAP, DOUBLE_TAP
+from frameHistory import FrameHistory
+from usbDeviceCache import DeviceCache
+from reconnectPolicy import ReconnectPolicy
 
 # ===================== File-wide Fixtures =================================
 @pytest.fixture(scope='function')
@@ -375,6 +385,25 @@ class TestButtonsAndJoystick:
             else:
                 assert mock_ct.paramDict[key] is False
 
+    @staticmethod
+    def test_param_dict_is_a_plain_dict_following_the_reports(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [3, 0, 0, 0, 1])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        assert [mock_ct.paramDict[key] for key in mock_ct.paramKeyList[:6]] == [5, 0, 0, 0, 0, 0]
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+
+        assert type(mock_ct.paramDict) is dict
+        assert json.loads(json.dumps(mock_ct.paramDict))['x'] == 7
+        assert mock_ct.paramDict['shift'] is True
+
 
 class TestUsbMessageHandling:
     @staticmethod
@@ -413,6 +442,40 @@ class TestUsbMessageHandling:
         for key in mock_ct.paramKeyList:
             assert previousDict[key] == mock_ct.paramDict[key]
 
+    @staticmethod
+    def test_pyusb_reads_into_one_reused_buffer(mocker, mock_ct):
+        reports = [bytes([1, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00]),
+                   bytes([3, 0x00, 0x00, 0x40, 0x00])]
+
+        def read_into(address, buffer, timeout):
+            report = reports.pop(0)
+            buffer[:len(report)] = array.array('B', report)
+            return len(report)
+
+        read = mocker.patch.object(stub_usb.core.Device, 'read', side_effect=read_into)
+
+        mock_ct.get_interrupt_msg()
+        assert mock_ct.paramDict['x'] == -90
+        assert mock_ct.paramDict['yaw'] == -90
+
+        mock_ct.get_interrupt_msg()
+        assert mock_ct.state.is_pressed('escape')
+        assert read.call_args_list[0].args[1] is read.call_args_list[1].args[1]
+
+    @staticmethod
+    def test_bytes_of_a_longer_previous_report_are_not_decoded(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00]),
+                         array.array('i', [1, 0x10, 0x00])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+
+        assert tuple(mock_ct.state.axes) == (16, 0, 0, 0, 0, 0)
+
     @staticmethod
     def test_usb_msg_type_0_raises_value_error(mocker, mock_ct):
         msg = array.array('i', [0, 0])
@@ -445,5 +508,611 @@ class TestUsbMessageHandling:
         assert mock_ct.paramDict['front'] is True
 
 
+class TestReaderThread:
+    @staticmethod
+    def test_get_report_without_reader_raises_runtime_error(mock_ct):
+        with pytest.raises(RuntimeError):
+            mock_ct.get_report()
+
+    @staticmethod
+    def test_reader_decodes_reports_into_buffer(mocker, mock_ct):
+        # Joystick message with all axes -90 deg.
+        msg = array.array('i', [1, 0xA6, 0xFF, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00, 0x5A, 0x00])
+
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=msg
+        )
+
+        mock_ct.start_reader(capacity=8)
+        report = None
+        while report is None:
+            report = mock_ct.get_report()
+        mock_ct.stop_reader()
+
+        assert report.msg_type == 1
+        assert report.axes == (-90,) * 6
+        assert mock_ct.paramDict['x'] == -90
+
+    @staticmethod
+    def test_reader_usb_error_is_raised_to_consumer(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=stub_usb.core.USBError('Undefined USB Error')
+        )
+
+        mock_ct.start_reader()
+        mock_ct._readerThread.join()
+
+        with pytest.raises(stub_usb.core.USBError):
+            mock_ct.get_reports()
+
+    @staticmethod
+    def test_latest_backpressure_keeps_button_edges_and_newest_joystick(mocker, mock_ct):
+        joystick = [array.array('i', [1, i, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]) for i in range(1, 6)]
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=joystick[:2] + [array.array('i', [3, 1, 0, 0, 0]), array.array('i', [3, 0, 0, 0, 0])]
+                        + joystick[2:] + [stub_usb.core.USBError('Undefined USB Error')]
+        )
+
+        mock_ct.start_reader(capacity=8, backpressure='latest')
+        mock_ct._readerThread.join()
+        reports = mock_ct.get_reports()
+
+        assert [(report.msg_type, bool(report.buttons)) for report in reports] == [(3, True), (3, False), (1, False)]
+        assert reports[-1].axes[0] == 5
+        assert mock_ct.get_buffer_stats() == dict(queued=0, overflows=0, coalesced=4)
+
+    @staticmethod
+    def test_reader_with_several_transfers_reads_from_transfer_queue(mocker, mock_ct):
+        transferQueue = mocker.MagicMock()
+        transferQueue.read.side_effect = [array.array('i', [1, 7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                                          stub_usb.core.USBError('Undefined USB Error')]
+        opened = mocker.patch.object(Sm, 'open_transfer_queue', return_value=transferQueue)
+        read = mocker.patch.object(stub_usb.core.Device, 'read')
+
+        mock_ct.start_reader(transfers=4)
+        mock_ct._readerThread.join()
+
+        assert opened.call_args.args[1:] == (0x81, 0x20, 4)
+        assert mock_ct.get_reports()[0].axes[0] == 7
+        assert not read.called
+        transferQueue.close.assert_called_once()
+
+    @staticmethod
+    def test_unknown_backpressure_raises_value_error(mock_ct):
+        with pytest.raises(ValueError):
+            mock_ct.start_reader(backpressure='drop')
+
+
+class TestAsyncEvents:
+    @staticmethod
+    def test_events_yields_decoded_reports(mocker, mock_ct):
+        # "Shift" button pressed.
+        msg = array.array('i', [3, 0, 0, 0, 1])
+
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=msg
+        )
+
+        async def first_reports(count):
+            reports = []
+            async for report in mock_ct.events():
+                reports.append(report)
+                if len(reports) == count:
+                    break
+            return reports
+
+        reports = asyncio.run(first_reports(3))
+        mock_ct.stop_reader()
+
+        assert [report.msg_type for report in reports] == [3, 3, 3]
+        assert reports[0].buttons == 1
+        assert mock_ct._reportListeners == []
+
+    @staticmethod
+    def test_events_reader_usb_error_is_raised(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=stub_usb.core.USBError('Undefined USB Error')
+        )
+
+        async def consume():
+            async for report in mock_ct.events():
+                pass
+
+        with pytest.raises(stub_usb.core.USBError):
+            asyncio.run(asyncio.wait_for(consume(), 5))
+
+
+class TestButtonEdges:
+    @staticmethod
+    def test_button_edges_no_change_returns_empty_tuples():
+        assert Sm.button_edges(0x30000000, 0x30000000) == ((), ())
+
+    @staticmethod
+    def test_button_edges_reports_pressed_and_released_names():
+        # "Front, Right" pressed -> "Front, Shift" pressed
+        pressed, released = Sm.button_edges(0x30000000, 0x20000001)
+
+        assert pressed == ('shift',)
+        assert released == ('right',)
+
+    @staticmethod
+    def test_button_edges_ignores_unmapped_bits():
+        assert Sm.button_edges(0, 0x40000000) == ((), ())
+
+    @staticmethod
+    def test_button_report_sets_edges_of_report(mocker, mock_ct):
+        # "Front, Right" buttons pressed, then right released.
+        for msg, pressed, released in [([0x3, 0b00110000, 0, 0, 0], {'front', 'right'}, set()),
+                                       ([0x3, 0b00100000, 0, 0, 0], set(), {'right'}),
+                                       ([0x1, 0, 0, 250, 0, 0, 0, 0, 0, 0, 0, 0, 0], set(), set()),
+                                       ([0x3, 0, 0, 0, 0], set(), {'front'})]:
+            mocker.patch.object(
+                stub_usb.core.Device,
+                'read',
+                return_value=array.array('i', msg)
+            )
+
+            mock_ct.get_interrupt_msg()
+
+            assert set(mock_ct.buttonsPressed) == pressed
+            assert set(mock_ct.buttonsReleased) == released
+
+
+class TestState:
+    @staticmethod
+    def test_joystick_msg_writes_state_in_param_key_list_order(mocker, mock_ct):
+        # pitch (bytes 7-8) = -1, roll (bytes 9-10) = -2 after sign inversion
+        msg = array.array('i', [1, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0])
+
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=msg
+        )
+
+        mock_ct.get_interrupt_msg()
+
+        assert mock_ct.state.valid is True
+        assert list(mock_ct.state.axes) == [0, 0, 0, -2, -1, 0]
+        assert mock_ct.paramDict['roll'] == -2
+
+    @staticmethod
+    def test_button_msg_writes_bit_register_to_state(mocker, mock_ct):
+        msg = array.array('i', [0x3, 0b00110000, 0, 0, 0])
+
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=msg
+        )
+
+        mock_ct.get_interrupt_msg()
+
+        assert mock_ct.state.buttons == Sm.BUTTON_MASKS['front'] | Sm.BUTTON_MASKS['right']
+
+
+class TestSubscribe:
+    @staticmethod
+    def feed(mocker, mock_ct, msg):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=array.array('i', msg)
+        )
+        mock_ct.get_interrupt_msg()
+
+    @staticmethod
+    def test_button_subscriber_called_only_when_its_button_changes(mocker, mock_ct):
+        calls = []
+        mock_ct.subscribe(lambda state, axes, buttons: calls.append(state.is_pressed('escape')), buttons=['escape'])
+
+        TestSubscribe.feed(mocker, mock_ct, [0x3, 0b00110000, 0, 0, 0])  # front, right
+        TestSubscribe.feed(mocker, mock_ct, [1, 0, 0, 250, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        TestSubscribe.feed(mocker, mock_ct, [0x3, 0, 0, 0b01000000, 0])  # escape
+        TestSubscribe.feed(mocker, mock_ct, [0x3, 0, 0, 0b01000000, 0])  # escape held
+        TestSubscribe.feed(mocker, mock_ct, [0x3, 0, 0, 0, 0])
+
+        assert calls == [True, False]
+
+    @staticmethod
+    def test_axis_subscriber_receives_changed_axes_mask(mocker, mock_ct):
+        calls = []
+        mock_ct.subscribe(lambda state, axes, buttons: calls.append(axes), axes=['y', 'yaw'])
+
+        TestSubscribe.feed(mocker, mock_ct, [1, 0, 0, 250, 0, 0, 0, 0, 0, 0, 0, 0, 0])  # y
+        TestSubscribe.feed(mocker, mock_ct, [1, 0, 0, 250, 0, 1, 0, 0, 0, 0, 0, 0, 0])  # z only
+        TestSubscribe.feed(mocker, mock_ct, [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])  # released
+
+        assert calls == [Sm.AXIS_MASKS['y'], Sm.AXIS_MASKS['y'] | Sm.AXIS_MASKS['z']]
+
+    @staticmethod
+    def test_subscriber_without_selection_gets_every_change(mocker, mock_ct):
+        calls = []
+        mock_ct.subscribe(lambda state, axes, buttons: calls.append((axes, buttons)))
+
+        TestSubscribe.feed(mocker, mock_ct, [1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        TestSubscribe.feed(mocker, mock_ct, [0x3, 0, 0, 0, 1])
+        TestSubscribe.feed(mocker, mock_ct, [23])
+
+        assert calls == [(Sm.AXIS_MASKS['x'], 0), (0, Sm.BUTTON_MASKS['shift'])]
+
+    @staticmethod
+    def test_unsubscribed_callback_not_called(mocker, mock_ct):
+        calls = []
+        subscription = mock_ct.subscribe(lambda state, axes, buttons: calls.append(axes))
+        mock_ct.unsubscribe(subscription)
+
+        TestSubscribe.feed(mocker, mock_ct, [1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+
+        assert calls == []
+
+
+class TestRecording:
+    @staticmethod
+    def test_read_reports_are_recorded(mocker, mock_ct, tmp_path):
+        msg = array.array('i', [0x3, 0b00110000, 0, 0, 0])
+
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=msg
+        )
+
+        path = str(tmp_path / 'session.smcap')
+        mock_ct.start_recording(path)
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        mock_ct.stop_recording()
+        mock_ct.get_interrupt_msg()
+
+        with ReportCapture(path) as capture:
+            assert [bytes(report) for timestamp, report in capture] == [bytes(msg.tolist())] * 2
+            assert capture[0][0] <= capture[1][0]
+
+
+class TestStatistics:
+    @staticmethod
+    def test_timeouts_and_reports_are_counted(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[stub_usb.core.USBError('Timeout', errno=110),
+                         array.array('i', [1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [3, 0, 0, 0, 0]),
+                         array.array('i', [0, 0])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        with pytest.raises(ValueError):
+            mock_ct.get_interrupt_msg()
+
+        snapshot = mock_ct.stats.snapshot()
+        assert snapshot['timeouts'] == 1
+        assert snapshot['reports'][1] == 1
+        assert snapshot['reports'][3] == 1
+        assert snapshot['unknown'] == 1
+        assert snapshot['decode_latency']['count'] == 3
+
+
+class TestReadTimeout:
+    @staticmethod
+    def test_inactivity_msg_sets_idle_timeout_for_next_read(mocker, mock_ct):
+        mock_ct.readPolicy = Sm.ReadTimeoutPolicy(idle_timeout=500)
+        read = mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=array.array('i', [23, 0, 0, 0, 0])
+        )
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+
+        assert [call.args[2] for call in read.call_args_list] == [10, 500]
+
+
+class TestConditioning:
+    @staticmethod
+    def test_conditioned_axes_are_ready_for_subscribers_raw_state_unchanged(mocker, mock_ct):
+        mock_ct.conditioning = Pipeline(Deadzone(10))
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=array.array('i', [1, 30, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        )
+        seen = []
+        mock_ct.subscribe(lambda state, changedAxes, changedButtons: seen.append(list(mock_ct.conditionedAxes)))
+
+        mock_ct.get_interrupt_msg()
+
+        assert seen == [[20.0, 0.0, 0.0, 0.0, 0.0, 0.0]]
+        assert mock_ct.state.x == 30
+
+    @staticmethod
+    def test_release_resets_conditioning(mocker, mock_ct):
+        mock_ct.conditioning = Pipeline(ExponentialSmoothing(0.5))
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 100, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 40, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        assert mock_ct.conditionedAxes == [0.0] * 6
+
+        mock_ct.get_interrupt_msg()
+        assert mock_ct.conditionedAxes[0] == 40
+
+    @staticmethod
+    def test_all_consumers_get_the_conditioned_stream(mocker, mock_ct):
+        mock_ct.conditioning = Pipeline(ExponentialSmoothing(0.5))
+        mock_ct.history = FrameHistory(8)
+        mock_ct.start_reader(capacity=8)
+        mock_ct.stop_reader()
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 100, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 20, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 20, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [3, 0, 0, 0, 1])]
+        )
+        seen = []
+        mock_ct.subscribe(lambda state, changedAxes, changedButtons: seen.append(state.x), axes=['x'])
+
+        for _ in range(4):
+            mock_ct.get_interrupt_msg()
+
+        assert seen == [100, 60, 40]  # third report: raw x unchanged, conditioned x still moving
+        assert [report.axes[0] for report in mock_ct.get_reports()] == [100, 60, 40, 40]
+        assert list(mock_ct.history.since_sequence(0).axes[::6]) == [100, 60, 40, 40]
+        assert mock_ct.publishedState.buttons == 1
+        assert mock_ct.state.x == 20
+
+
+class TestPoseIntegration:
+    @staticmethod
+    def test_attached_integrator_uses_report_timestamps(mocker, mock_ct):
+        integrator = PoseIntegrator(translation_scale=1.0)
+        integrator.attach(mock_ct)
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        start = mock_ct.timestamp
+        mock_ct.get_interrupt_msg()
+        end = mock_ct.timestamp
+        pose = integrator.advance(end + 1_000_000_000)
+        integrator.detach()
+
+        assert pose.position[0] == pytest.approx(2 * (end - start) * 1e-9)
+
+
+class TestGestures:
+    @staticmethod
+    def test_attached_engine_recognizes_chord_and_device_long_press(mocker, mock_ct):
+        engine = GestureEngine()
+        engine.attach(mock_ct)
+        gestures = []
+        engine.bind(CHORD, ['shift', 'escape'], gestures.append)
+        engine.bind(LONG_PRESS, ['shift', 'escape'], gestures.append)
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [3, 0, 0, 0, 1]),  # shift
+                         array.array('i', [3, 0, 0, 0x40, 1]),  # shift + escape
+                         array.array('i', [22, 0, 0, 0, 0])]
+        )
+
+        for _ in range(3):
+            mock_ct.get_interrupt_msg()
+        engine.detach()
+
+        assert [gesture.kind for gesture in gestures] == [CHORD, LONG_PRESS]
+        assert mock_ct.gestures is None
+
+
+class TestHistory:
+    @staticmethod
+    def test_decoded_reports_are_appended_as_frames(mocker, mock_ct):
+        mock_ct.history = FrameHistory(8)
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [3, 0, 0, 0, 1])]
+        )
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        window = mock_ct.history.since_sequence(0)
+
+        assert len(window) == 2
+        assert window.axes[0] == 2
+        assert window.buttons[1] == mock_ct.state.buttons
+        assert window.timestamps[1] == mock_ct.timestamp
+
+
+class TestDeviceProfiles:
+    @staticmethod
+    def test_separate_translation_and_rotation_reports(mocker):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 1, 0, 2, 0, 3, 0]),
+                         array.array('i', [2, 4, 0, 5, 0, 6, 0]),
+                         array.array('i', [3, 0b01]),
+                         array.array('i', [1, 0, 0, 0, 0, 0, 0])]
+        )
+        ct = Sm.SpaceMouseProWireless(0x046d, 0xc626)
+
+        for _ in range(3):
+            assert ct.get_interrupt_msg() == 0
+
+        assert ct.profile is SPACE_NAVIGATOR
+        assert tuple(ct.state.axes) == (1, -2, -3, -5, -4, -6)
+        assert ct.buttonsPressed == ('menu',)
+
+        ct.get_interrupt_msg()  # translation released, rotation still held
+        assert tuple(ct.state.axes) == (0, 0, 0, -5, -4, -6)
+        assert ct.state.valid
+
+    @staticmethod
+    def test_message_type_not_in_profile_raises_value_error(mocker):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            return_value=array.array('i', [22, 0, 0, 0, 0])
+        )
+        ct = Sm.SpaceMouseProWireless(0x046d, 0xc626)
+
+        with pytest.raises(ValueError):
+            ct.get_interrupt_msg()
+
+
+class TestConnect:
+    @staticmethod
+    def test_endpoint_descriptors_used_for_reads(mocker):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'get_active_configuration',
+            return_value={(0, 0): [stub_usb.core.Endpoint(0x82, 0x40)]}
+        )
+        read = mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=stub_usb.core.USBError('Timeout', errno=110)
+        )
+
+        ct = Sm.SpaceMouseProWireless(device_cache=DeviceCache())
+        ct.get_interrupt_msg()
+
+        assert read.call_args.args[0] == 0x82
+        assert len(read.call_args.args[1]) == 0x40  # read buffer of wMaxPacketSize
+
+    @staticmethod
+    def test_connect_timeout_waits_for_device(mocker):
+        wait = mocker.patch.object(
+            DeviceCache,
+            'wait',
+            return_value=(None, None)
+        )
+
+        with pytest.raises(ValueError):
+            Sm.SpaceMouseProWireless(connect_timeout=0.5)
+        assert wait.call_args.args[2] == 0.5
+
+
+class TestReconnect:
+    @staticmethod
+    def test_usb_error_with_reconnect_policy_reconnects_and_releases_state(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [1, 0, 0, 250, 0, 0, 0, 0, 0, 0, 0, 0, 0]),
+                         array.array('i', [0x3, 0b00110000, 0, 0, 0]),
+                         stub_usb.core.USBError('No such device', errno=19),
+                         array.array('i', [0x3, 0b00100000, 0, 0, 0])]
+        )
+        dispose = mocker.patch.object(Sm.usb.util, 'dispose_resources')
+        mock_ct.reconnectPolicy = ReconnectPolicy(initial_delay=0)
+        oldDev = mock_ct._dev
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+        ret = mock_ct.get_interrupt_msg()
+
+        assert ret == 1
+        dispose.assert_called_once_with(oldDev)
+        assert mock_ct._dev is not oldDev
+        for key in mock_ct.paramKeyList[:6]:
+            assert mock_ct.paramDict[key] is None
+        for key in mock_ct.paramKeyList[6:]:
+            assert mock_ct.paramDict[key] is False
+        snapshot = mock_ct.stats.snapshot()
+        assert snapshot['usb_errors'] == 1
+        assert snapshot['reconnects'] == 1
+        assert snapshot['recovery_time']['count'] == 1
+
+        # Reading continues on the new device
+        mock_ct.get_interrupt_msg()
+        assert mock_ct.paramDict['front'] is True
+
+    @staticmethod
+    def test_reconnect_gives_up_and_raises_usb_error(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=stub_usb.core.USBError('No such device', errno=19)
+        )
+        mocker.patch.object(
+            stub_usb.core,
+            'find',
+            return_value=None
+        )
+        mock_ct.reconnectPolicy = ReconnectPolicy(initial_delay=0.001, max_delay=0.01, give_up_after=0.05)
+
+        with pytest.raises(stub_usb.core.USBError):
+            mock_ct.get_interrupt_msg()
+        assert mock_ct.stats.reconnects == 0
+
+    @staticmethod
+    def test_reconnect_notifies_subscribers_of_released_fields(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [0x3, 0b00110000, 0, 0, 0]),
+                         stub_usb.core.USBError('No such device', errno=19)]
+        )
+        mock_ct.reconnectPolicy = ReconnectPolicy(initial_delay=0)
+        calls = []
+        mock_ct.subscribe(lambda state, axes, buttons: calls.append(buttons), buttons=['front'])
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+
+        assert len(calls) == 2
+        assert mock_ct.state.buttons == 0
+
+    @staticmethod
+    def test_reconnect_release_fires_no_gesture(mocker, mock_ct):
+        mocker.patch.object(
+            stub_usb.core.Device,
+            'read',
+            side_effect=[array.array('i', [0x3, 0b00100000, 0, 0, 0]),  # front
+                         stub_usb.core.USBError('No such device', errno=19)]
+        )
+        mock_ct.reconnectPolicy = ReconnectPolicy(initial_delay=0)
+        engine = GestureEngine()
+        engine.attach(mock_ct)
+        gestures = []
+        for kind in (TAP, DOUBLE_TAP, LONG_PRESS):
+            engine.bind(kind, ['front'], gestures.append)
+
+        mock_ct.get_interrupt_msg()
+        mock_ct.get_interrupt_msg()
+
+        assert mock_ct.state.buttons == 0
+        assert gestures == []
+
+
 if __name__ == '__main__':
     sys.exit(pytest.main())
@@ -0,0 +1,48 @@
+import pytest
+import sys
+
+from spaceMouseState import *
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def state():
+    return SpaceMouseState()
+
+
+class TestSpaceMouseState:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_new_state_is_released(state):
+        assert state.valid is False
+        assert list(state.axes) == [0] * 6
+        assert state.buttons == 0
+
+    @staticmethod
+    def test_attribute_and_index_access_return_same_axis(state):
+        state.axes[4] = -12
+
+        assert state.pitch == -12
+        assert state[4] == -12
+        assert len(state) == 6
+
+    @staticmethod
+    def test_axes_are_int16(state):
+        with pytest.raises(OverflowError):
+            state.axes[0] = 32768
+
+    @staticmethod
+    def test_is_pressed_reads_button_mask(state):
+        state.buttons = BUTTON_MASKS['escape']
+
+        assert state.is_pressed('escape')
+        assert not state.is_pressed('shift')
+
+    @staticmethod
+    def test_state_has_no_instance_dict(state):
+        with pytest.raises(AttributeError):
+            state.other = 1
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,94 @@
+import pytest
+import sys
+import time
+
+from streamServer import *
+from spaceMouseState import SpaceMouseState, BUTTON_MASKS
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def mouse(mocker):
+    mouse = mocker.Mock()
+    mouse.state = SpaceMouseState()
+    mouse.timestamp = 0
+    return mouse
+
+
+@pytest.fixture(scope='function', params=['unix', 'udp'])
+def server(request, mouse, tmp_path):
+    address = str(tmp_path / 'server.sock') if request.param == 'unix' else ('127.0.0.1', 0)
+    server = SpaceMouseStreamServer(mouse, address)
+    if request.param == 'udp':
+        server.address = server._sock.getsockname()  # port chosen by the system
+    server.start()
+    yield server
+    server.stop()
+
+
+def wait_for_subscribers(server, count):
+    deadline = time.monotonic() + 5
+    while len(server.subscribers) < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestStreamServer:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_frame_is_28_bytes():
+        assert FRAME.size == 28
+
+    @staticmethod
+    def test_server_subscribes_to_mouse_state_changes(mouse, server):
+        assert mouse.subscribe.call_args.args[0] == server.broadcast
+
+    @staticmethod
+    def test_subscribed_client_receives_state(mouse, server):
+        with SpaceMouseStreamClient(server.address) as client:
+            wait_for_subscribers(server, 1)
+            mouse.state.axes[0] = -90
+            mouse.state.axes[5] = 350
+            mouse.state.buttons = BUTTON_MASKS['shift']
+            mouse.timestamp = 1234
+
+            server.broadcast(mouse.state)
+
+            assert client.receive(timeout=5)
+            assert list(client.axes) == [-90, 0, 0, 0, 0, 350]
+            assert client.buttons == BUTTON_MASKS['shift']
+            assert client.sequence == 1
+            assert client.timestamp == 1234  # arrival of the report
+
+    @staticmethod
+    def test_client_reuses_buffer_for_every_frame(mouse, server):
+        with SpaceMouseStreamClient(server.address) as client:
+            wait_for_subscribers(server, 1)
+            axes = client.axes
+
+            server.broadcast(mouse.state)
+            server.broadcast(mouse.state)
+            client.receive(timeout=5)
+            client.receive(timeout=5)
+
+            assert client.axes is axes
+            assert client.sequence == 2
+
+    @staticmethod
+    def test_closed_client_unsubscribes(server):
+        client = SpaceMouseStreamClient(server.address)
+        wait_for_subscribers(server, 1)
+        client.close()
+
+        deadline = time.monotonic() + 5
+        while server.subscribers and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert not server.subscribers
+
+    @staticmethod
+    def test_receive_timeout_returns_false(server):
+        with SpaceMouseStreamClient(server.address) as client:
+            assert client.receive(timeout=0.01) is False
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,131 @@
+"""
+USB-package is replaced with a stub before this file is loaded, in conftest.py.
+"""
+
+import pytest
+import sys
+
+import usbDeviceCache as Udc
+import stub_usb.core
+
+
+# ===================== File-wide Fixtures =================================
+@pytest.fixture(scope='function')
+def cache(mocker):
+    mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', '/nonexistent')  # no sysfs, always ask usb
+    return Udc.DeviceCache()
+
+
+class TestDeviceCache:
+    # ===================== Tests ==========================================
+    @staticmethod
+    def test_first_find_caches_path_and_endpoint(cache):
+        device, path = cache.find(0x256f, 0xc652)
+
+        assert device is not None
+        assert path == Udc.DevicePath(1, (2,), 0x81, 0x20)
+        assert cache.get(0x256f, 0xc652) == path
+
+    @staticmethod
+    def test_cached_path_used_for_next_find(mocker, cache):
+        cache.find(0x256f, 0xc652)
+        find = mocker.spy(stub_usb.core, 'find')
+
+        cache.find(0x256f, 0xc652)
+
+        find.assert_called_once()
+        assert find.call_args.kwargs['bus'] == 1
+        assert find.call_args.kwargs['custom_match'](stub_usb.core.Device())
+
+    @staticmethod
+    def test_device_not_found_returns_none(mocker, cache):
+        mocker.patch.object(
+            stub_usb.core,
+            'find',
+            return_value=None
+        )
+
+        assert cache.find(0x256f, 0xc652) == (None, None)
+
+    @staticmethod
+    def test_cache_file_survives_restart(tmp_path, mocker):
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', '/nonexistent')
+        path = str(tmp_path / 'devices.json')
+        Udc.DeviceCache(path).find(0x256f, 0xc652)
+
+        assert Udc.DeviceCache(path).get(0x256f, 0xc652) == Udc.DevicePath(1, (2,), 0x81, 0x20)
+
+    @staticmethod
+    def test_cache_file_keeps_every_path(tmp_path, mocker):
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', '/nonexistent')
+        path = str(tmp_path / 'devices.json')
+        cache = Udc.DeviceCache(path)
+        for port in (1, 2):
+            device = stub_usb.core.Device()
+            device.port_numbers = (port,)
+            cache.remember(0x256f, 0xc652, device)
+
+        restarted = Udc.DeviceCache(path)
+        assert restarted.get(0x256f, 0xc652, (1, (1,))).port_numbers == (1,)
+        assert restarted.get(0x256f, 0xc652).port_numbers == (2,)  # most recently found
+
+    @staticmethod
+    def test_cache_file_with_one_path_per_ids_is_read(tmp_path):
+        path = tmp_path / 'devices.json'
+        path.write_text('{"256f:c652": [1, [2], 129, 32]}')
+
+        assert Udc.DeviceCache(str(path)).get(0x256f, 0xc652) == Udc.DevicePath(1, (2,), 0x81, 0x20)
+
+    @staticmethod
+    def test_find_with_port_path_only_matches_that_receiver(mocker, cache):
+        other = stub_usb.core.Device()
+        other.port_numbers = (3,)
+        mocker.patch.object(
+            stub_usb.core,
+            'find',
+            side_effect=lambda custom_match=None, **kwargs: other if custom_match is None or custom_match(other) else None
+        )
+
+        assert cache.find(0x256f, 0xc652, (1, (2,))) == (None, None)
+        assert cache.find(0x256f, 0xc652, (1, (3,)))[0] is other
+
+    @staticmethod
+    def test_missing_sysfs_entry_skips_cached_path_lookup(tmp_path, mocker, cache):
+        cache.find(0x256f, 0xc652)
+        mocker.patch.object(Udc, 'SYSFS_USB_DEVICES', str(tmp_path))  # sysfs without our device
+        find = mocker.spy(stub_usb.core, 'find')
+
+        cache.find(0x256f, 0xc652)
+
+        assert 'custom_match' not in find.call_args.kwargs
+
+    @staticmethod
+    def test_wait_returns_none_after_timeout(mocker, cache):
+        mocker.patch.object(
+            stub_usb.core,
+            'find',
+            return_value=None
+        )
+
+        assert cache.wait(0x256f, 0xc652, timeout=0.05, poll_interval=0.01) == (None, None)
+
+    @staticmethod
+    def test_wait_enumerates_only_after_usb_tree_changed(mocker, cache):
+        find = mocker.patch.object(
+            stub_usb.core,
+            'find',
+            return_value=None
+        )
+        mocker.patch.object(Udc, '_usb_tree_signature', return_value=(('001', 1),))
+
+        cache.wait(0x256f, 0xc652, timeout=0.05, poll_interval=0.01)
+
+        find.assert_called_once()
+
+    @staticmethod
+    def test_read_endpoint_falls_back_to_defaults():
+        assert Udc.read_endpoint(object()) == (Udc.DEFAULT_ENDPOINT, Udc.DEFAULT_PACKET_SIZE)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main())
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""
+Cache of resolved spacemouse receivers: interrupt endpoint descriptors per usb bus/port path, per vendor/product id.
+After the first discovery, reopening matches the receivers at their cached bus/port paths and takes the endpoint
+descriptors from the cache. A path can be given to find exactly that receiver.
+Limitation: pyusb can only open a device it enumerated, so opening a cached path still enumerates the usb devices.
+What the cache saves is the descriptor reads and, on Linux, the enumeration for a receiver that is not at its path
+(checked in sysfs first). Waiting for a receiver to arrive only enumerates again after the usb device tree changed
+(/dev/bus/usb).
+"""
+import collections
+import json
+import os
+import time
+
+import usb.core
+
+
+DevicePath = collections.namedtuple('DevicePath', ['bus', 'port_numbers', 'endpoint', 'packet_size'])
+
+SYSFS_USB_DEVICES = '/sys/bus/usb/devices'
+DEV_BUS_USB = '/dev/bus/usb'
+
+# Interrupt endpoint of the Spacemouse Pro Wireless, used if the descriptors cannot be read.
+DEFAULT_ENDPOINT = 0x81
+DEFAULT_PACKET_SIZE = 0x20
+
+
+######################################################################################################
+# Class
+######################################################################################################
+
+class DeviceCache:
+    def __init__(self, path=None):
+        """path: json file keeping the cache across restarts, in memory only if None."""
+        self.path = path
+
+        # PRIVATE VARIABLES
+        self._entries = {}  # (vendor, product): {(bus, port numbers): DevicePath}, most recently found last
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                for key, entries in json.load(file).items():
+                    vendor, product = (int(value, 16) for value in key.split(':'))
+                    if entries and not isinstance(entries[0], list):
+                        entries = [entries]  # cache files with one path per id pair
+                    paths = self._entries[(vendor, product)] = {}
+                    for bus, portNumbers, endpoint, packetSize in entries:
+                        paths[(bus, tuple(portNumbers))] = DevicePath(bus, tuple(portNumbers), endpoint, packetSize)
+
+    def get(self, vendor, product, port_path=None):
+        """Cached DevicePath of the receiver at port_path ((bus, port numbers)), the most recently found one if None.
+        None if not cached.
+        """
+        paths = self._entries.get((vendor, product))
+        if not paths:
+            return None
+        if port_path is None:
+            return next(reversed(paths.values()))
+        return paths.get((port_path[0], tuple(port_path[1])))
+
+    def find(self, vendor, product, port_path=None):
+        """Returns (device, DevicePath), (None, None) if not connected.
+        port_path: (bus, port numbers), only the receiver at this path is looked for (e.g. reconnecting one of several
+        receivers). None: any receiver, the cached paths are tried first.
+        """
+        if port_path is not None:
+            bus, portNumbers = port_path[0], tuple(port_path[1])
+            device = _find_at(vendor, product, bus, portNumbers)
+            if device is None:
+                return None, None
+            entry = self.get(vendor, product, (bus, portNumbers))
+            return device, self.remember(vendor, product, device) if entry is None else entry
+
+        for entry in reversed(list(self._entries.get((vendor, product), {}).values())):
+            device = _find_at(vendor, product, entry.bus, entry.port_numbers)
+            if device is not None:
+                return device, entry
+
+        device = usb.core.find(idVendor=vendor, idProduct=product)
+        if device is None:
+            return None, None
+        return device, self.remember(vendor, product, device)
+
+    def wait(self, vendor, product, timeout=None, poll_interval=0.1, port_path=None):
+        """Like find, but waits up to timeout s (None: forever) for the device to arrive.
+        The usb tree is stat-ed every poll_interval s, enumeration only happens once it changed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        signature = None
+
+        while True:
+            current = _usb_tree_signature()
+            if current is None or current != signature:  # no /dev/bus/usb: enumerate on each poll
+                signature = current
+                device, entry = self.find(vendor, product, port_path)
+                if device is not None:
+                    return device, entry
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return None, None
+            time.sleep(poll_interval if deadline is None else max(0, min(poll_interval, deadline - time.monotonic())))
+
+    def remember(self, vendor, product, device):
+        """Cache path and endpoint descriptors of a device found otherwise (e.g. by SpaceMouseManager).
+        Returns its DevicePath.
+        """
+        endpoint, packetSize = read_endpoint(device)
+        entry = DevicePath(device.bus, tuple(device.port_numbers or ()), endpoint, packetSize)
+        paths = self._entries.setdefault((vendor, product), {})
+        paths.pop((entry.bus, entry.port_numbers), None)  # most recently found last
+        paths[(entry.bus, entry.port_numbers)] = entry
+        self._save()
+        return entry
+
+    def forget(self, vendor, product, port_path=None):
+        """Drop the cached path port_path, all paths of the ids if None."""
+        if port_path is None:
+            self._entries.pop((vendor, product), None)
+        else:
+            self._entries.get((vendor, product), {}).pop((port_path[0], tuple(port_path[1])), None)
+        self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+        data = {'%04x:%04x' % key: [[entry.bus, list(entry.port_numbers), entry.endpoint, entry.packet_size]
+                                    for entry in paths.values()]
+                for key, paths in self._entries.items()}
+        with open(self.path, 'w') as file:
+            json.dump(data, file)
+
+
+# Shared by all SpaceMouseProWireless instances without own cache.
+DEFAULT_DEVICE_CACHE = DeviceCache()
+
+
+def read_endpoint(device):
+    """(endpoint address, max packet size) of the first endpoint of interface 0."""
+    try:
+        endpoint = device.get_active_configuration()[(0, 0)][0]
+        return endpoint.bEndpointAddress, endpoint.wMaxPacketSize
+    except (usb.core.USBError, LookupError, AttributeError, NotImplementedError):
+        return DEFAULT_ENDPOINT, DEFAULT_PACKET_SIZE
+
+
+def _find_at(vendor, product, bus, port_numbers):
+    """Device with the ids at the usb path, None if it is not there. Enumerates unless sysfs shows it is not there."""
+    if _sysfs_present(bus, port_numbers, vendor, product) is False:
+        return None
+    return usb.core.find(idVendor=vendor, idProduct=product, bus=bus,
+                         custom_match=lambda dev: tuple(dev.port_numbers or ()) == port_numbers)
+
+
+def _sysfs_present(bus, port_numbers, vendor, product):
+    """True/False if sysfs shows whether the device is at the usb path, None if there is no sysfs."""
+    if not os.path.isdir(SYSFS_USB_DEVICES) or not port_numbers:
+        return None
+
+    name = str(bus) + '-' + '.'.join(str(port) for port in port_numbers)
+    try:
+        with open(os.path.join(SYSFS_USB_DEVICES, name, 'idVendor')) as file:
+            presentVendor = int(file.read(), 16)
+        with open(os.path.join(SYSFS_USB_DEVICES, name, 'idProduct')) as file:
+            presentProduct = int(file.read(), 16)
+    except (OSError, ValueError):
+        return False
+    return presentVendor == vendor and presentProduct == product
+
+
+def _usb_tree_signature():
+    """Modification times of the usb bus directories (device nodes are added/removed on hot-plug)."""
+    try:
+        buses = sorted(os.listdir(DEV_BUS_USB))
+        return tuple((bus, os.stat(os.path.join(DEV_BUS_USB, bus)).st_mtime_ns) for bus in buses)
+    except OSError:
+        return None